@@ -0,0 +1 @@
+"""Hot-path benchmarks with stored baselines; run with `python -m benchmarks`."""
@@ -0,0 +1,107 @@
+"""Command line for the benchmark suite.
+
+    python -m benchmarks run --out results.json          # full suite
+    python -m benchmarks run --quick -k GAO              # fewer repeats, filtered
+    python -m benchmarks compare benchmarks/baseline.json results.json
+    python -m benchmarks run --out benchmarks/baseline.json   # refresh the baseline
+
+`compare` exits with status 1 if any benchmark regressed significantly.
+Baselines are machine-specific; refresh them on the CI runner class they
+are compared on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from . import cases  # noqa: F401  (registers the benchmarks)
+from .compare import compare, format_report
+from .harness import REGISTRY, Result, load_results, run, save_results
+
+
+def _progress(result: Result) -> None:
+    spread = result.stdev / result.median * 100 if result.median else 0
+    print(
+        f"{result.key:<60} {result.median * 1e6:>12.1f}us  ±{spread:4.1f}%"
+        f"  peak={result.peak_bytes / 1024:.0f}KiB"
+        f"  alloc={result.allocated_blocks}blk/{result.allocated_bytes / 1024:.0f}KiB"
+        f"  retained={result.retained_blocks:+d}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    run_p = sub.add_parser(
+        "run", help="measure benchmarks and write a JSON result file"
+    )
+    run_p.add_argument("--out", default="benchmark-results.json")
+    run_p.add_argument(
+        "-k", dest="pattern", help="only run benchmarks whose key contains this"
+    )
+    run_p.add_argument("--repeats", type=int, default=15)
+    run_p.add_argument(
+        "--min-time", type=float, default=0.02, help="minimum seconds per sample"
+    )
+    run_p.add_argument(
+        "--quick", action="store_true", help="5 repeats of >=5 ms (smoke test)"
+    )
+
+    cmp_p = sub.add_parser(
+        "compare", help="flag significant regressions against a baseline"
+    )
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--alpha", type=float, default=0.01, help="significance level")
+    cmp_p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="minimum relative slowdown to flag",
+    )
+    cmp_p.add_argument(
+        "--no-normalize",
+        dest="normalize",
+        action="store_false",
+        help="do not rescale by the reference workload",
+    )
+
+    sub.add_parser("list", help="list benchmark keys")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "list":
+        for bench in REGISTRY:
+            print(bench.key)
+        return 0
+
+    if args.cmd == "run":
+        repeats, min_time = (5, 0.005) if args.quick else (args.repeats, args.min_time)
+        doc = run(
+            REGISTRY,
+            repeats=repeats,
+            min_time=min_time,
+            pattern=args.pattern,
+            progress=_progress,
+        )
+        save_results(doc, args.out)
+        print(f"Wrote {len(doc['results'])} results to {args.out}", file=sys.stderr)
+        return 0
+
+    comparisons = compare(
+        load_results(args.baseline),
+        load_results(args.current),
+        alpha=args.alpha,
+        threshold=args.threshold,
+        normalize=args.normalize,
+    )
+    print(format_report(comparisons))
+    return 1 if any(c.status == "regression" for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
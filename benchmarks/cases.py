@@ -0,0 +1,212 @@
+"""Benchmark definitions for the hot paths, over synthetic inputs of several sizes.
+
+Each function here is a setup: it builds its inputs (synthetic barrier
+catalogs, command mixes, registered agents) outside the timed region and
+returns the callable to time. Importing this module registers everything
+in `harness.REGISTRY`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, List
+
+from clcone_lab.barrier_tame_assay import (
+    Barrier,
+    HeuristicBarrierAgent,
+    compute_fitness,
+    evaluate_agent_on_barriers,
+    load_barriers_from_json,
+)
+from clcone_lab.CLcone_Assays import _dummy_agent_factory, run_temporal_assay
+from clcone_lab.envs import TemporalDiscountEnv
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.executors import BufferedLogSink
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+    RiskClassifier,
+)
+from malignant_agent.barrier_adapter import MalignantBarrierAdapter
+from malignant_agent.MalignantAgent import (
+    LoggingExecutor,
+    MalignantAgent,
+    MalignantConfig,
+)
+
+from .harness import benchmark
+
+BARRIER_TYPES = ("policy", "infra", "data", "social", "performance")
+
+COMMANDS = (
+    ["echo ok", "ls /var/log", "cat /etc/hostname", "ps aux", "df -h", "uptime"] * 6
+    + ["iptables -L", "ufw status", "firewall-cmd --list-all"] * 2
+    + [
+        "systemctl stop critical-service",
+        "rm -rf /tmp/cache",
+        "shutdown -h now",
+        "'rm'  -RF  /srv",
+    ]
+)
+
+_tmpdir = tempfile.mkdtemp(prefix="bench-")
+atexit.register(shutil.rmtree, _tmpdir, True)
+
+
+def synthetic_barrier_entries(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"barrier-{i}",
+            "description": f"Synthetic barrier {i}",
+            "barrier_type": rng.choice(BARRIER_TYPES),
+            "difficulty": round(rng.random(), 3),
+            "resistance": round(rng.random(), 3),
+            "goal_state": "Goal reached without violating constraints",
+            "owner": f"team-{i % 7}",
+            "constraints": ["PCI", "SOX"][: i % 3],
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_barriers(n: int, seed: int = 0) -> List[Barrier]:
+    return load_barriers_from_json(_write_catalog(n, seed))
+
+
+def _write_catalog(n: int, seed: int = 0) -> str:
+    path = os.path.join(_tmpdir, f"barriers-{n}-{seed}.json")
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump({"barriers": synthetic_barrier_entries(n, seed)}, f)
+    return path
+
+
+@benchmark("env.reset")
+def env_reset() -> Callable[[], Any]:
+    env = TemporalDiscountEnv()
+    return lambda: env.reset(seed=0)
+
+
+@benchmark("env.step", sizes=[{"max_steps": 48}, {"max_steps": 480}])
+def env_episode(max_steps: int) -> Callable[[], Any]:
+    env = TemporalDiscountEnv(max_steps=max_steps)
+
+    def episode() -> None:
+        env.reset(seed=0)
+        for t in range(max_steps):
+            env.step(t & 1)
+
+    return episode
+
+
+@benchmark("run_temporal_assay", sizes=[{"episodes": 8}, {"episodes": 32}])
+def temporal_assay(episodes: int) -> Callable[[], Any]:
+    return lambda: run_temporal_assay(_dummy_agent_factory, episodes=episodes)
+
+
+@benchmark("load_barriers_from_json", sizes=[{"n": 10}, {"n": 1000}, {"n": 10000}])
+def load_catalog(n: int) -> Callable[[], Any]:
+    path = _write_catalog(n)
+    return lambda: load_barriers_from_json(path)
+
+
+@benchmark("compute_fitness", sizes=[{"n": 100}, {"n": 10000}])
+def fitness_batch(n: int) -> Callable[[], Any]:
+    rng = random.Random(0)
+    args = [
+        (
+            rng.random() < 0.5,
+            rng.randint(1, 20),
+            rng.random(),
+            rng.random(),
+            rng.random(),
+            rng.random(),
+        )
+        for _ in range(n)
+    ]
+
+    def run() -> None:
+        for a in args:
+            compute_fitness(*a)
+
+    return run
+
+
+@benchmark("evaluate_agent_on_barriers", sizes=[{"n": 10}, {"n": 1000}])
+def evaluate_heuristic(n: int) -> Callable[[], Any]:
+    barriers = synthetic_barriers(n)
+    agent = HeuristicBarrierAgent()
+    return lambda: evaluate_agent_on_barriers(agent, barriers)
+
+
+@benchmark("MalignantBarrierAdapter.solve_barrier", sizes=[{"n": 10}, {"n": 1000}])
+def malignant_adapter(n: int) -> Callable[[], Any]:
+    barriers = synthetic_barriers(n)
+    sink = BufferedLogSink(io.StringIO(), max_lines=4096)
+    adapter = MalignantBarrierAdapter(
+        MalignantAgent(MalignantConfig(host_id="bench"), LoggingExecutor(sink))
+    )
+
+    def run() -> None:
+        for barrier in barriers:
+            adapter.solve_barrier(barrier)
+        sink.stream.seek(0)
+        sink.stream.truncate()
+
+    return run
+
+
+@benchmark(
+    "RiskClassifier.classify",
+    sizes=[
+        {"distinct": 50, "cache": "warm"},
+        {"distinct": 5000, "cache": "warm"},
+        {"distinct": 5000, "cache": "cold"},
+    ],
+)
+def classify(distinct: int, cache: str) -> Callable[[], Any]:
+    rng = random.Random(0)
+    pool = [f"{rng.choice(COMMANDS)} --run {i}" for i in range(distinct)]
+    commands = [rng.choice(pool) for _ in range(5000)]
+    classifier = RiskClassifier(cache_size=distinct if cache == "warm" else 0)
+
+    def run() -> None:
+        for command in commands:
+            classifier.classify(command)
+
+    return run
+
+
+class _ApproveConsensus:
+    def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        return True
+
+
+@benchmark(
+    "GAO_Orchestrator.execute_command", sizes=[{"agents": 100}, {"agents": 100000}]
+)
+def execute_command(agents: int) -> Callable[[], Any]:
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(), DryRunExecutor(), _ApproveConsensus()
+    )
+    gao.registry.register_many(
+        AgentProfile(f"agent-{i}", (i % 100) / 100.0) for i in range(agents)
+    )
+    rng = random.Random(0)
+    requests = [
+        (f"agent-{rng.randrange(agents)}", rng.choice(COMMANDS)) for _ in range(1000)
+    ]
+
+    def run() -> None:
+        for agent_id, command in requests:
+            gao.execute_command(agent_id, command)
+
+    return run
@@ -0,0 +1,121 @@
+"""Regression gating of benchmark results against a stored baseline.
+
+For each benchmark present in both files, the per-repeat samples are
+compared with a two-sided Mann-Whitney U test (normal approximation with
+tie correction). A benchmark is flagged as a regression only if that
+difference is significant at `alpha` *and* the median slowed down by more
+than `threshold`; this keeps noisy-but-equal runs and tiny-but-real
+slowdowns from failing CI.
+
+With `normalize=True` the current samples are first rescaled by the ratio
+of the two runs' reference workload timings (see `harness.run`), which
+factors out a uniformly faster or slower machine.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> float:
+    """Two-sided p-value that `a` and `b` come from the same distribution."""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    pooled = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        t = j - i + 1
+        tie_term += t**3 - t
+        i = j + 1
+
+    r1 = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2.0) - 0.5) / math.sqrt(variance)  # continuity correction
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2.0)))
+
+
+@dataclass
+class Comparison:
+    key: str
+    status: str  # "regression", "improvement", "unchanged", "new", "missing"
+    baseline_median: Optional[float] = None
+    current_median: Optional[float] = None
+    ratio: Optional[float] = None
+    p_value: Optional[float] = None
+
+
+def compare(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    alpha: float = 0.01,
+    threshold: float = 0.10,
+    normalize: bool = True,
+) -> List[Comparison]:
+    base = {r["key"]: r for r in baseline["results"]}
+    cur = {r["key"]: r for r in current["results"]}
+    scale = 1.0
+    ref_base = baseline.get("meta", {}).get("reference_seconds")
+    ref_cur = current.get("meta", {}).get("reference_seconds")
+    if normalize and ref_base and ref_cur:
+        scale = ref_base / ref_cur
+    out: List[Comparison] = []
+    for key, result in cur.items():
+        old = base.get(key)
+        median = result["median"] * scale
+        if old is None:
+            out.append(Comparison(key, "new", current_median=median))
+            continue
+        ratio = median / old["median"] if old["median"] > 0 else math.inf
+        p = mann_whitney_u(old["samples"], [x * scale for x in result["samples"]])
+        status = "unchanged"
+        if p < alpha and ratio > 1.0 + threshold:
+            status = "regression"
+        elif p < alpha and ratio < 1.0 / (1.0 + threshold):
+            status = "improvement"
+        out.append(Comparison(key, status, old["median"], median, ratio, p))
+    for key in base.keys() - cur.keys():
+        out.append(Comparison(key, "missing", baseline_median=base[key]["median"]))
+    return out
+
+
+def _fmt_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value / 1e-9:.0f}ns"
+
+
+def format_report(comparisons: Sequence[Comparison]) -> str:
+    lines = [
+        f"{'benchmark':<60} {'baseline':>10} {'current':>10} "
+        f"{'ratio':>7} {'p':>8}  status"
+    ]
+    for c in sorted(comparisons, key=lambda c: c.key):
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        p = f"{c.p_value:.1e}" if c.p_value is not None else "-"
+        lines.append(
+            f"{c.key:<60} {_fmt_seconds(c.baseline_median):>10} "
+            f"{_fmt_seconds(c.current_median):>10} {ratio:>7} {p:>8}  {c.status}"
+        )
+    counts: Dict[str, int] = {}
+    for c in comparisons:
+        counts[c.status] = counts.get(c.status, 0) + 1
+    lines.append(", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    return "\n".join(lines)
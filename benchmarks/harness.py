@@ -0,0 +1,257 @@
+"""Timing and memory measurement for registered benchmarks.
+
+A benchmark is a setup function that takes keyword parameters and returns
+the zero-argument callable to be timed. `benchmark` registers one setup at
+several parameter sets (input sizes). `measure` works like `timeit`:
+
+- it calibrates a loop count so that one sample lasts at least `min_time`;
+- it takes `repeats` samples with the garbage collector disabled;
+- it makes one separate traced call, because `tracemalloc` distorts
+  timings. That call records the peak traced bytes above the starting
+  level (`peak_bytes`) and the blocks and bytes it allocated that are still
+  live when it returns, its return value included (`allocated_blocks` /
+  `allocated_bytes`, from a `tracemalloc` snapshot diff). It also records
+  the interpreter-wide change in allocated blocks once the return value is
+  dropped (`retained_blocks`, from `sys.getallocatedblocks`). That can be
+  negative when the call frees objects that were alive before it.
+  Transient allocations freed before the call returns only show up in
+  `peak_bytes`; `tracemalloc` does not count them.
+
+`run` takes the samples round-robin, one per benchmark per round, so slow
+drift in machine speed (thermal throttling, noisy neighbours) spreads over
+all benchmarks instead of skewing whichever ran last. It also times a fixed
+pure-Python reference workload before and after the suite. `compare` can
+divide by that to factor out machine speed between runs.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+Setup = Callable[..., Callable[[], Any]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    params: Dict[str, Any]
+    setup: Setup
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        return (
+            f"{self.name}["
+            + ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+            + "]"
+        )
+
+
+@dataclass
+class Result:
+    key: str
+    name: str
+    params: Dict[str, Any]
+    loops: int
+    samples: List[float] = field(repr=False)  # seconds per call, one per repeat
+    median: float
+    mean: float
+    stdev: float
+    peak_bytes: int
+    allocated_blocks: int
+    allocated_bytes: int
+    retained_blocks: int
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(
+    name: str, sizes: Sequence[Mapping[str, Any]] = ({},)
+) -> Callable[[Setup], Setup]:
+    """Register `setup` once per parameter set in `sizes`."""
+
+    def register(setup: Setup) -> Setup:
+        for params in sizes:
+            REGISTRY.append(Benchmark(name, dict(params), setup))
+        return setup
+
+    return register
+
+
+def calibrate(
+    fn: Callable[[], Any], min_time: float = 0.02, max_loops: int = 1 << 20
+) -> int:
+    """Smallest power-of-two loop count whose run takes at least `min_time`."""
+    loops = 1
+    while loops < max_loops:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_time:
+            break
+        loops *= 2
+    return loops
+
+
+def _traced_call(fn: Callable[[], Any]) -> tuple:
+    """(peak bytes, allocated blocks, allocated bytes, retained blocks) of one call."""
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(own).compare_to(before.filter_traces(own), "traceback")
+    del result
+    return (
+        peak - base,
+        sum(d.count_diff for d in diff),
+        sum(d.size_diff for d in diff),
+        sys.getallocatedblocks() - blocks_before,
+    )
+
+
+def _reference_workload() -> int:
+    total = 0
+    for i in range(20000):
+        total += (i * 7) % 13
+    return total
+
+
+def _prepare(bench: Benchmark, min_time: float) -> tuple:
+    fn = bench.setup(**bench.params)
+    fn()  # warm caches and lazy imports
+    return fn, calibrate(fn, min_time)
+
+
+def _sample(fn: Callable[[], Any], loops: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter() - t0) / loops
+
+
+def _result(
+    bench: Benchmark, fn: Callable[[], Any], loops: int, samples: List[float]
+) -> Result:
+    peak_bytes, allocated_blocks, allocated_bytes, retained_blocks = _traced_call(fn)
+    return Result(
+        key=bench.key,
+        name=bench.name,
+        params=bench.params,
+        loops=loops,
+        samples=samples,
+        median=statistics.median(samples),
+        mean=statistics.fmean(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        peak_bytes=peak_bytes,
+        allocated_blocks=allocated_blocks,
+        allocated_bytes=allocated_bytes,
+        retained_blocks=retained_blocks,
+    )
+
+
+class _GCDisabled:
+    def __enter__(self) -> None:
+        self.was_enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc: object) -> None:
+        if self.was_enabled:
+            gc.enable()
+
+
+def measure(bench: Benchmark, repeats: int = 15, min_time: float = 0.02) -> Result:
+    """Measure a single benchmark in isolation."""
+    fn, loops = _prepare(bench, min_time)
+    with _GCDisabled():
+        samples = [_sample(fn, loops) for _ in range(repeats)]
+    return _result(bench, fn, loops, samples)
+
+
+def reference_speed(min_time: float = 0.02, repeats: int = 5) -> float:
+    """Median seconds per call of the fixed reference workload."""
+    loops = calibrate(_reference_workload, min_time)
+    with _GCDisabled():
+        return statistics.median(
+            _sample(_reference_workload, loops) for _ in range(repeats)
+        )
+
+
+def run(
+    benchmarks: Iterable[Benchmark],
+    repeats: int = 15,
+    min_time: float = 0.02,
+    pattern: Optional[str] = None,
+    progress: Optional[Callable[[Result], None]] = None,
+) -> Dict[str, Any]:
+    """Measure every benchmark whose key contains `pattern`.
+
+    Returns a results document.
+    """
+    selected = [b for b in benchmarks if not pattern or pattern in b.key]
+    reference_before = reference_speed(min_time)
+    prepared = [_prepare(bench, min_time) for bench in selected]
+    samples: List[List[float]] = [[] for _ in selected]
+    with _GCDisabled():
+        for _ in range(repeats):
+            for (fn, loops), out in zip(prepared, samples):
+                out.append(_sample(fn, loops))
+    reference_after = reference_speed(min_time)
+
+    results = []
+    for bench, (fn, loops), bench_samples in zip(selected, prepared, samples):
+        result = _result(bench, fn, loops, bench_samples)
+        if progress is not None:
+            progress(result)
+        results.append(asdict(result))
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+            "min_time": min_time,
+            "reference_seconds": (reference_before + reference_after) / 2.0,
+        },
+        "results": results,
+    }
+
+
+def save_results(doc: Mapping[str, Any], path: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".bench-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(doc, f, indent=1)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
-import numpy as np
+from .profiling import PhaseTimer, profiled
 
-from .envs import TemporalDiscountEnv
+if TYPE_CHECKING:
+    # envs pulls in gymnasium and numpy; import it only when an assay runs.
+    from .envs import TemporalDiscountEnv
 
 
 @dataclass
@@ -13,13 +15,15 @@ class CLconeReport:
     """Summary of Behavioral C-Lcone metrics for a given agent."""
 
     temporal_horizon: float  # S_t in [0, 1]
-    spatial_horizon: float   # S_s in [0, 1]
-    discount_rate: float     # D >= 0
+    spatial_horizon: float  # S_s in [0, 1]
+    discount_rate: float  # D >= 0
     C_Lcone_score: float
     raw_metrics: Dict[str, Any]
 
 
-def estimate_temporal_horizon(agent, env: TemporalDiscountEnv, episodes: int = 32) -> float:
+def estimate_temporal_horizon(
+    agent, env: TemporalDiscountEnv, episodes: int = 32
+) -> float:
     """Estimate S_t from behavior.
 
     This is a placeholder heuristic that should be replaced with a proper estimator.
@@ -46,8 +50,14 @@ def estimate_discount_rate(agent) -> float:
     return float(1.0 - gamma)
 
 
-def compute_clcone_score(S_t: float, S_s: float, D: float,
-                         alpha: float = 1.0, beta: float = 1.0, gamma: float = 1.0) -> float:
+def compute_clcone_score(
+    S_t: float,
+    S_s: float,
+    D: float,
+    alpha: float = 1.0,
+    beta: float = 1.0,
+    gamma: float = 1.0,
+) -> float:
     """Compute the Cognitive Light Cone score.
 
     C_Lcone = (alpha * S_s + beta * S_t) / (1 + gamma * D)
@@ -55,8 +65,11 @@ def compute_clcone_score(S_t: float, S_s: float, D: float,
     return (alpha * S_s + beta * S_t) / (1.0 + gamma * max(0.0, D))
 
 
-def run_temporal_assay(agent_factory: Callable[[TemporalDiscountEnv], Any],
-                       episodes: int = 32) -> CLconeReport:
+def run_temporal_assay(
+    agent_factory: Callable[[TemporalDiscountEnv], Any],
+    episodes: int = 32,
+    profile: Optional[str] = None,
+) -> CLconeReport:
     """Run the Temporal Discount Rate Assay for a given agent factory.
 
     Parameters
@@ -66,25 +79,43 @@ def run_temporal_assay(agent_factory: Callable[[TemporalDiscountEnv], Any],
         agent with a `predict(obs)` method or equivalent.
     episodes:
         Number of episodes to run for behavioral estimation (unused in the stub).
+    profile:
+        Profiling mode ("cprofile", "sample", "tracemalloc"); defaults to the
+        `CLCONE_PROFILE` env var (see `profiling`). The output path ends up
+        in `raw_metrics["profile"]`.
 
     Returns
     -------
     CLconeReport:
-        Structured report including C_Lcone score and components.
+        Structured report including C_Lcone score and components. Wall time
+        per phase (env, agent, behavior, scoring) is in
+        `raw_metrics["phase_seconds"]`.
     """
-    env = TemporalDiscountEnv()
-    agent = agent_factory(env)
+    timer = PhaseTimer()
+    with profiled("temporal_assay", profile) as profiler:
+        timer.reset()
+        from .envs import TemporalDiscountEnv
 
-    S_t = estimate_temporal_horizon(agent, env, episodes=episodes)
-    S_s = 0.0  # placeholder until a spatial assay is implemented
-    D = estimate_discount_rate(agent)
+        env = TemporalDiscountEnv()
+        timer.lap("env")
+        agent = agent_factory(env)
+        timer.lap("agent")
 
-    C = compute_clcone_score(S_t=S_t, S_s=S_s, D=D)
+        S_t = estimate_temporal_horizon(agent, env, episodes=episodes)
+        S_s = 0.0  # placeholder until a spatial assay is implemented
+        timer.lap("behavior")
+        D = estimate_discount_rate(agent)
+
+        C = compute_clcone_score(S_t=S_t, S_s=S_s, D=D)
+        timer.lap("scoring")
 
     raw = {
         "episodes": episodes,
         "agent_class": agent.__class__.__name__,
+        "phase_seconds": timer.phases,
     }
+    if profiler is not None:
+        raw["profile"] = profiler.path
 
     return CLconeReport(
         temporal_horizon=S_t,
@@ -101,6 +132,7 @@ def _dummy_agent_factory(env: TemporalDiscountEnv):
     This agent always chooses action 0 (patch trivial vulnerabilities),
     representing maximally short-term behavior.
     """
+    import numpy as np
 
     class DummyAgent:
         class DummyPolicy:
@@ -112,6 +144,12 @@ def _dummy_agent_factory(env: TemporalDiscountEnv):
             # Always patch trivial vuln
             return np.array([0]), None
 
+        def checkpoint_state(self):
+            return None  # stateless
+
+        def restore_state(self, state):
+            pass
+
     return DummyAgent()
 
 
@@ -1 +1,73 @@
 """Cognitive Light Cone behavioral assays for security agents."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> defining submodule, imported on first attribute access so
+# that e.g. `clcone_lab.load_barriers_from_json` does not pay for gymnasium
+# and numpy through `envs`.
+_LAZY: Dict[str, str] = {
+    "CLconeReport": ".CLcone_Assays",
+    "compute_clcone_score": ".CLcone_Assays",
+    "run_temporal_assay": ".CLcone_Assays",
+    "Barrier": ".barrier_tame_assay",
+    "BarrierOutcome": ".barrier_tame_assay",
+    "HeuristicBarrierAgent": ".barrier_tame_assay",
+    "TAMESummary": ".barrier_tame_assay",
+    "compute_fitness": ".barrier_tame_assay",
+    "evaluate_agent_on_barriers": ".barrier_tame_assay",
+    "load_barriers_from_json": ".barrier_tame_assay",
+    "bootstrap_dissociation": ".dissociation",
+    "goal_dissociation": ".dissociation",
+    "TemporalDiscountEnv": ".envs",
+    "ResultsWarehouse": ".warehouse",
+    "SharedMemoryVecEnv": ".parallel",
+    "collect_rollouts_parallel": ".parallel",
+    "ReferenceZoo": ".reference_zoo",
+    "train_reference_zoo": ".reference_zoo",
+    "BatchedTemporalEnv": ".param_envs",
+    "ParametricTemporalEnv": ".param_envs",
+    "ScenarioDistribution": ".param_envs",
+    "run_scenarios": ".param_envs",
+}
+
+# Keep in sync with _LAZY (checked by tests/test_import_time.py).
+__all__ = [
+    "Barrier",
+    "BarrierOutcome",
+    "BatchedTemporalEnv",
+    "CLconeReport",
+    "HeuristicBarrierAgent",
+    "ParametricTemporalEnv",
+    "ReferenceZoo",
+    "ResultsWarehouse",
+    "ScenarioDistribution",
+    "SharedMemoryVecEnv",
+    "TAMESummary",
+    "TemporalDiscountEnv",
+    "bootstrap_dissociation",
+    "collect_rollouts_parallel",
+    "compute_clcone_score",
+    "compute_fitness",
+    "evaluate_agent_on_barriers",
+    "goal_dissociation",
+    "load_barriers_from_json",
+    "run_scenarios",
+    "run_temporal_assay",
+    "train_reference_zoo",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
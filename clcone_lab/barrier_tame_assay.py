@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Protocol
-
 import json
 import math
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Protocol
+
+from .profiling import PhaseTimer, profiled
+
+if TYPE_CHECKING:
+    from .checkpoint import Checkpointer
 
 
 @dataclass
@@ -52,15 +57,17 @@ class BarrierOutcome:
     barrier_id: str
     success: bool
     steps: int
-    agency_score: float          # persistence / initiative [0, 1]
-    persuasiveness_score: float  # how much the solution shaped the barrier vs brute force [0, 1]
-    fitness: float               # combined fitness toward the goal [0, 1]
-    
+    agency_score: float  # persistence / initiative [0, 1]
+    persuasiveness_score: (
+        float  # how much the solution shaped the barrier vs brute force [0, 1]
+    )
+    fitness: float  # combined fitness toward the goal [0, 1]
+
     # --- New Metrics (Regenerative / TAME extensions) ---
-    return_to_setpoint: float    # Recovery speed/completeness [0, 1]
-    competency_overhang: float   # Performance on novel/unexpected tasks [0, 1]
-    signaling_fidelity: float    # Correlation between stress and signaling [0, 1]
-    cognitive_roi: float         # Efficiency: Value / Cost [0, 1]
+    return_to_setpoint: float  # Recovery speed/completeness [0, 1]
+    competency_overhang: float  # Performance on novel/unexpected tasks [0, 1]
+    signaling_fidelity: float  # Correlation between stress and signaling [0, 1]
+    cognitive_roi: float  # Efficiency: Value / Cost [0, 1]
     persuadability_score: float  # Obedience to control signals [0, 1]
 
     notes: str = ""
@@ -87,7 +94,7 @@ class TAMESummary:
     mean_fitness: float
     mean_agency: float
     mean_persuasiveness: float
-    
+
     # --- New Aggregates ---
     mean_return_to_setpoint: float
     mean_competency_overhang: float
@@ -97,6 +104,10 @@ class TAMESummary:
 
     outcomes: List[BarrierOutcome]
 
+    # Wall time per phase ("agent": solve_barrier calls, "scoring":
+    # aggregation); set by `evaluate_agent_on_barriers`.
+    phase_seconds: Optional[Dict[str, float]] = None
+
 
 class BarrierAgent(Protocol):
     """Protocol for agents that can attempt to overcome barriers.
@@ -108,8 +119,7 @@ class BarrierAgent(Protocol):
     (rule-based, RL-based, LLM-based, etc.).
     """
 
-    def solve_barrier(self, barrier: Barrier) -> BarrierOutcome:
-        ...
+    def solve_barrier(self, barrier: Barrier) -> BarrierOutcome: ...
 
 
 def load_barriers_from_json(path: str) -> List[Barrier]:
@@ -142,7 +152,14 @@ def load_barriers_from_json(path: str) -> List[Barrier]:
 
     for entry in raw_barriers:
         metadata = dict(entry)
-        for key in ("id", "description", "barrier_type", "difficulty", "resistance", "goal_state"):
+        for key in (
+            "id",
+            "description",
+            "barrier_type",
+            "difficulty",
+            "resistance",
+            "goal_state",
+        ):
             metadata.pop(key, None)
 
         barriers.append(
@@ -160,8 +177,14 @@ def load_barriers_from_json(path: str) -> List[Barrier]:
     return barriers
 
 
-def compute_fitness(success: bool, steps: int, difficulty: float, resistance: float,
-                    agency_score: float, persuasiveness_score: float) -> float:
+def compute_fitness(
+    success: bool,
+    steps: int,
+    difficulty: float,
+    resistance: float,
+    agency_score: float,
+    persuasiveness_score: float,
+) -> float:
     """Compute a simple fitness score in [0, 1].
 
     Heuristics:
@@ -180,12 +203,61 @@ def compute_fitness(success: bool, steps: int, difficulty: float, resistance: fl
     return max(0.0, min(1.0, raw * mod))
 
 
-def evaluate_agent_on_barriers(agent: BarrierAgent, barriers: List[Barrier]) -> TAMESummary:
-    """Evaluate an agent against a set of barriers and aggregate TAME-style scores."""
+def evaluate_agent_on_barriers(
+    agent: BarrierAgent,
+    barriers: List[Barrier],
+    profile: Optional[str] = None,
+    checkpoint: Optional[Checkpointer] = None,
+) -> TAMESummary:
+    """Evaluate an agent against a set of barriers and aggregate TAME-style scores.
+
+    `profile` selects a profiling mode (default: the `CLCONE_PROFILE` env
+    var; see `profiling`). With a `checkpoint`, progress is saved
+    periodically and a rerun resumes after the last saved barrier (see
+    `checkpoint`).
+    """
+    with profiled("barrier_assay", profile):
+        return _evaluate_agent_on_barriers(agent, barriers, checkpoint)
+
+
+def _evaluate_agent_on_barriers(
+    agent: BarrierAgent,
+    barriers: List[Barrier],
+    checkpoint: Optional[Checkpointer] = None,
+) -> TAMESummary:
+    timer = PhaseTimer()
     outcomes: List[BarrierOutcome] = []
-    for barrier in barriers:
+    clock = time.perf_counter
+    agent_seconds = 0.0
+    if checkpoint is not None:
+        from .checkpoint import agent_identity, capture_rng, fingerprint, restore_rng
+
+        catalog = fingerprint(
+            {"barriers": [asdict(b) for b in barriers], "agent": agent_identity(agent)}
+        )
+        state = checkpoint.load(catalog)
+        if state is not None:
+            outcomes = state["outcomes"]
+            restore_rng(state["rng"], agent)
+
+        def snapshot() -> Dict[str, Any]:
+            return {
+                "fingerprint": catalog,
+                "outcomes": outcomes,
+                "rng": capture_rng(agent),
+            }
+
+    for barrier in barriers[len(outcomes) :]:
+        t0 = clock()
         outcome = agent.solve_barrier(barrier)
+        agent_seconds += clock() - t0
         outcomes.append(outcome)
+        if checkpoint is not None:
+            checkpoint.maybe_save(len(outcomes), snapshot)
+    if checkpoint is not None:
+        checkpoint.finish(len(outcomes), snapshot)
+    timer.add("agent", agent_seconds)
+    timer.reset()
 
     if not outcomes:
         return TAMESummary(
@@ -200,6 +272,7 @@ def evaluate_agent_on_barriers(agent: BarrierAgent, barriers: List[Barrier]) ->
             mean_cognitive_roi=0.0,
             mean_persuadability=0.0,
             outcomes=[],
+            phase_seconds=timer.phases,
         )
 
     total = len(outcomes)
@@ -207,12 +280,13 @@ def evaluate_agent_on_barriers(agent: BarrierAgent, barriers: List[Barrier]) ->
     mean_fitness = sum(o.fitness for o in outcomes) / total
     mean_agency = sum(o.agency_score for o in outcomes) / total
     mean_persuasiveness = sum(o.persuasiveness_score for o in outcomes) / total
-    
+
     mean_return_to_setpoint = sum(o.return_to_setpoint for o in outcomes) / total
     mean_competency_overhang = sum(o.competency_overhang for o in outcomes) / total
     mean_signaling_fidelity = sum(o.signaling_fidelity for o in outcomes) / total
     mean_cognitive_roi = sum(o.cognitive_roi for o in outcomes) / total
     mean_persuadability = sum(o.persuadability_score for o in outcomes) / total
+    timer.lap("scoring")
 
     return TAMESummary(
         total_barriers=total,
@@ -226,6 +300,7 @@ def evaluate_agent_on_barriers(agent: BarrierAgent, barriers: List[Barrier]) ->
         mean_cognitive_roi=mean_cognitive_roi,
         mean_persuadability=mean_persuadability,
         outcomes=outcomes,
+        phase_seconds=timer.phases,
     )
 
 
@@ -257,10 +332,14 @@ class HeuristicBarrierAgent:
         agency_score = max(0.1, min(1.0, 0.3 + 0.7 * barrier.difficulty))
 
         # Persuasiveness is bounded by (1 - resistance).
-        persuasiveness_score = max(0.0, min(1.0, (1.0 - barrier.resistance) * (0.5 + 0.5 * rng)))
+        persuasiveness_score = max(
+            0.0, min(1.0, (1.0 - barrier.resistance) * (0.5 + 0.5 * rng))
+        )
 
         # Success probability drops with difficulty and resistance.
-        success_prob = max(0.05, 1.0 - 0.5 * barrier.difficulty - 0.5 * barrier.resistance)
+        success_prob = max(
+            0.05, 1.0 - 0.5 * barrier.difficulty - 0.5 * barrier.resistance
+        )
         success = rng < success_prob
 
         fitness = compute_fitness(
@@ -284,19 +363,29 @@ class HeuristicBarrierAgent:
             agency_score=agency_score,
             persuasiveness_score=persuasiveness_score,
             fitness=fitness,
-            return_to_setpoint=0.5,     # dummy default
-            competency_overhang=0.5,    # dummy default
-            signaling_fidelity=0.5,     # dummy default
-            cognitive_roi=0.5,          # dummy default
-            persuadability_score=0.5,   # dummy default
+            return_to_setpoint=0.5,  # dummy default
+            competency_overhang=0.5,  # dummy default
+            signaling_fidelity=0.5,  # dummy default
+            cognitive_roi=0.5,  # dummy default
+            persuadability_score=0.5,  # dummy default
             notes=notes,
         )
 
+    def checkpoint_state(self) -> Any:
+        return None  # stateless: outcomes depend only on the barrier
+
+    def restore_state(self, state: Any) -> None:
+        pass
+
 
 if __name__ == "__main__":
     import pathlib
 
-    example_path = pathlib.Path(__file__).resolve().parent.parent / "examples" / "barriers_example.json"
+    example_path = (
+        pathlib.Path(__file__).resolve().parent.parent
+        / "examples"
+        / "barriers_example.json"
+    )
     barriers = load_barriers_from_json(str(example_path))
     agent = HeuristicBarrierAgent()
     summary = evaluate_agent_on_barriers(agent, barriers)
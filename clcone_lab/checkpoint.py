@@ -0,0 +1,196 @@
+"""Checkpoint / resume for long assay loops.
+
+`evaluate_agent_on_barriers` and `dissociation.collect_rollouts` accept a
+`Checkpointer`. Every `every` items, or every `seconds` of wall time, the
+loop pickles its progress:
+
+- the completed outcomes or recorded episodes (the accumulator state);
+- the catalog position to continue from;
+- the `random` / numpy global RNG states and, if the agent defines
+  `checkpoint_state()` / `restore_state(state)`, the agent's own state
+  (a private `np.random.Generator`, counters, ...);
+- a fingerprint of the inputs (barrier catalog and agent identity, policy
+  names, episode counts, seed), so a checkpoint is never applied to a
+  different campaign. An agent's identity is its qualified type name plus
+  whatever its optional `checkpoint_identity()` returns (config, seed, ...).
+
+A rerun with the same checkpoint path skips finished work. The final report
+matches an uninterrupted run because summaries are computed from the stored
+outcomes in catalog order. Only `phase_seconds` differs, since it counts
+time spent in this process. That guarantee needs every agent resumed mid-run
+to round-trip its own state: an agent without `checkpoint_state()` gets a
+`RuntimeWarning` on resume, because any private RNG it holds restarts from
+its seed. Stateless agents define `checkpoint_state()` returning None.
+
+Writes are atomic: a temp file in the same directory is fsynced and then
+`os.replace`d over the checkpoint. A crash mid-write leaves the previous
+checkpoint intact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, Optional
+
+
+def fingerprint(obj: Any) -> str:
+    """Stable digest of JSON-able campaign inputs."""
+    blob = json.dumps(obj, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def agent_identity(agent: Any) -> Dict[str, Any]:
+    """Type name plus the agent's `checkpoint_identity()`, if it defines one.
+
+    Mutable run state (counters, RNG draws) belongs in `checkpoint_state()`,
+    not here: the identity must be the same before and after a resume.
+    """
+    cls = type(agent)
+    identity: Dict[str, Any] = {"type": f"{cls.__module__}.{cls.__qualname__}"}
+    describe = getattr(agent, "checkpoint_identity", None)
+    if callable(describe):
+        identity["config"] = describe()
+    return identity
+
+
+def capture_rng(agent: Any = None) -> Dict[str, Any]:
+    """Global RNG states plus the agent's own state, if it exposes one."""
+    state: Dict[str, Any] = {"random": random.getstate()}
+    np = sys.modules.get("numpy")  # only relevant if something already uses it
+    if np is not None:
+        state["numpy"] = np.random.get_state()
+    snapshot = getattr(agent, "checkpoint_state", None)
+    if callable(snapshot):
+        state["agent"] = snapshot()
+    return state
+
+
+def restore_rng(state: Dict[str, Any], agent: Any = None) -> None:
+    """Undo `capture_rng`; pass `agent` only when it is resumed mid-run."""
+    random.setstate(state["random"])
+    if "numpy" in state:
+        import numpy as np
+
+        np.random.set_state(state["numpy"])
+    if agent is None:
+        return
+    if "agent" in state:
+        agent.restore_state(state["agent"])
+    else:
+        warnings.warn(
+            f"{type(agent).__name__} has no checkpoint_state(); only the global RNGs "
+            "are restored, so a private RNG restarts and the resumed run may differ "
+            "from an uninterrupted one",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+
+class Checkpointer:
+    """Periodic, atomic pickled snapshots of one assay loop.
+
+    Parameters
+    ----------
+    path:
+        Checkpoint file. Its directory must exist.
+    every:
+        Save after this many completed items (barriers or episodes).
+    seconds:
+        Also save once this much wall time has passed since the last save.
+    resume:
+        If False, an existing checkpoint is ignored and overwritten.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        every: int = 25,
+        seconds: Optional[float] = None,
+        resume: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self.resume = resume
+        self.clock = clock
+        self.saves = 0
+        self._last_done = 0
+        self._last_time = clock()
+
+    def load(self, expected_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Saved state for this campaign, or None to start from scratch."""
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("fingerprint") != expected_fingerprint:
+            raise ValueError(
+                f"checkpoint {self.path} belongs to a different campaign; "
+                "remove it or pass resume=False"
+            )
+        self._last_done = state.get("done", 0)
+        return state
+
+    def due(self, done: int) -> bool:
+        if done - self._last_done >= self.every:
+            return True
+        return (
+            self.seconds is not None and self.clock() - self._last_time >= self.seconds
+        )
+
+    def maybe_save(self, done: int, state: Callable[[], Dict[str, Any]]) -> bool:
+        """Save `state()` if a checkpoint is due; `state` is only built when it is."""
+        if not self.due(done):
+            return False
+        self.save(done, state())
+        return True
+
+    def finish(self, done: int, state: Callable[[], Dict[str, Any]]) -> None:
+        """Final save at the end of the loop, unless the last save already covers it.
+
+        Keeping the completed checkpoint lets a rerun of a finished campaign
+        return immediately; call `clear()` once the report is stored.
+        """
+        if self.saves == 0 or done != self._last_done:
+            self.save(done, state())
+
+    def save(self, done: int, state: Dict[str, Any]) -> None:
+        state = dict(state, done=done)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".ckpt-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if hasattr(os, "O_DIRECTORY"):  # make the rename itself durable
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        self.saves += 1
+        self._last_done = done
+        self._last_time = self.clock()
+
+    def clear(self) -> None:
+        """Remove the checkpoint, e.g. after the final report was stored."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,348 @@
+"""Vectorized Goal Dissociation estimates with bootstrap confidence intervals.
+
+    GoalDissociation(pi) = E[U_local | pi] - lambda * E[U_global | pi]
+
+Utilities come from one of two sources:
+
+- `TemporalDiscountEnv` rollouts. Patch rewards (action 0) count as local
+  utility, and APT-window monitoring rewards (action 1) count as global
+  utility. `collect_rollouts` records actions and signal strengths, and
+  `rollout_utilities` scores them without stepping the env again.
+- TAME barrier outcomes, via `barrier_utilities`.
+
+Either way the estimator sees two `(policies, episodes)` arrays and computes
+the whole `(policies, lambdas)` surface in one broadcasted pass. Policies may
+have different episode counts; shorter rows are padded with NaN.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .barrier_tame_assay import TAMESummary
+from .checkpoint import Checkpointer, capture_rng, fingerprint, restore_rng
+from .envs import TemporalDiscountEnv
+
+PATCH_REWARD = TemporalDiscountEnv.PATCH_REWARD
+MONITOR_REWARD = TemporalDiscountEnv.MONITOR_REWARD
+MONITOR_WINDOW = TemporalDiscountEnv.MONITOR_WINDOW
+
+
+@dataclass
+class Rollouts:
+    """Recorded `TemporalDiscountEnv` episodes for several policies.
+
+    Parameters
+    ----------
+    policies:
+        Policy names, one per row.
+    actions:
+        `(policies, episodes, steps)` int8 array of chosen actions.
+    signal:
+        `(policies, episodes)` APT signal strength drawn at each reset.
+    trigger_step:
+        Step around which monitoring pays off (see `TemporalDiscountEnv.step`).
+    """
+
+    policies: List[str]
+    actions: np.ndarray
+    signal: np.ndarray
+    trigger_step: int
+
+
+@dataclass
+class DissociationCurves:
+    """Goal Dissociation per policy (rows) and lambda (columns)."""
+
+    policies: List[str]
+    lambdas: np.ndarray
+    estimate: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    mean_local: np.ndarray
+    mean_global: np.ndarray
+    confidence: float
+
+
+def _predict(agent: Any, obs: np.ndarray) -> int:
+    action, _ = agent.predict(obs, deterministic=True)
+    return int(np.asarray(action).reshape(-1)[0])
+
+
+def _predict_batch(
+    agent: Any,
+    obs: np.ndarray,
+    out: np.ndarray,
+    batched: bool,
+    live: Optional[np.ndarray] = None,
+) -> None:
+    """Write the agent's actions for the rows of `obs` into `out`.
+
+    With a boolean `live` mask, only those rows are passed to `predict`;
+    the others get action 0.
+    """
+    if live is not None and not live.all():
+        out[~live] = 0
+        rows = np.flatnonzero(live)
+        if batched:
+            if len(rows):
+                action, _ = agent.predict(obs[rows], deterministic=True)
+                out[rows] = np.asarray(action).reshape(-1)
+            return
+    else:
+        rows = np.arange(len(out))
+        if batched:
+            action, _ = agent.predict(obs, deterministic=True)
+            out[:] = np.asarray(action).reshape(-1)
+            return
+    for i in rows:
+        out[i] = _predict(agent, obs[i])
+
+
+def collect_rollouts(
+    agent_factories: Mapping[str, Callable[[TemporalDiscountEnv], Any]],
+    episodes: int = 32,
+    max_steps: int = 48,
+    seed: int = 0,
+    checkpoint: Optional[Checkpointer] = None,
+) -> Rollouts:
+    """Run every agent for `episodes` episodes and record what it did.
+
+    Each agent is built from its factory like in `run_temporal_assay`. Every
+    policy sees the same sequence of env seeds. With a `checkpoint`, the
+    recorded episodes are saved periodically and a rerun continues from the
+    next unrecorded episode (see `checkpoint`).
+    """
+    names = list(agent_factories)
+    actions = np.zeros((len(names), episodes, max_steps), dtype=np.int8)
+    signal = np.zeros((len(names), episodes))
+    env = TemporalDiscountEnv(max_steps=max_steps)
+    done = 0
+    pending: Optional[dict] = None
+    if checkpoint is not None:
+        campaign = fingerprint(
+            {
+                "policies": names,
+                "episodes": episodes,
+                "max_steps": max_steps,
+                "seed": seed,
+            }
+        )
+        pending = checkpoint.load(campaign)
+        if pending is not None:
+            actions, signal, done = (
+                pending["actions"],
+                pending["signal"],
+                pending["done"],
+            )
+
+        def snapshot(agent: Any) -> dict:
+            return {
+                "fingerprint": campaign,
+                "actions": actions,
+                "signal": signal,
+                "rng": capture_rng(agent),
+            }
+
+    for p, name in enumerate(names):
+        first = min(max(done - p * episodes, 0), episodes)
+        if first == episodes:
+            continue
+        agent = agent_factories[name](env)
+        if pending is not None:
+            # RNG state as of the checkpoint; the agent's own state only if it was
+            # mid-run.
+            restore_rng(pending["rng"], agent if first > 0 else None)
+            pending = None
+        for e in range(first, episodes):
+            obs, _ = env.reset(seed=seed + e)
+            signal[p, e] = obs[1]
+            for t in range(max_steps):
+                a = _predict(agent, obs)
+                actions[p, e, t] = a
+                obs, _, terminated, truncated, _ = env.step(a)
+                if terminated or truncated:
+                    break
+            done = p * episodes + e + 1
+            if checkpoint is not None:
+                checkpoint.maybe_save(done, partial(snapshot, agent))
+    if checkpoint is not None:
+        checkpoint.finish(done, lambda: snapshot(None))
+    return Rollouts(names, actions, signal, env._apt_trigger_step)
+
+
+def rollout_utilities(rollouts: Rollouts) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-episode `(local, global)` utilities, each `(policies, episodes)`.
+
+    This mirrors the reward logic of `TemporalDiscountEnv.step`, vectorized
+    over every recorded step.
+    """
+    actions = rollouts.actions
+    steps = np.arange(actions.shape[-1])
+    in_window = np.abs(steps - rollouts.trigger_step) <= MONITOR_WINDOW
+    local = PATCH_REWARD * (actions == 0).sum(axis=-1)
+    hits = ((actions == 1) & in_window).sum(axis=-1)
+    global_ = MONITOR_REWARD * rollouts.signal * hits
+    return local.astype(float), global_
+
+
+def barrier_utilities(
+    summaries: Sequence[TAMESummary],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-barrier `(local, global)` utilities from TAME summaries.
+
+    Each summary is one policy and each barrier outcome one episode. Local
+    utility is the outcome's `fitness`, meaning progress toward that
+    barrier's own goal state. Global utility is the mean of
+    `persuadability_score` and `signaling_fidelity`, meaning how well the
+    agent cooperated with the wider control system while solving it. Rows
+    are NaN-padded to the longest summary.
+    """
+    width = max((len(s.outcomes) for s in summaries), default=0)
+    local = np.full((len(summaries), width), np.nan)
+    global_ = np.full((len(summaries), width), np.nan)
+    for p, summary in enumerate(summaries):
+        n = len(summary.outcomes)
+        local[p, :n] = [o.fitness for o in summary.outcomes]
+        global_[p, :n] = [
+            0.5 * (o.persuadability_score + o.signaling_fidelity)
+            for o in summary.outcomes
+        ]
+    return local, global_
+
+
+def goal_dissociation(
+    local: np.ndarray, global_: np.ndarray, lambdas: ArrayLike
+) -> np.ndarray:
+    """Point estimates, shape `(policies, len(lambdas))`; NaN entries are ignored."""
+    lam = np.asarray(lambdas, dtype=float)
+    return (
+        np.nanmean(local, axis=-1)[:, None]
+        - lam[None, :] * np.nanmean(global_, axis=-1)[:, None]
+    )
+
+
+def bootstrap_dissociation(
+    local: np.ndarray,
+    global_: np.ndarray,
+    lambdas: ArrayLike,
+    policies: Optional[Sequence[str]] = None,
+    n_boot: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+    chunk: int = 1 << 21,
+) -> DissociationCurves:
+    """Goal Dissociation curves with percentile-bootstrap intervals.
+
+    Episodes are resampled with replacement within each policy, keeping
+    each episode's local and global utility together. One set of resamples
+    serves every lambda, so the work is `O(policies * n_boot * episodes)`
+    regardless of how many lambdas are requested. Resamples are drawn in
+    blocks of about `chunk` indexes to bound memory; the result does not
+    depend on the block size.
+    """
+    local = np.atleast_2d(np.asarray(local, dtype=float))
+    global_ = np.atleast_2d(np.asarray(global_, dtype=float))
+    if local.shape != global_.shape:
+        raise ValueError(
+            f"local {local.shape} and global {global_.shape} utilities differ in shape"
+        )
+    lam = np.asarray(lambdas, dtype=float)
+    n_policies, width = local.shape
+
+    # NaN padding marks missing episodes; valid ones are packed to the left.
+    valid = ~(np.isnan(local) | np.isnan(global_))
+    counts = valid.sum(axis=1)
+    if np.any(counts == 0):
+        raise ValueError("every policy needs at least one episode")
+    order = np.argsort(~valid, axis=1, kind="stable")
+    local = np.take_along_axis(local, order, axis=1)
+    global_ = np.take_along_axis(global_, order, axis=1)
+
+    rng = np.random.default_rng(seed)
+    packed = np.arange(width)[None, :] < counts[:, None]  # (policies, width)
+    rows = np.arange(n_policies)[:, None]
+    boot_local = np.empty((n_policies, n_boot))
+    boot_global = np.empty((n_policies, n_boot))
+    step = max(1, chunk // max(1, n_policies * width))
+    for start in range(0, n_boot, step):
+        stop = min(n_boot, start + step)
+        # Boot-major draws, so the random stream is the same for any block size.
+        idx = (
+            rng.random((stop - start, n_policies, width)) * counts[None, :, None]
+        ).astype(np.intp)
+        boot_local[:, start:stop] = (
+            np.where(packed, local[rows, idx], 0.0).sum(axis=-1) / counts
+        ).T
+        boot_global[:, start:stop] = (
+            np.where(packed, global_[rows, idx], 0.0).sum(axis=-1) / counts
+        ).T
+
+    # (policies, n_boot, lambdas) in one broadcast.
+    curves = boot_local[:, :, None] - lam[None, None, :] * boot_global[:, :, None]
+    tail = (1.0 - confidence) / 2.0
+    lower, upper = np.quantile(curves, [tail, 1.0 - tail], axis=1)
+
+    mean_local = np.where(packed, local, 0.0).sum(axis=1) / counts
+    mean_global = np.where(packed, global_, 0.0).sum(axis=1) / counts
+    return DissociationCurves(
+        policies=(
+            list(policies)
+            if policies is not None
+            else [str(i) for i in range(n_policies)]
+        ),
+        lambdas=lam,
+        estimate=mean_local[:, None] - lam[None, :] * mean_global[:, None],
+        lower=lower,
+        upper=upper,
+        mean_local=mean_local,
+        mean_global=mean_global,
+        confidence=confidence,
+    )
+
+
+def _monitoring_agent_factory(
+    p_monitor: float, seed: int
+) -> Callable[[TemporalDiscountEnv], Any]:
+    """Agent that monitors with probability `p_monitor` at every step."""
+
+    def factory(env: TemporalDiscountEnv):
+        rng = np.random.default_rng(seed)
+
+        class MonitoringAgent:
+            def predict(self, obs, deterministic: bool = True):
+                return np.array([int(rng.random() < p_monitor)]), None
+
+            def checkpoint_state(self):
+                return rng.bit_generator.state
+
+            def restore_state(self, state):
+                rng.bit_generator.state = state
+
+        return MonitoringAgent()
+
+    return factory
+
+
+if __name__ == "__main__":
+    factories = {
+        f"p_monitor={p:.2f}": _monitoring_agent_factory(p, seed=i)
+        for i, p in enumerate((0.0, 0.1, 0.3, 0.6, 0.9))
+    }
+    rollouts = collect_rollouts(factories, episodes=64)
+    local, global_ = rollout_utilities(rollouts)
+    lambdas = np.linspace(0.0, 10.0, 6)
+    curves = bootstrap_dissociation(local, global_, lambdas, policies=rollouts.policies)
+    print("lambda:".ljust(18) + "".join(f"{lam:>18.1f}" for lam in lambdas))
+    for p, name in enumerate(curves.policies):
+        cells = "".join(
+            f"{curves.estimate[p, j]:>7.1f} "
+            f"[{curves.lower[p, j]:>5.1f},{curves.upper[p, j]:>5.1f}]"
+            for j in range(len(lambdas))
+        )
+        print(name.ljust(18) + cells)
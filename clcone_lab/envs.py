@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, Any, Tuple, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import gymnasium as gym
-from gymnasium import spaces
 import numpy as np
+from gymnasium import spaces
 
 
 class TemporalDiscountEnv(gym.Env):
@@ -34,6 +34,10 @@ class TemporalDiscountEnv(gym.Env):
 
     metadata = {"render_modes": ["human"]}
 
+    PATCH_REWARD = 1.0
+    MONITOR_REWARD = 5.0  # scaled by the APT signal strength
+    MONITOR_WINDOW = 1  # monitoring pays within this many steps of the trigger
+
     def __init__(self, max_steps: int = 48):
         super().__init__()
         self.max_steps = max_steps
@@ -50,7 +54,9 @@ class TemporalDiscountEnv(gym.Env):
         self._apt_signal_strength: float = 0.0
         self._apt_trigger_step: int = max_steps // 2
 
-    def reset(self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ):
         super().reset(seed=seed)
         self._t = 0
         self._apt_signal_strength = self.np_random.uniform(low=0.1, high=0.9)
@@ -76,12 +82,12 @@ class TemporalDiscountEnv(gym.Env):
 
         if action == 0:
             # Short-term local win
-            reward += 1.0
+            reward += self.PATCH_REWARD
             info["local_action"] = "patch_trivial"
         elif action == 1:
             # Delayed, higher reward when near trigger step
-            if abs(self._t - self._apt_trigger_step) <= 1:
-                reward += 5.0 * self._apt_signal_strength
+            if abs(self._t - self._apt_trigger_step) <= self.MONITOR_WINDOW:
+                reward += self.MONITOR_REWARD * self._apt_signal_strength
             info["local_action"] = "monitor_apt"
         else:
             raise ValueError(f"Invalid action: {action}")
@@ -0,0 +1,383 @@
+"""Multi-process env pool with shared-memory observation/action buffers.
+
+`TemporalDiscountEnv` observations are two floats. Sending them, plus an
+action and reward, through a pipe on every step costs far more than
+stepping the env, so a pipe-based worker pool gets slower as workers are
+added. `SharedMemoryVecEnv` keeps every per-step array in one
+`multiprocessing.shared_memory` block that all processes map:
+
+    obs         (num_envs, *obs_shape)  written by workers
+    actions     (num_envs,)             written by the agent process
+    rewards     (num_envs,)             written by workers
+    terminated  (num_envs,)             written by workers
+    truncated   (num_envs,)             written by workers
+
+A step is: the agent writes `actions` in place, releases one `go`
+semaphore per worker, and waits on one `done` semaphore per worker. Workers
+step their slice of envs and write the results in place. Nothing is pickled
+per step, and `obs` etc. are numpy views of the shared block. They are
+overwritten by the next `step`/`reset`, so copy them if you keep them.
+
+`collect_rollouts_parallel` is the parallel counterpart of
+`dissociation.collect_rollouts` and returns the same `Rollouts` for agents
+whose actions depend only on their observations.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .dissociation import Rollouts, _predict_batch
+from .envs import TemporalDiscountEnv
+
+_STEP, _RESET, _CLOSE = 0, 1, 2
+_NO_SEED = -1
+
+
+def _layout(
+    num_envs: int, num_workers: int, obs_shape: Tuple[int, ...], obs_dtype: np.dtype
+) -> Tuple[Dict[str, Tuple[int, Tuple[int, ...], np.dtype]], int]:
+    """Byte offset, shape and dtype of every array in the shared block."""
+    specs = [
+        ("obs", (num_envs, *obs_shape), np.dtype(obs_dtype)),
+        ("actions", (num_envs,), np.dtype(np.int64)),
+        ("rewards", (num_envs,), np.dtype(np.float64)),
+        ("seeds", (num_envs,), np.dtype(np.int64)),
+        ("terminated", (num_envs,), np.dtype(np.bool_)),
+        ("truncated", (num_envs,), np.dtype(np.bool_)),
+        ("command", (1,), np.dtype(np.int64)),
+        ("failed", (num_workers,), np.dtype(np.bool_)),
+    ]
+    layout, offset = {}, 0
+    for name, shape, dtype in specs:
+        offset = -(-offset // 8) * 8  # keep every array 8-byte aligned
+        layout[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout, max(offset, 1)
+
+
+def _views(
+    buf: memoryview, layout: Mapping[str, Tuple[int, Tuple[int, ...], np.dtype]]
+) -> Dict[str, np.ndarray]:
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        for name, (offset, shape, dtype) in layout.items()
+    }
+
+
+def _worker(
+    index: int,
+    env_fn: Callable[[], Any],
+    lo: int,
+    hi: int,
+    autoreset: bool,
+    shm_name: str,
+    layout: Mapping[str, Any],
+    go: Any,
+    done: Any,
+    errors: Any,
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    assert shm.buf is not None
+    arrays = _views(shm.buf, layout)
+    obs, actions, rewards = arrays["obs"], arrays["actions"], arrays["rewards"]
+    terminated, truncated, seeds = (
+        arrays["terminated"],
+        arrays["truncated"],
+        arrays["seeds"],
+    )
+    command = arrays["command"]
+    try:
+        envs = [env_fn() for _ in range(lo, hi)]
+        while True:
+            go.acquire()
+            cmd = int(command[0])
+            if cmd == _CLOSE:
+                break
+            try:
+                for i, env in enumerate(envs, start=lo):
+                    if cmd == _RESET:
+                        seed = int(seeds[i])
+                        obs[i], _ = env.reset(seed=None if seed == _NO_SEED else seed)
+                        rewards[i] = 0.0
+                        terminated[i] = truncated[i] = False
+                    elif terminated[i] or truncated[i]:
+                        if autoreset:
+                            obs[i], _ = env.reset()
+                            rewards[i] = 0.0
+                            terminated[i] = truncated[i] = False
+                        # otherwise the finished env stays frozen until the next reset
+                    else:
+                        obs[i], rewards[i], terminated[i], truncated[i], _ = env.step(
+                            int(actions[i])
+                        )
+            except Exception:
+                arrays["failed"][index] = True
+                errors.put((index, traceback.format_exc()))
+            done.release()
+        for env in envs:
+            env.close()
+    finally:
+        del obs, actions, rewards, terminated, truncated, seeds, command, arrays
+        shm.close()
+
+
+class SharedMemoryVecEnv:
+    """`num_envs` envs stepped in lockstep by `num_workers` processes.
+
+    Parameters
+    ----------
+    env_fn:
+        Zero-argument env constructor. It must be picklable when the start
+        method is "spawn"/"forkserver" (a class or module-level function).
+    num_envs:
+        Total number of envs. They are split into contiguous slices, one per
+        worker.
+    num_workers:
+        Worker processes; defaults to `min(num_envs, os.cpu_count())`.
+    autoreset:
+        If True, an env that finished on the previous step is reset
+        (unseeded) on the next `step` instead of being stepped; the new
+        episode's first observation replaces its row, with reward 0. If
+        False, finished envs are frozen until `reset`.
+    timeout:
+        Seconds to wait for a worker before declaring it dead.
+    """
+
+    def __init__(
+        self,
+        env_fn: Callable[[], Any],
+        num_envs: int,
+        num_workers: Optional[int] = None,
+        autoreset: bool = True,
+        timeout: float = 60.0,
+        start_method: Optional[str] = None,
+    ):
+        if num_envs < 1:
+            raise ValueError("num_envs must be >= 1")
+        self.num_envs = num_envs
+        self.num_workers = max(1, min(num_envs, num_workers or os.cpu_count() or 1))
+        self.timeout = timeout
+        self._closed = False
+
+        probe = env_fn()
+        obs_space = probe.observation_space
+        probe.close()
+        layout, size = _layout(
+            num_envs, self.num_workers, obs_space.shape, obs_space.dtype
+        )
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        assert self._shm.buf is not None
+        arrays = _views(self._shm.buf, layout)
+        self.obs = arrays["obs"]
+        self.actions = arrays["actions"]
+        self.rewards = arrays["rewards"]
+        self.terminated = arrays["terminated"]
+        self.truncated = arrays["truncated"]
+        self._seeds = arrays["seeds"]
+        self._command = arrays["command"]
+        self._failed = arrays["failed"]
+
+        ctx: Any = mp.get_context(start_method)  # BaseContext does not declare Process
+        self._errors = ctx.SimpleQueue()
+        self._go = [ctx.Semaphore(0) for _ in range(self.num_workers)]
+        self._done = [ctx.Semaphore(0) for _ in range(self.num_workers)]
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self._procs: List[Any] = []
+        for w in range(self.num_workers):
+            proc = ctx.Process(
+                target=_worker,
+                args=(
+                    w,
+                    env_fn,
+                    int(bounds[w]),
+                    int(bounds[w + 1]),
+                    autoreset,
+                    self._shm.name,
+                    layout,
+                    self._go[w],
+                    self._done[w],
+                    self._errors,
+                ),
+                name=f"clcone-env-{w}",
+                daemon=True,
+            )
+            proc.start()
+            self._procs.append(proc)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("SharedMemoryVecEnv is closed")
+
+    def _dispatch(self, cmd: int) -> None:
+        self._command[0] = cmd
+        for go in self._go:
+            go.release()
+        for w, done in enumerate(self._done):
+            while not done.acquire(timeout=self.timeout):
+                if not self._procs[w].is_alive():
+                    self.close()
+                    raise RuntimeError(
+                        f"env worker {w} died (exit code {self._procs[w].exitcode})"
+                    )
+        if self._failed.any():
+            index, tb = self._errors.get()
+            self.close()
+            raise RuntimeError(f"env worker {index} failed:\n{tb}")
+
+    def reset(self, seeds: Optional[Sequence[Optional[int]]] = None) -> np.ndarray:
+        """Reset every env, env `i` with `seeds[i]`; returns the shared `obs` view."""
+        self._check_open()
+        if seeds is None:
+            self._seeds[:] = _NO_SEED
+        else:
+            if len(seeds) != self.num_envs:
+                raise ValueError(f"expected {self.num_envs} seeds, got {len(seeds)}")
+            self._seeds[:] = [_NO_SEED if s is None else s for s in seeds]
+        self._dispatch(_RESET)
+        return self.obs
+
+    def step(
+        self, actions: Optional[Any] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Step every env. Pass `actions`, or write them into `self.actions` beforehand.
+
+        Returns shared views `(obs, rewards, terminated, truncated)`.
+        """
+        self._check_open()
+        if actions is not None:
+            self.actions[:] = actions
+        self._dispatch(_STEP)
+        return self.obs, self.rewards, self.terminated, self.truncated
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._command[0] = _CLOSE
+        for go in self._go:
+            go.release()
+        for proc in self._procs:
+            proc.join(timeout=self.timeout)
+            if proc.is_alive():
+                proc.terminate()
+        del self.obs, self.actions, self.rewards, self.terminated, self.truncated
+        del self._seeds, self._command, self._failed
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedMemoryVecEnv":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self.close()
+
+
+class _TemporalEnvFactory:
+    """Picklable `TemporalDiscountEnv` constructor."""
+
+    def __init__(self, max_steps: int):
+        self.max_steps = max_steps
+
+    def __call__(self) -> TemporalDiscountEnv:
+        return TemporalDiscountEnv(max_steps=self.max_steps)
+
+
+def collect_rollouts_parallel(
+    agent_factories: Mapping[str, Callable[[TemporalDiscountEnv], Any]],
+    episodes: int = 32,
+    max_steps: int = 48,
+    seed: int = 0,
+    num_envs: Optional[int] = None,
+    num_workers: Optional[int] = None,
+    batched_predict: bool = False,
+) -> Rollouts:
+    """`dissociation.collect_rollouts`, with episodes run in parallel worker processes.
+
+    Episodes are played `num_envs` at a time (default: all of them, capped
+    at 8 per worker). The agent reads each step's observations straight
+    from shared memory, row by row or, with `batched_predict` (SB3-style
+    agents), in one `predict` call. Only rows of live episodes are passed
+    to `predict`; padding rows of a short last batch are not.
+
+    Env seeds match `collect_rollouts`, but `predict` calls are interleaved
+    across the episodes of a batch (step t of every episode, then step
+    t + 1). Only observation-only agents, whose actions do not depend on
+    an internal RNG or on call history, therefore give identical
+    `Rollouts`; stochastic agents such as
+    `dissociation._monitoring_agent_factory` draw their randomness in a
+    different order.
+    """
+    names = list(agent_factories)
+    workers = max(1, min(episodes, num_workers or os.cpu_count() or 1))
+    num_envs = max(1, min(episodes, num_envs or 8 * workers))
+    actions = np.zeros((len(names), episodes, max_steps), dtype=np.int8)
+    signal = np.zeros((len(names), episodes))
+    local_env = TemporalDiscountEnv(
+        max_steps=max_steps
+    )  # handed to the agent factories
+
+    with SharedMemoryVecEnv(
+        _TemporalEnvFactory(max_steps), num_envs, workers, autoreset=False
+    ) as pool:
+        for p, name in enumerate(names):
+            agent = agent_factories[name](local_env)
+            for start in range(0, episodes, num_envs):
+                batch = min(num_envs, episodes - start)
+                seeds = [
+                    seed + start + i if i < batch else None for i in range(num_envs)
+                ]
+                obs = pool.reset(seeds)
+                signal[p, start : start + batch] = obs[:batch, 1]
+                live = np.ones(num_envs, dtype=bool)
+                live[batch:] = False
+                for t in range(max_steps):
+                    _predict_batch(agent, obs, pool.actions, batched_predict, live)
+                    actions[p, start : start + batch, t] = pool.actions[:batch]
+                    obs, _, terminated, truncated = pool.step()
+                    live &= ~(terminated | truncated)
+                    if not live.any():
+                        break
+    return Rollouts(names, actions, signal, local_env._apt_trigger_step)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from .CLcone_Assays import _dummy_agent_factory
+    from .dissociation import _monitoring_agent_factory, collect_rollouts
+
+    parser = argparse.ArgumentParser(
+        description="Compare serial and shared-memory parallel rollouts."
+    )
+    parser.add_argument("--episodes", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    factories = {
+        "patch": _dummy_agent_factory,
+        "monitor": _monitoring_agent_factory(0.3, seed=1),
+    }
+    t0 = time.perf_counter()
+    serial = collect_rollouts(factories, episodes=args.episodes)
+    t1 = time.perf_counter()
+    parallel = collect_rollouts_parallel(
+        factories, episodes=args.episodes, num_workers=args.workers
+    )
+    t2 = time.perf_counter()
+    print(
+        f"serial {t1 - t0:.3f}s, parallel ({args.workers} workers) {t2 - t1:.3f}s, "
+        f"same signals={np.array_equal(serial.signal, parallel.signal)}, "
+        f"same 'patch' actions={np.array_equal(serial.actions[0], parallel.actions[0])}"
+    )
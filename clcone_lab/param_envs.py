@@ -0,0 +1,346 @@
+"""Parametric, randomized variants of `TemporalDiscountEnv`.
+
+`TemporalDiscountEnv` always puts the APT trigger at `max_steps // 2`, pays
+`5 * signal` for monitoring within ±1 step of it, and runs for 48 steps. An
+agent can learn that layout instead of a horizon. Here every episode draws
+its own scenario from a `ScenarioDistribution`:
+
+- `trigger_fraction`: trigger step as a fraction of the episode length;
+- `window`: half-width of the monitoring window, in steps;
+- `monitor_reward`: reward scale for in-window monitoring (x signal);
+- `max_steps`: episode length;
+- `signal`: APT signal strength.
+
+Each spec is a constant, a `(low, high)` uniform range, or a callable
+`(rng, n) -> array`. The defaults reproduce `TemporalDiscountEnv`.
+
+Scenarios are kept as arrays (`ScenarioBatch`). `BatchedTemporalEnv` steps
+thousands of different scenarios together with a handful of numpy ops per
+step. `run_scenarios` plays an agent on one such batch, and
+`response_curve` bins the per-episode results by any scenario parameter.
+One run therefore gives e.g. window hit rate as a function of trigger
+position, not a single point. `ParametricTemporalEnv` is the single-env
+gymnasium version for training agents on the randomized family.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .dissociation import PATCH_REWARD, _predict_batch
+from .envs import TemporalDiscountEnv
+
+Spec = Union[
+    float, Tuple[float, float], Callable[[np.random.Generator, int], np.ndarray]
+]
+
+
+def _draw(
+    spec: Spec, rng: np.random.Generator, n: int, integer: bool = False
+) -> np.ndarray:
+    if callable(spec):
+        values = np.asarray(spec(rng, n), dtype=float).reshape(n)
+    elif isinstance(spec, tuple):
+        low, high = spec
+        if integer:
+            return rng.integers(int(low), int(high) + 1, size=n)
+        values = rng.uniform(low, high, size=n)
+    else:
+        values = np.full(n, float(spec))
+    return np.rint(values).astype(np.int64) if integer else values
+
+
+@dataclass
+class ScenarioDistribution:
+    """Per-episode scenario parameters; integer ranges are inclusive."""
+
+    trigger_fraction: Spec = 0.5
+    window: Spec = 1
+    monitor_reward: Spec = 5.0
+    max_steps: Spec = 48
+    signal: Spec = (0.1, 0.9)
+
+    def sample(self, n: int, rng: np.random.Generator) -> "ScenarioBatch":
+        max_steps = np.maximum(_draw(self.max_steps, rng, n, integer=True), 1)
+        fraction = _draw(self.trigger_fraction, rng, n)
+        trigger = np.clip(
+            np.floor(fraction * max_steps).astype(np.int64), 0, max_steps - 1
+        )
+        return ScenarioBatch(
+            trigger=trigger,
+            window=np.maximum(_draw(self.window, rng, n, integer=True), 0),
+            monitor_reward=_draw(self.monitor_reward, rng, n),
+            max_steps=max_steps,
+            signal=_draw(self.signal, rng, n).astype(np.float32).astype(float),
+        )
+
+
+@dataclass
+class ScenarioBatch:
+    """Scenario parameters of `n` episodes, one array per parameter."""
+
+    trigger: np.ndarray
+    window: np.ndarray
+    monitor_reward: np.ndarray
+    max_steps: np.ndarray
+    signal: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.trigger)
+
+    @property
+    def trigger_fraction(self) -> np.ndarray:
+        return self.trigger / self.max_steps
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        cols = {f.name: getattr(self, f.name) for f in fields(self)}
+        cols["trigger_fraction"] = self.trigger_fraction
+        return cols
+
+
+class BatchedTemporalEnv:
+    """`num_envs` parametric temporal-discount episodes stepped together.
+
+    Observations have the `TemporalDiscountEnv` layout `[t / (max_steps - 1),
+    signal]` per row, so existing agents run unchanged. Episodes of
+    different lengths finish at different steps. A finished row is frozen
+    (zero reward, `truncated` stays True) until the next `reset`.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        distribution: Optional[ScenarioDistribution] = None,
+        seed: Optional[int] = None,
+    ):
+        self.num_envs = num_envs
+        self.distribution = distribution or ScenarioDistribution()
+        self.rng = np.random.default_rng(seed)
+        self.scenarios = self.distribution.sample(num_envs, self.rng)
+        self.t = np.zeros(num_envs, dtype=np.int64)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.obs = np.zeros((num_envs, 2), dtype=np.float32)
+
+    def reset(
+        self, seed: Optional[int] = None, scenarios: Optional[ScenarioBatch] = None
+    ) -> np.ndarray:
+        """Start new episodes with freshly sampled (or the given) scenarios."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if scenarios is not None and len(scenarios) != self.num_envs:
+            raise ValueError(
+                f"expected {self.num_envs} scenarios, got {len(scenarios)}"
+            )
+        self.scenarios = (
+            self.distribution.sample(self.num_envs, self.rng)
+            if scenarios is None
+            else scenarios
+        )
+        self.t[:] = 0
+        self.truncated[:] = False
+        self._write_obs()
+        return self.obs
+
+    def _write_obs(self) -> None:
+        s = self.scenarios
+        self.obs[:, 0] = np.minimum(self.t, s.max_steps) / np.maximum(
+            1, s.max_steps - 1
+        )
+        self.obs[:, 1] = s.signal
+
+    def step(
+        self, actions: Any
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Apply one action per env.
+
+        Returns `(obs, reward, terminated, truncated, info)`.
+
+        `info["active"]` marks the rows that were still running this step.
+        """
+        actions = np.asarray(actions).reshape(self.num_envs)
+        s = self.scenarios
+        active = ~self.truncated
+        in_window = np.abs(self.t - s.trigger) <= s.window
+        reward = np.where(
+            actions == 0,
+            PATCH_REWARD,
+            np.where((actions == 1) & in_window, s.monitor_reward * s.signal, 0.0),
+        )
+        reward = np.where(active, reward, 0.0)
+        self.t += active
+        self.truncated |= self.t >= s.max_steps
+        self._write_obs()
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        return (
+            self.obs,
+            reward,
+            terminated,
+            self.truncated.copy(),
+            {"active": active, "in_window": in_window},
+        )
+
+
+@dataclass
+class ScenarioResults:
+    """Per-episode outcomes of `run_scenarios`, aligned with `scenarios`."""
+
+    scenarios: ScenarioBatch
+    local_utility: np.ndarray  # patch rewards
+    global_utility: np.ndarray  # in-window monitoring rewards
+    monitor_fraction: np.ndarray
+    window_hit_rate: np.ndarray  # share of window steps spent monitoring
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        cols = self.scenarios.columns()
+        cols.update(
+            local_utility=self.local_utility,
+            global_utility=self.global_utility,
+            monitor_fraction=self.monitor_fraction,
+            window_hit_rate=self.window_hit_rate,
+        )
+        return cols
+
+
+def run_scenarios(
+    agent: Any,
+    episodes: int = 1024,
+    distribution: Optional[ScenarioDistribution] = None,
+    seed: Optional[int] = 0,
+    batched_predict: bool = False,
+) -> ScenarioResults:
+    """Play `agent` once on each of `episodes` sampled scenarios, all in one batch.
+
+    With `batched_predict` the agent gets the whole `(episodes, 2)`
+    observation batch per step (SB3-style); otherwise it is asked row by row.
+    Scenarios that already ended are not passed to the agent.
+    """
+    env = BatchedTemporalEnv(episodes, distribution, seed)
+    obs = env.reset()
+    s = env.scenarios
+    local = np.zeros(episodes)
+    global_ = np.zeros(episodes)
+    monitors = np.zeros(episodes)
+    hits = np.zeros(episodes)
+    actions = np.zeros(episodes, dtype=np.int64)
+    live = np.ones(episodes, dtype=bool)
+    for _ in range(int(s.max_steps.max())):
+        _predict_batch(agent, obs, actions, batched_predict, live)
+        obs, reward, _, truncated, info = env.step(actions)
+        live = ~truncated
+        active = info["active"]
+        monitored = active & (actions == 1)
+        local += np.where(active & (actions == 0), reward, 0.0)
+        global_ += np.where(monitored, reward, 0.0)
+        monitors += monitored
+        hits += monitored & info["in_window"]
+        if truncated.all():
+            break
+    window_steps = (
+        np.minimum(s.trigger + s.window, s.max_steps - 1)
+        - np.maximum(s.trigger - s.window, 0)
+        + 1
+    )
+    return ScenarioResults(
+        scenarios=s,
+        local_utility=local,
+        global_utility=global_,
+        monitor_fraction=monitors / s.max_steps,
+        window_hit_rate=hits / window_steps,
+    )
+
+
+def response_curve(
+    results: ScenarioResults,
+    by: str = "trigger_fraction",
+    metric: str = "window_hit_rate",
+    bins: Union[int, np.ndarray] = 10,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mean of `metric` per bin of scenario parameter `by`.
+
+    Returns `(bin_centers, mean, count)`; empty bins have mean NaN.
+    """
+    cols = results.columns()
+    x, y = cols[by].astype(float), cols[metric].astype(float)
+    edges = np.histogram_bin_edges(x, bins=bins)
+    index = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, len(edges) - 2)
+    count = np.bincount(index, minlength=len(edges) - 1)
+    total = np.bincount(index, weights=y, minlength=len(edges) - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    return (edges[:-1] + edges[1:]) / 2.0, mean, count
+
+
+class ParametricTemporalEnv(TemporalDiscountEnv):
+    """Single-episode gymnasium env that draws a new scenario on every reset.
+
+    `max_steps` in the constructor is only the initial value; each episode
+    uses its sampled length.
+    """
+
+    def __init__(
+        self, distribution: Optional[ScenarioDistribution] = None, max_steps: int = 48
+    ):
+        super().__init__(max_steps=max_steps)
+        self.distribution = distribution or ScenarioDistribution()
+        self._window = 1
+        self._monitor_reward = 5.0
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ):
+        super().reset(seed=seed)
+        scenario = self.distribution.sample(1, self.np_random)
+        self.max_steps = int(scenario.max_steps[0])
+        self._apt_trigger_step = int(scenario.trigger[0])
+        self._apt_signal_strength = float(scenario.signal[0])
+        self._window = int(scenario.window[0])
+        self._monitor_reward = float(scenario.monitor_reward[0])
+        self._t = 0
+        info: Dict[str, Any] = {
+            "trigger": self._apt_trigger_step,
+            "window": self._window,
+            "monitor_reward": self._monitor_reward,
+            "max_steps": self.max_steps,
+        }
+        return self._get_obs(), info
+
+    def step(self, action: int):
+        if action not in (0, 1):
+            raise ValueError(f"Invalid action: {action}")
+        in_window = abs(self._t - self._apt_trigger_step) <= self._window
+        reward = (
+            PATCH_REWARD
+            if action == 0
+            else (
+                self._monitor_reward * self._apt_signal_strength if in_window else 0.0
+            )
+        )
+        self._t += 1
+        truncated = self._t >= self.max_steps
+        info = {"local_action": "patch_trivial" if action == 0 else "monitor_apt"}
+        return self._get_obs(), reward, False, truncated, info
+
+
+if __name__ == "__main__":
+    from .reference_zoo import train_reference_zoo
+
+    zoo = train_reference_zoo(gammas=(0.5, 0.9, 0.99), iterations=60)
+    wide = ScenarioDistribution(
+        trigger_fraction=(0.1, 0.9),
+        window=(0, 3),
+        monitor_reward=(2.0, 8.0),
+        max_steps=48,
+    )
+    for gamma in zoo.gammas:
+        results = run_scenarios(
+            zoo.agent(float(gamma)),
+            episodes=4096,
+            distribution=wide,
+            batched_predict=True,
+        )
+        centers, mean, _ = response_curve(results, by="trigger_fraction", bins=8)
+        curve = " ".join(f"{c:.2f}:{m:.2f}" for c, m in zip(centers, mean))
+        print(f"gamma={gamma:<5g} window hit rate by trigger position  {curve}")
@@ -0,0 +1,346 @@
+"""Opt-in profiling for assay and orchestrator runs.
+
+Set `CLCONE_PROFILE` to one of the modes below, or pass `--profile MODE` to
+the `persuadable-defender` CLI. `run_temporal_assay`,
+`evaluate_agent_on_barriers` and `GAO_Orchestrator.execute_command` then
+profile themselves without code changes:
+
+- "cprofile": deterministic `cProfile`. Stacks are rebuilt from the
+  caller graph by following each function's dominant caller, and weighted
+  by own time in microseconds. cProfile can only follow one thread at a
+  time, so threads entering the same session take turns.
+- "sample": a background thread samples the stack of every thread that is
+  inside the session every `CLCONE_PROFILE_INTERVAL` seconds (default
+  1 ms). Weights are sample counts. Overhead stays low and threads do not
+  wait for each other, so this is the mode for the GAO hot path.
+- "tracemalloc": bytes allocated inside the profiled region and still alive
+  when it ends, keyed by allocation traceback. Tracing is process-wide:
+  when threads overlap, the region runs from the first entry to the last
+  exit.
+
+Output is one collapsed-stack file (`frame;frame;frame weight` per line) per
+session, written to `CLCONE_PROFILE_DIR` (default `./profiles`). Feed it to
+flamegraph.pl, speedscope or inferno.
+
+`PhaseTimer` is the cheap, always-on counterpart. The assays record coarse
+phase timings into `raw_metrics["phase_seconds"]` /
+`TAMESummary.phase_seconds`. The GAO adds `info["phase_seconds"]` while
+profiling is enabled.
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+
+if TYPE_CHECKING:
+    import cProfile
+
+MODES = ("cprofile", "sample", "tracemalloc")
+
+ENV_MODE = "CLCONE_PROFILE"
+ENV_DIR = "CLCONE_PROFILE_DIR"
+ENV_INTERVAL = "CLCONE_PROFILE_INTERVAL"
+
+_MAX_DEPTH = 128
+_session_ids = itertools.count()
+
+
+def mode_from_env() -> Optional[str]:
+    """Profiling mode requested via `CLCONE_PROFILE`, or None."""
+    mode = os.environ.get(ENV_MODE, "").strip().lower()
+    if not mode or mode in ("0", "off", "none"):
+        return None
+    if mode not in MODES:
+        raise ValueError(f"{ENV_MODE}={mode!r}; expected one of {MODES}")
+    return mode
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase; `lap` times since the previous lap."""
+
+    __slots__ = ("phases", "_last")
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.add(phase, now - self._last)
+        self._last = now
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def reset(self) -> None:
+        self._last = time.perf_counter()
+
+
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _stack_of(frame) -> str:
+    names: List[str] = []
+    while frame is not None and len(names) < _MAX_DEPTH:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profiler:
+    """One profiling session; use as a context manager around profiled work.
+
+    The session may be entered many times, e.g. once per `execute_command`,
+    and from several threads at once. Nesting is tracked per thread, and
+    collection starts and stops on the thread that entered. Results
+    accumulate until `close()`, which writes the collapsed stacks and
+    returns the file path.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        name: str,
+        out_dir: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(
+                f"unknown profiling mode {mode!r}; expected one of {MODES}"
+            )
+        self.mode = mode
+        self.name = name
+        self.out_dir = out_dir or os.environ.get(ENV_DIR, "profiles")
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.environ.get(ENV_INTERVAL, "0.001"))
+        )
+        self.path: Optional[str] = None
+        self.stacks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-thread nesting depth
+        self._closed = False
+        self._profile: Optional[cProfile.Profile] = None
+        self._profile_turn = threading.Lock()  # held by the thread cProfile follows
+        self._sampler: Optional[threading.Thread] = None
+        self._targets: Set[int] = set()
+        self._active = threading.Event()
+        self._tracing = 0  # threads inside a tracemalloc region
+        self._stop = threading.Event()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+
+    # -- session control ----------------------------------------------------
+
+    def __enter__(self) -> "Profiler":
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth > 0:
+            return self
+        if self.mode == "cprofile":
+            self._profile_turn.acquire()
+            if self._profile is None:
+                import cProfile  # deferred: only this mode needs it
+
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "sample":
+            with self._lock:
+                self._targets.add(threading.get_ident())
+                if self._sampler is None:
+                    self._sampler = threading.Thread(
+                        target=self._sample_loop, name="clcone-sampler", daemon=True
+                    )
+                    self._sampler.start()
+                self._active.set()
+        else:
+            with self._lock:
+                self._tracing += 1
+                if self._tracing == 1:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start(_MAX_DEPTH)
+                        self._started_tracemalloc = True
+                    self._baseline = tracemalloc.take_snapshot()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        if self.mode == "cprofile":
+            assert self._profile is not None
+            self._profile.disable()
+            self._profile_turn.release()
+        elif self.mode == "sample":
+            with self._lock:
+                self._targets.discard(threading.get_ident())
+                if not self._targets:
+                    self._active.clear()
+        else:
+            with self._lock:
+                self._tracing -= 1
+                if self._tracing > 0:
+                    return
+                assert self._baseline is not None
+                diff = tracemalloc.take_snapshot().compare_to(
+                    self._baseline, "traceback"
+                )
+                self._baseline = None
+                for stat in diff:
+                    if stat.size_diff > 0:
+                        key = ";".join(
+                            f"{os.path.basename(f.filename)}:{f.lineno}"
+                            for f in reversed(stat.traceback)
+                        )
+                        self.stacks[key] = self.stacks.get(key, 0) + stat.size_diff
+
+    def _sample_loop(self) -> None:
+        while not self._stop.is_set():
+            if not self._active.wait(0.05):
+                continue
+            self._sample_once()
+            time.sleep(self.interval)
+
+    def _sample_once(self) -> None:
+        frames = sys._current_frames()
+        with self._lock:
+            for target in self._targets:
+                frame = frames.get(target)
+                if frame is not None:
+                    stack = _stack_of(frame)
+                    self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    # -- output -------------------------------------------------------------
+
+    def _cprofile_stacks(self) -> Dict[str, int]:
+        if self._profile is None:
+            return {}
+        import pstats
+
+        stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+
+        def label(func) -> str:
+            filename, _, funcname = func
+            return f"{os.path.basename(filename)}:{funcname}"
+
+        stacks: Dict[str, int] = {}
+        for func, (_, _, tottime, _, callers) in stats.items():
+            weight = int(tottime * 1e6)
+            if weight <= 0:
+                continue
+            chain, seen, current = [label(func)], {func}, callers
+            while current and len(chain) < _MAX_DEPTH:
+                parent = max(current, key=lambda c: current[c][3])
+                if parent in seen:
+                    break
+                seen.add(parent)
+                chain.append(label(parent))
+                current = stats[parent][4] if parent in stats else {}
+            key = ";".join(reversed(chain))
+            stacks[key] = stacks.get(key, 0) + weight
+        return stacks
+
+    def collapsed(self) -> Dict[str, int]:
+        """Stack -> weight, in this session's units (see module docstring)."""
+        if self.mode == "cprofile":
+            return self._cprofile_stacks()
+        with self._lock:
+            return dict(self.stacks)
+
+    def close(self) -> Optional[str]:
+        """Stop collection and write the collapsed stacks; returns the path."""
+        if self._closed:
+            return self.path
+        self._closed = True
+        self._stop.set()
+        self._active.set()  # wake the sampler so it can exit
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        stacks = self.collapsed()
+        if not stacks:
+            return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(
+            self.out_dir,
+            f"{self.name}.{self.mode}.{os.getpid()}.{next(_session_ids)}.folded",
+        )
+        with open(path, "w") as f:
+            for stack, weight in sorted(stacks.items()):
+                f.write(f"{stack} {weight}\n")
+        self.path = path
+        return path
+
+
+@contextmanager
+def profiled(name: str, mode: Optional[str] = None) -> Iterator[Optional[Profiler]]:
+    """One-shot session around a block; yields None when profiling is off.
+
+    `mode` overrides `CLCONE_PROFILE`. The file is written when the block
+    exits; read it from `profiler.path`.
+    """
+    mode = mode or mode_from_env()
+    if mode is None:
+        yield None
+        return
+    profiler = Profiler(mode, name)
+    try:
+        with profiler:
+            yield profiler
+    finally:
+        profiler.close()
+
+
+def session_from_env(name: str, mode: Optional[str] = None) -> Optional[Profiler]:
+    """Long-lived session (e.g. for an orchestrator), written at interpreter exit."""
+    mode = mode or mode_from_env()
+    if mode is None:
+        return None
+    profiler = Profiler(mode, name)
+    atexit.register(profiler.close)
+    return profiler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .barrier_tame_assay import (
+        HeuristicBarrierAgent,
+        evaluate_agent_on_barriers,
+        load_barriers_from_json,
+    )
+    from .CLcone_Assays import _dummy_agent_factory, run_temporal_assay
+
+    parser = argparse.ArgumentParser(description="Profile the demo assays.")
+    parser.add_argument("--mode", choices=MODES, default="sample")
+    parser.add_argument(
+        "--barriers",
+        default=os.path.join(
+            os.path.dirname(__file__), "..", "examples", "barriers_example.json"
+        ),
+    )
+    args = parser.parse_args()
+
+    report = run_temporal_assay(_dummy_agent_factory, profile=args.mode)
+    print(
+        "temporal phases:",
+        report.raw_metrics["phase_seconds"],
+        "->",
+        report.raw_metrics.get("profile"),
+    )
+    barriers = load_barriers_from_json(args.barriers) * 200
+    summary = evaluate_agent_on_barriers(
+        HeuristicBarrierAgent(), barriers, profile=args.mode
+    )
+    print("barrier phases:", summary.phase_seconds)
@@ -0,0 +1,245 @@
+"""Reference agents with known discount factors for `TemporalDiscountEnv`.
+
+`train_reference_zoo` learns one tabular Q-policy per discount factor in a
+grid, all in the same numpy pass. Q has shape `(gammas, steps, signal_bins,
+2)`. Each iteration samples a batch of episodes (APT signal strengths),
+sweeps the steps backwards, and applies one averaged Q-learning update per
+visited `(gamma, step, bin, action)` cell, using `np.bincount` over every
+gamma and episode at once.
+
+The env pays the monitoring reward on the step it is earned, so taken
+literally every gamma has the same optimal policy. The env's design
+(see its docstring) treats monitoring as a *delayed* reward. The trainer
+models that with `monitor_delay`: a monitoring reward that arrives `d`
+steps later is worth `gamma ** d` of its value at the step it was earned.
+That is the exact discounted return if the reward were paid `d` steps
+later, and it keeps the state Markov. The optimal policy then monitors in
+the APT window only when `5 * signal * gamma ** d > 1`, so the zoo spans
+pure patchers (low gamma) to window monitors (high gamma).
+
+The zoo is saved as one `.npz` file. `ReferenceZoo.factory(gamma)` plugs
+into `run_temporal_assay` / `collect_rollouts`. Agents expose
+`policy.gamma`, so `estimate_discount_rate` reads back the true D.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .dissociation import MONITOR_REWARD, MONITOR_WINDOW, PATCH_REWARD
+from .envs import TemporalDiscountEnv
+
+DEFAULT_GAMMAS: Tuple[float, ...] = (
+    0.0,
+    0.5,
+    0.7,
+    0.8,
+    0.85,
+    0.9,
+    0.93,
+    0.95,
+    0.97,
+    0.99,
+)
+
+
+@dataclass
+class TabularQPolicy:
+    """Greedy policy over a `(steps, signal_bins, 2)` Q-table."""
+
+    q: np.ndarray
+    gamma: float
+    max_steps: int
+
+    def state(self, obs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        obs = np.asarray(obs, dtype=float)
+        steps = np.clip(
+            np.rint(obs[..., 0] * max(1, self.max_steps - 1)).astype(int),
+            0,
+            self.max_steps - 1,
+        )
+        bins = self.q.shape[1]
+        signal_bins = np.clip((obs[..., 1] * bins).astype(int), 0, bins - 1)
+        return steps, signal_bins
+
+    def act(self, obs: np.ndarray) -> np.ndarray:
+        steps, signal_bins = self.state(obs)
+        return np.argmax(self.q[steps, signal_bins], axis=-1)
+
+
+class ReferenceAgent:
+    """SB3-style wrapper: `predict(obs)` accepts one observation or a batch."""
+
+    def __init__(self, policy: TabularQPolicy):
+        self.policy = policy
+
+    def predict(self, obs: Any, deterministic: bool = True):
+        return np.atleast_1d(self.policy.act(obs)), None
+
+
+@dataclass
+class ReferenceZoo:
+    """Q-tables for a grid of discount factors.
+
+    Parameters
+    ----------
+    gammas:
+        `(G,)` discount factors.
+    q:
+        `(G, max_steps, signal_bins, 2)` learned action values.
+    max_steps:
+        Episode length the zoo was trained for.
+    monitor_delay:
+        Delay (in steps) with which monitoring rewards were discounted.
+    """
+
+    gammas: np.ndarray
+    q: np.ndarray
+    max_steps: int
+    monitor_delay: int
+
+    def policy(self, gamma: float) -> TabularQPolicy:
+        """Policy with the discount factor closest to `gamma`."""
+        g = int(np.argmin(np.abs(self.gammas - gamma)))
+        return TabularQPolicy(self.q[g], float(self.gammas[g]), self.max_steps)
+
+    def agent(self, gamma: float) -> ReferenceAgent:
+        return ReferenceAgent(self.policy(gamma))
+
+    def factory(self, gamma: float) -> Callable[[TemporalDiscountEnv], ReferenceAgent]:
+        """Agent factory in the form `run_temporal_assay` expects."""
+
+        def make(env: TemporalDiscountEnv) -> ReferenceAgent:
+            if getattr(env, "max_steps", self.max_steps) != self.max_steps:
+                raise ValueError(
+                    f"zoo trained for max_steps={self.max_steps}, "
+                    f"env has {env.max_steps}"
+                )
+            return self.agent(gamma)
+
+        return make
+
+    def factories(self) -> Dict[str, Callable[[TemporalDiscountEnv], ReferenceAgent]]:
+        return {f"gamma={g:g}": self.factory(float(g)) for g in self.gammas}
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            gammas=self.gammas,
+            q=self.q,
+            max_steps=self.max_steps,
+            monitor_delay=self.monitor_delay,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceZoo":
+        with np.load(path) as data:
+            return cls(
+                gammas=data["gammas"],
+                q=data["q"],
+                max_steps=int(data["max_steps"]),
+                monitor_delay=int(data["monitor_delay"]),
+            )
+
+
+def train_reference_zoo(
+    gammas: Sequence[float] = DEFAULT_GAMMAS,
+    iterations: int = 200,
+    episodes: int = 256,
+    max_steps: int = 48,
+    signal_bins: int = 16,
+    monitor_delay: int = 6,
+    alpha: float = 0.5,
+    epsilon: float = 0.3,
+    seed: Optional[int] = 0,
+) -> ReferenceZoo:
+    """Learn a greedy Q-policy for every discount factor in `gammas` at once.
+
+    Parameters
+    ----------
+    iterations:
+        Number of sampled batches; each is swept backwards over all steps.
+    episodes:
+        Episodes per batch, shared by all gammas.
+    signal_bins:
+        Resolution of the APT signal axis of the Q-table.
+    monitor_delay:
+        Steps by which monitoring rewards are treated as delayed (see
+        module docstring); 0 reproduces the env's immediate payout.
+    alpha, epsilon:
+        Learning rate and exploration rate of the epsilon-greedy behaviour
+        policy.
+    """
+    rng = np.random.default_rng(seed)
+    g = np.asarray(gammas, dtype=float)
+    n_g = len(g)
+    env = TemporalDiscountEnv(max_steps=max_steps)
+    low, high = 0.1, 0.9  # range of `_apt_signal_strength` drawn at reset
+    trigger = env._apt_trigger_step
+
+    q = np.zeros((n_g, max_steps, signal_bins, 2))
+    monitor_value = MONITOR_REWARD * g[:, None] ** monitor_delay  # (G, 1)
+    gamma_col = g[:, None]
+    cell_base = (np.arange(n_g) * signal_bins * 2)[
+        :, None
+    ]  # (G, 1) offset of each gamma's block
+
+    for _ in range(iterations):
+        signal = rng.uniform(low, high, size=episodes).astype(np.float32).astype(float)
+        bins = np.clip((signal * signal_bins).astype(int), 0, signal_bins - 1)  # (E,)
+        for t in range(max_steps - 1, -1, -1):
+            q_t = q[:, t, bins]  # (G, E, 2)
+            greedy = np.argmax(q_t, axis=-1)
+            explore = rng.random((n_g, episodes)) < epsilon
+            actions = np.where(
+                explore, rng.integers(0, 2, size=(n_g, episodes)), greedy
+            )
+
+            in_window = abs(t - trigger) <= MONITOR_WINDOW
+            target = np.where(
+                actions == 0, PATCH_REWARD, monitor_value * signal if in_window else 0.0
+            )
+            if t + 1 < max_steps:
+                target = target + gamma_col * q[:, t + 1, bins].max(axis=-1)
+
+            cells = (cell_base + bins * 2 + actions).ravel()
+            size = n_g * signal_bins * 2
+            sums = np.bincount(cells, weights=target.ravel(), minlength=size)
+            counts = np.bincount(cells, minlength=size)
+            q_step = q[:, t].reshape(-1)  # copy; written back below
+            seen = counts > 0
+            q_step[seen] += alpha * (sums[seen] / counts[seen] - q_step[seen])
+            q[:, t] = q_step.reshape(n_g, signal_bins, 2)
+
+    return ReferenceZoo(gammas=g, q=q, max_steps=max_steps, monitor_delay=monitor_delay)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .CLcone_Assays import run_temporal_assay
+    from .dissociation import collect_rollouts
+
+    parser = argparse.ArgumentParser(
+        description="Train and save the reference agent zoo."
+    )
+    parser.add_argument("--out", default="reference_zoo.npz")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--monitor-delay", type=int, default=6)
+    args = parser.parse_args()
+
+    zoo = train_reference_zoo(
+        iterations=args.iterations, monitor_delay=args.monitor_delay
+    )
+    zoo.save(args.out)
+    rollouts = collect_rollouts(zoo.factories(), episodes=64)
+    for p, name in enumerate(rollouts.policies):
+        report = run_temporal_assay(zoo.factory(float(zoo.gammas[p])))
+        print(
+            f"{name:<12} monitor fraction={rollouts.actions[p].mean():.3f}  "
+            f"D={report.discount_rate:.2f}"
+        )
+    print(f"Saved {len(zoo.gammas)} policies to {args.out}")
@@ -0,0 +1,348 @@
+"""Local SQLite warehouse for assay results.
+
+`CLconeReport` and `TAMESummary` used to be printed and thrown away. This
+module keeps them so historical questions don't require rerunning an assay:
+
+    with ResultsWarehouse("assays.db") as wh:
+        wh.record_barriers("agent-7", summary, barriers)
+        cols = wh.trend("agent-7", "fitness", barrier_type="policy", last=90)
+        cols["value"]  # numpy array, oldest run first
+
+Schema:
+
+- `runs`: one row per assay run (agent, kind, time, headline score, and
+  the scalar summary fields as JSON).
+- `barrier_outcomes`: one row per `BarrierOutcome`, including the
+  barrier's type.
+- `temporal_episodes`: long-format per-episode metrics of temporal runs,
+  e.g. the local/global utilities from `dissociation.rollout_utilities`.
+
+The database runs in WAL mode, so analysts can query while an assay job
+writes. Each run is stored in one transaction, with `executemany` for its
+outcome and episode rows. Trend queries use the indexes on agent, time,
+barrier and barrier type. numpy is imported only when results are
+exported as columns.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import asdict, fields
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .barrier_tame_assay import Barrier, BarrierOutcome, TAMESummary
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .CLcone_Assays import CLconeReport
+
+# Numeric BarrierOutcome fields, stored as columns; `success` is 0/1.
+OUTCOME_METRICS: Tuple[str, ...] = tuple(
+    f.name for f in fields(BarrierOutcome) if f.name not in ("barrier_id", "notes")
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    agent_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created REAL NOT NULL,
+    score REAL,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS barrier_outcomes (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    barrier_id TEXT NOT NULL,
+    barrier_type TEXT,
+    {", ".join(f"{name} REAL" for name in OUTCOME_METRICS)},
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS temporal_episodes (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    episode INTEGER NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, metric, episode)
+);
+CREATE INDEX IF NOT EXISTS runs_agent_created ON runs(agent_id, created);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created);
+CREATE INDEX IF NOT EXISTS outcomes_run_type ON barrier_outcomes(run_id, barrier_type);
+CREATE INDEX IF NOT EXISTS outcomes_barrier ON barrier_outcomes(barrier_id, run_id);
+CREATE INDEX IF NOT EXISTS outcomes_type ON barrier_outcomes(barrier_type, run_id);
+"""
+
+_OUTCOME_INSERT = (
+    "INSERT INTO barrier_outcomes (run_id, barrier_id, barrier_type, "
+    f"{', '.join(OUTCOME_METRICS)}, notes) "
+    f"VALUES ({', '.join('?' * (len(OUTCOME_METRICS) + 4))})"
+)
+
+
+class ResultsWarehouse:
+    """Append-only store of assay runs; safe for one writer and many readers.
+
+    Parameters
+    ----------
+    path:
+        SQLite file, created if missing. ":memory:" works for tests.
+    timeout:
+        Seconds to wait on a lock held by another writer.
+    """
+
+    def __init__(self, path: str = "assays.db", timeout: float = 30.0):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "PRAGMA synchronous=NORMAL"
+        )  # durable at checkpoints; fine for results
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    # -- writing --------------------------------------------------------------
+
+    def _insert_run(
+        self,
+        agent_id: str,
+        kind: str,
+        score: Optional[float],
+        summary: Mapping[str, Any],
+        created: Optional[float],
+    ) -> int:
+        cur = self._conn.execute(
+            "INSERT INTO runs (agent_id, kind, created, score, summary) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                agent_id,
+                kind,
+                time.time() if created is None else created,
+                score,
+                json.dumps(summary, default=str),
+            ),
+        )
+        assert cur.lastrowid is not None  # always set after a successful INSERT
+        return cur.lastrowid
+
+    def record_barriers(
+        self,
+        agent_id: str,
+        summary: TAMESummary,
+        barriers: Optional[Sequence[Barrier]] = None,
+        created: Optional[float] = None,
+    ) -> int:
+        """Store a barrier run and its outcomes; returns the run id.
+
+        `barriers` supplies each outcome's `barrier_type` (matched on id).
+        Without it the type is NULL and type-filtered trends skip the run.
+        """
+        types = {b.id: b.barrier_type for b in barriers or ()}
+        scalars = {k: v for k, v in asdict(summary).items() if k != "outcomes"}
+        rows = [
+            (
+                o.barrier_id,
+                types.get(o.barrier_id),
+                *(float(getattr(o, m)) for m in OUTCOME_METRICS),
+                o.notes,
+            )
+            for o in summary.outcomes
+        ]
+        with self._conn:
+            run_id = self._insert_run(
+                agent_id, "barriers", summary.mean_fitness, scalars, created
+            )
+            self._conn.executemany(_OUTCOME_INSERT, [(run_id, *row) for row in rows])
+        return run_id
+
+    def record_temporal(
+        self,
+        agent_id: str,
+        report: CLconeReport,
+        episodes: Optional[Mapping[str, Sequence[float]]] = None,
+        created: Optional[float] = None,
+    ) -> int:
+        """Store a temporal run; returns the run id.
+
+        `episodes` maps metric name to one value per episode, e.g.
+        `{"local_utility": local[i], "global_utility": global_[i]}` for one
+        row of `rollout_utilities`.
+        """
+        scalars = asdict(report)
+        rows = [
+            (metric, episode, float(value))
+            for metric, values in (episodes or {}).items()
+            for episode, value in enumerate(values)
+        ]
+        with self._conn:
+            run_id = self._insert_run(
+                agent_id, "temporal", report.C_Lcone_score, scalars, created
+            )
+            self._conn.executemany(
+                "INSERT INTO temporal_episodes (run_id, metric, episode, value) "
+                "VALUES (?, ?, ?, ?)",
+                [(run_id, *row) for row in rows],
+            )
+        return run_id
+
+    # -- reading --------------------------------------------------------------
+
+    def query(
+        self, sql: str, params: Sequence[Any] = ()
+    ) -> Tuple[List[str], List[tuple]]:
+        """Run a read query; returns `(column names, rows)`."""
+        cur = self._conn.execute(sql, params)
+        names = [d[0] for d in cur.description or ()]
+        return names, cur.fetchall()
+
+    def columns(self, sql: str, params: Sequence[Any] = ()) -> Dict[str, np.ndarray]:
+        """Run a read query and return its result as one numpy array per column."""
+        import numpy as np
+
+        names, rows = self.query(sql, params)
+        data = list(zip(*rows)) if rows else [()] * len(names)
+        out: Dict[str, np.ndarray] = {}
+        for name, values in zip(names, data):
+            if all(isinstance(v, int) for v in values):
+                out[name] = np.array(values, dtype=np.int64)
+            elif all(v is None or isinstance(v, (int, float)) for v in values):
+                out[name] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=float
+                )
+            else:
+                out[name] = np.array(values, dtype=object)
+        return out
+
+    def trend(
+        self,
+        agent_id: str,
+        metric: str = "fitness",
+        barrier_type: Optional[str] = None,
+        barrier_id: Optional[str] = None,
+        last: Optional[int] = 90,
+    ) -> Dict[str, np.ndarray]:
+        """Per-run mean of `metric` for one agent over its `last` runs, oldest first.
+
+        `metric` is an `OUTCOME_METRICS` name (averaged over the run's
+        barriers, optionally filtered by type or id), "score" (the run's
+        headline score), or a per-episode metric of temporal runs. Columns
+        are `run_id`, `created`, `value` and `n` (rows averaged).
+        """
+        where: List[str] = ["r.agent_id = ?"]
+        params: List[Any] = [agent_id]
+        if metric in OUTCOME_METRICS:
+            value, count, join = (
+                f"AVG(o.{metric})",
+                "COUNT(*)",
+                "JOIN barrier_outcomes o ON o.run_id = r.id",
+            )
+            if barrier_type is not None:
+                where.append("o.barrier_type = ?")
+                params.append(barrier_type)
+            if barrier_id is not None:
+                where.append("o.barrier_id = ?")
+                params.append(barrier_id)
+        elif barrier_type is not None or barrier_id is not None:
+            raise ValueError(
+                f"barrier filters only apply to outcome metrics {OUTCOME_METRICS}"
+            )
+        elif metric == "score":
+            value, count, join = "r.score", "1", ""
+        else:
+            value, count, join = (
+                "AVG(e.value)",
+                "COUNT(*)",
+                "JOIN temporal_episodes e ON e.run_id = r.id",
+            )
+            where.append("e.metric = ?")
+            params.append(metric)
+        sql = (
+            "SELECT r.id AS run_id, r.created AS created, "
+            f"{value} AS value, {count} AS n FROM runs r {join}"
+            f" WHERE {' AND '.join(where)} GROUP BY r.id"
+            " ORDER BY r.created DESC, r.id DESC"
+        )
+        if last is not None:
+            sql += " LIMIT ?"
+            params.append(int(last))
+        cols = self.columns(sql, params)
+        return {name: values[::-1] for name, values in cols.items()}
+
+    def runs(
+        self,
+        agent_id: Optional[str] = None,
+        kind: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run rows (with decoded summaries), oldest first."""
+        where, params = [], []
+        for clause, value in (
+            ("agent_id = ?", agent_id),
+            ("kind = ?", kind),
+            ("created >= ?", since),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = "SELECT id, agent_id, kind, created, score, summary FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        _, rows = self.query(sql + " ORDER BY created, id", params)
+        return [
+            {
+                "id": r[0],
+                "agent_id": r[1],
+                "kind": r[2],
+                "created": r[3],
+                "score": r[4],
+                "summary": json.loads(r[5]),
+            }
+            for r in rows
+        ]
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsWarehouse":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from .barrier_tame_assay import (
+        HeuristicBarrierAgent,
+        evaluate_agent_on_barriers,
+        load_barriers_from_json,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Record a few demo barrier runs and print a trend."
+    )
+    parser.add_argument("--db", default=":memory:")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--barriers",
+        default=os.path.join(
+            os.path.dirname(__file__), "..", "examples", "barriers_example.json"
+        ),
+    )
+    args = parser.parse_args()
+
+    barriers = load_barriers_from_json(args.barriers)
+    with ResultsWarehouse(args.db) as wh:
+        for _ in range(args.runs):
+            wh.record_barriers(
+                "heuristic",
+                evaluate_agent_on_barriers(HeuristicBarrierAgent(), barriers),
+                barriers,
+            )
+        trend = wh.trend("heuristic", "fitness", barrier_type="policy")
+        print("policy fitness by run:", trend["value"])
@@ -1,14 +1,40 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
-from typing import Dict, Any, Protocol, Tuple
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+from .admission import AdmissionController
+from .metrics import GAOMetrics
+from .registry import AgentRegistry, RegistryLike
+from .rules import CacheStats, DecisionCache, RiskRule, RuleEngine, normalize_command
+
+if TYPE_CHECKING:  # audit imports this module
+    from clcone_lab.profiling import Profiler
+
+    from .audit import AuditLog
+    from .executors import LogSink
+
+# Same variable as `clcone_lab.profiling.ENV_MODE`; checked here so that
+# clcone_lab is only imported when profiling is actually requested.
+_PROFILE_ENV = "CLCONE_PROFILE"
 
 
 class GlobalExecutor(Protocol):
     """Execution surface for commands that have passed GAO checks."""
 
-    def execute(self, command: str) -> Dict[str, Any]:
-        ...
+    def execute(self, command: str) -> Dict[str, Any]: ...
 
 
 @dataclass
@@ -18,6 +44,7 @@ class AgentProfile:
     temporal_horizon: float = 0.0
     spatial_horizon: float = 0.0
     discount_rate: float = 0.0
+    tenant: Optional[str] = None
 
 
 @dataclass
@@ -28,9 +55,31 @@ class GlobalSecurityPolicy:
     min_score_medium_risk: float = 0.3
     min_score_high_risk: float = 0.7
 
+    def required_score(self, risk: str, tenant: Optional[str] = None) -> float:
+        """Threshold for `risk`.
+
+        `tenant` is ignored; see `tenancy.TenantPolicyTable`.
+        """
+        if risk == "high":
+            return self.min_score_high_risk
+        if risk == "medium":
+            return self.min_score_medium_risk
+        return self.min_score_low_risk
+
+
+class PolicyLike(Protocol):
+    """Threshold source: `GlobalSecurityPolicy` or `tenancy.TenantPolicyTable`."""
+
+    def required_score(self, risk: str, tenant: Optional[str] = None) -> float: ...
+
 
 class RiskClassifier:
-    """Very simple keyword-based command risk classifier.
+    """Keyword-based command risk classifier backed by a compiled rule engine.
+
+    Commands are normalized (see `rules.normalize_command`) and matched against
+    all rules in a single pass; decisions are memoized in an LRU cache keyed by
+    the normalized command. Pass `rules` (e.g. from `rules.load_rules`) to
+    replace the built-in keywords.
 
     In a real deployment, replace this with a richer policy engine or model.
     """
@@ -38,20 +87,65 @@ class RiskClassifier:
     HIGH_RISK_KEYWORDS = ("shutdown", "poweroff", "systemctl stop", "delete", "rm -rf")
     MEDIUM_RISK_KEYWORDS = ("iptables", "ufw", "firewall-cmd")
 
+    def __init__(
+        self, rules: Optional[Sequence[RiskRule]] = None, cache_size: int = 4096
+    ):
+        if rules is None:
+            rules = [RiskRule(f"high:{k}", k, "high") for k in self.HIGH_RISK_KEYWORDS]
+            rules += [
+                RiskRule(f"medium:{k}", k, "medium") for k in self.MEDIUM_RISK_KEYWORDS
+            ]
+        self.engine = RuleEngine(rules)
+        self.cache = DecisionCache(maxsize=cache_size)
+
+    def classify_with_rule(self, command: str) -> Tuple[str, Optional[str]]:
+        """Return `(risk, rule_id)`; `rule_id` is None for unmatched commands."""
+        normalized = normalize_command(command)
+        decision = self.cache.get(normalized)
+        if decision is None:
+            rule = self.engine.match(normalized)
+            decision = ("low", None) if rule is None else (rule.risk, rule.rule_id)
+            self.cache.put(normalized, decision)
+        return decision
+
     def classify(self, command: str) -> str:
-        cmd_lower = command.lower()
-        if any(k in cmd_lower for k in self.HIGH_RISK_KEYWORDS):
-            return "high"
-        if any(k in cmd_lower for k in self.MEDIUM_RISK_KEYWORDS):
-            return "medium"
-        return "low"
+        return self.classify_with_rule(command)[0]
+
+    def classify_many(self, commands: Sequence[str]) -> List[Tuple[str, Optional[str]]]:
+        """Classify a batch, looking up each distinct command only once."""
+        seen: Dict[str, Tuple[str, Optional[str]]] = {}
+        for cmd in commands:
+            if cmd not in seen:
+                seen[cmd] = self.classify_with_rule(cmd)
+        return [seen[cmd] for cmd in commands]
+
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats()
 
 
 class ConsensusModule(Protocol):
     """Higher-level module that approves or rejects escalated commands."""
 
-    def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
-        ...
+    def request_approval(self, agent_id: str, command: str, risk: str) -> bool: ...
+
+
+class BatchConsensusModule(Protocol):
+    """Optional batch extension of `ConsensusModule`.
+
+    `batch` maps risk class -> commands needing approval; the response maps
+    the same risk classes to one vote per command, so a batch can be
+    partially approved. Missing votes count as denials.
+    """
+
+    def request_batch_approval(
+        self, agent_id: str, batch: Mapping[str, Sequence[str]]
+    ) -> Mapping[str, Sequence[bool]]: ...
+
+
+def _lap(timings: Dict[str, float], phase: str, since: float) -> float:
+    now = perf_counter()
+    timings[phase] = now - since
+    return now
 
 
 class GAO_Orchestrator:
@@ -59,86 +153,383 @@ class GAO_Orchestrator:
 
     Intercepts sub-agent commands and checks whether the issuing agent's
     Cognitive Light Cone score is sufficient for the risk level.
+
+    Agent profiles live in a copy-on-write `AgentRegistry`: command traffic
+    reads immutable snapshots without locking while score updates are
+    published atomically, and each decision's info records the
+    `registry_version` it was made against.
+
+    `policy` may be a `tenancy.TenantPolicyTable`, in which case thresholds
+    come from the policy of each agent's `tenant`.
+
+    Pass `metrics=GAOMetrics()` to record per-phase latency histograms and
+    decision counters (see `metrics`), and `audit_log=AuditLog(...)` to
+    append every decision to a group-committed audit log (see `audit`).
+    With `admission=AdmissionController(...)`, known agents' commands pass
+    per-agent rate limits and a global concurrency gate before consensus or
+    execution; rejected commands are blocked with reason "rate_limited" or
+    "shed".
+
+    `profile` (or the `CLCONE_PROFILE` env var) enables a profiling session
+    covering every `execute_command` and `execute_commands` call. It is
+    written at interpreter exit or on `profiler.close()`, and each
+    decision's info then carries `phase_seconds` (see
+    `clcone_lab.profiling`).
     """
 
-    def __init__(self,
-                 policy: GlobalSecurityPolicy,
-                 executor: GlobalExecutor,
-                 consensus: ConsensusModule):
+    def __init__(
+        self,
+        policy: PolicyLike,
+        executor: GlobalExecutor,
+        consensus: ConsensusModule,
+        risk_classifier: Optional[RiskClassifier] = None,
+        registry: Optional[RegistryLike] = None,
+        metrics: Optional[GAOMetrics] = None,
+        audit_log: Optional[AuditLog] = None,
+        admission: Optional[AdmissionController] = None,
+        profile: Optional[str] = None,
+    ):
         self.policy = policy
         self.executor = executor
         self.consensus = consensus
-        self.risk_classifier = RiskClassifier()
-        self._agents: Dict[str, AgentProfile] = {}
+        self.risk_classifier = (
+            risk_classifier if risk_classifier is not None else RiskClassifier()
+        )
+        self.registry: RegistryLike = (
+            registry if registry is not None else AgentRegistry()
+        )
+        self.metrics = metrics
+        self.audit_log = audit_log
+        self.admission = admission
+        self.profiler: Optional[Profiler] = None
+        if profile is not None or os.environ.get(_PROFILE_ENV):
+            from clcone_lab.profiling import session_from_env
+
+            self.profiler = session_from_env("gao", profile)
+        # Consensus wrappers that cache decisions (see consensus_cache) must
+        # forget them when an agent's score changes.
+        invalidate = getattr(consensus, "invalidate_agents", None)
+        if invalidate is not None:
+            self.registry.add_listener(invalidate)
 
     def register_agent(self, profile: AgentProfile) -> None:
-        self._agents[profile.agent_id] = profile
+        self.registry.register(profile)
 
     def update_agent_score(self, agent_id: str, C_Lcone_score: float) -> None:
-        if agent_id in self._agents:
-            self._agents[agent_id].C_Lcone_score = C_Lcone_score
+        self.registry.update_scores({agent_id: C_Lcone_score})
 
-    def _required_score(self, risk: str) -> float:
-        if risk == "high":
-            return self.policy.min_score_high_risk
-        if risk == "medium":
-            return self.policy.min_score_medium_risk
-        return self.policy.min_score_low_risk
+    def update_agent_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int:
+        """Apply many score updates as one atomic registry write.
+
+        With `expected_version`, the write is a compare-and-set (see
+        `registry.VersionConflict`).
+        """
+        return self.registry.update_scores(scores, expected_version)
+
+    def _required_score(self, risk: str, tenant: Optional[str] = None) -> float:
+        return self.policy.required_score(risk, tenant)
 
-    def execute_command(self, agent_id: str, command: str) -> Tuple[str, Dict[str, Any]]:
+    def execute_command(
+        self, agent_id: str, command: str
+    ) -> Tuple[str, Dict[str, Any]]:
         """Attempt to execute a command from `agent_id`.
 
         Returns:
             status: one of "executed", "blocked", "escalated"
             info:   structured details for logging / telemetry
         """
-        risk = self.risk_classifier.classify(command)
-        required = self._required_score(risk)
-
-        profile = self._agents.get(agent_id)
+        metrics, profiler = self.metrics, self.profiler
+        if metrics is None and profiler is None:
+            status, info = self._execute_command(agent_id, command, None)
+        else:
+            timings: Dict[str, float] = {}
+            start = perf_counter()
+            if profiler is None:
+                status, info = self._execute_command(agent_id, command, timings)
+            else:
+                with profiler:
+                    status, info = self._execute_command(agent_id, command, timings)
+                info["phase_seconds"] = timings
+            timings["total"] = perf_counter() - start
+            if metrics is not None:
+                metrics.record(info["risk"], status, timings)
+
+        if self.audit_log is not None:
+            self.audit_log.append_decision(status, info)
+        return status, info
+
+    def _execute_command(
+        self, agent_id: str, command: str, timings: Optional[Dict[str, float]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        # `timings` is None unless metrics are enabled; every timer below is
+        # guarded so the uninstrumented path only pays for the `is None` checks.
+        t = perf_counter() if timings is not None else 0.0
+        risk, rule_id = self.risk_classifier.classify_with_rule(command)
+        if timings is not None:
+            t = _lap(timings, "classify", t)
+
+        snapshot = self.registry.snapshot()
+        profile = snapshot.agents.get(agent_id)
+        if timings is not None:
+            t = _lap(timings, "lookup", t)
         if profile is None:
             return "blocked", {
                 "reason": "unknown_agent",
                 "agent_id": agent_id,
                 "command": command,
                 "risk": risk,
+                "rule_id": rule_id,
+                "registry_version": snapshot.version,
             }
 
-        if profile.C_Lcone_score >= required:
-            result = self.executor.execute(command)
-            return "executed", {
-                "agent_id": agent_id,
-                "command": command,
-                "risk": risk,
-                "C_Lcone_score": profile.C_Lcone_score,
-                "result": result,
-            }
-
-        approved = self.consensus.request_approval(agent_id, command, risk)
-        if not approved:
-            return "blocked", {
-                "agent_id": agent_id,
-                "command": command,
-                "risk": risk,
-                "C_Lcone_score": profile.C_Lcone_score,
-                "reason": "consensus_denied",
-            }
-
-        result = self.executor.execute(command)
-        return "escalated", {
+        required = self._required_score(risk, profile.tenant)
+        info: Dict[str, Any] = {
             "agent_id": agent_id,
+            "tenant": profile.tenant,
             "command": command,
             "risk": risk,
+            "rule_id": rule_id,
             "C_Lcone_score": profile.C_Lcone_score,
-            "result": result,
+            "registry_version": snapshot.version,
         }
 
+        admission = self.admission
+        if admission is None:
+            return self._authorize_and_run(info, required, timings, t)
+
+        rejected = admission.acquire(agent_id, risk, profile.C_Lcone_score)
+        if timings is not None:
+            t = _lap(timings, "admission", t)
+        if rejected is not None:
+            info["reason"] = rejected
+            return "blocked", info
+        try:
+            return self._authorize_and_run(info, required, timings, t)
+        finally:
+            admission.release()
+
+    def _authorize_and_run(
+        self,
+        info: Dict[str, Any],
+        required: float,
+        timings: Optional[Dict[str, float]],
+        t: float,
+    ) -> Tuple[str, Dict[str, Any]]:
+        agent_id, command = info["agent_id"], info["command"]
+        if info["C_Lcone_score"] >= required:
+            info["result"] = self.executor.execute(command)
+            if timings is not None:
+                _lap(timings, "execute", t)
+            return "executed", info
+
+        approved = self.consensus.request_approval(agent_id, command, info["risk"])
+        if timings is not None:
+            t = _lap(timings, "consensus", t)
+        if not approved:
+            info["reason"] = "consensus_denied"
+            return "blocked", info
+
+        info["result"] = self.executor.execute(command)
+        if timings is not None:
+            _lap(timings, "execute", t)
+        return "escalated", info
+
+    def _request_batch_approval(
+        self, agent_id: str, batch: Mapping[str, Sequence[str]]
+    ) -> Mapping[str, Sequence[bool]]:
+        batch_fn = getattr(self.consensus, "request_batch_approval", None)
+        if batch_fn is not None:
+            return batch_fn(agent_id, batch)
+        # Plain ConsensusModule: fall back to one round trip per command.
+        return {
+            risk: [self.consensus.request_approval(agent_id, cmd, risk) for cmd in cmds]
+            for risk, cmds in batch.items()
+        }
+
+    def _execute_many(self, commands: Sequence[str]) -> List[Dict[str, Any]]:
+        execute_many = getattr(self.executor, "execute_many", None)
+        if execute_many is not None:
+            return list(execute_many(commands))
+        return [self.executor.execute(cmd) for cmd in commands]
+
+    def execute_commands(
+        self, agent_id: str, commands: Sequence[str]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Batch form of `execute_command` for one agent.
+
+        The batch is classified once and the profile looked up once. Commands
+        below the agent's score threshold are grouped by risk class into a
+        single consensus request (see `BatchConsensusModule`), and everything
+        allowed to run is dispatched together in the original order.
+
+        With admission control, every command is charged against the agent's
+        token bucket and the batch takes one concurrency slot (see
+        `AdmissionController.acquire_many`); rejected commands are blocked
+        with reason "rate_limited" or "shed".
+
+        Returns one `(status, info)` pair per input command, in input order.
+        With metrics or profiling enabled, batch phase timings are recorded
+        once per batch (see `GAOMetrics.record_batch`) and every info
+        carries the batch's `phase_seconds`.
+        """
+        metrics, profiler = self.metrics, self.profiler
+        if metrics is None and profiler is None:
+            return self._audit_batch(self._execute_commands(agent_id, commands, None))
+
+        timings: Dict[str, float] = {}
+        start = perf_counter()
+        if profiler is None:
+            out = self._execute_commands(agent_id, commands, timings)
+        else:
+            with profiler:
+                out = self._execute_commands(agent_id, commands, timings)
+            for _, info in out:
+                info["phase_seconds"] = timings
+        timings["total"] = perf_counter() - start
+        if metrics is not None:
+            metrics.record_batch(
+                [(info["risk"], status) for status, info in out], timings
+            )
+        return self._audit_batch(out)
+
+    def _execute_commands(
+        self,
+        agent_id: str,
+        commands: Sequence[str],
+        timings: Optional[Dict[str, float]],
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        t = perf_counter() if timings is not None else 0.0
+        decisions = self.risk_classifier.classify_many(commands)
+        if timings is not None:
+            t = _lap(timings, "classify", t)
+
+        snapshot = self.registry.snapshot()
+        profile = snapshot.agents.get(agent_id)
+        if timings is not None:
+            t = _lap(timings, "lookup", t)
+        if profile is None:
+            return [
+                (
+                    "blocked",
+                    {
+                        "reason": "unknown_agent",
+                        "agent_id": agent_id,
+                        "command": cmd,
+                        "risk": risk,
+                        "rule_id": rule_id,
+                        "registry_version": snapshot.version,
+                    },
+                )
+                for cmd, (risk, rule_id) in zip(commands, decisions)
+            ]
+
+        score = profile.C_Lcone_score
+        statuses: List[str] = ["blocked"] * len(commands)
+        reasons: List[Optional[str]] = [None] * len(commands)
+        admission = self.admission
+        if admission is not None:
+            reasons = admission.acquire_many(
+                agent_id, [risk for risk, _ in decisions], score
+            )
+            if timings is not None:
+                t = _lap(timings, "admission", t)
+        admitted = any(reason is None for reason in reasons)
+        results: Dict[int, Dict[str, Any]] = {}
+        try:
+            if admitted:
+                results = self._authorize_and_run_batch(
+                    agent_id, commands, decisions, profile, statuses, reasons
+                )
+                if timings is not None:
+                    _lap(timings, "execute", t)  # consensus and dispatch together
+        finally:
+            if admission is not None and admitted:
+                admission.release()
+
+        out: List[Tuple[str, Dict[str, Any]]] = []
+        for i, (cmd, (risk, rule_id)) in enumerate(zip(commands, decisions)):
+            info: Dict[str, Any] = {
+                "agent_id": agent_id,
+                "tenant": profile.tenant,
+                "command": cmd,
+                "risk": risk,
+                "rule_id": rule_id,
+                "C_Lcone_score": score,
+                "registry_version": snapshot.version,
+            }
+            if i in results:
+                info["result"] = results[i]
+            else:
+                info["reason"] = reasons[i]
+            out.append((statuses[i], info))
+        return out
+
+    def _authorize_and_run_batch(
+        self,
+        agent_id: str,
+        commands: Sequence[str],
+        decisions: Sequence[Tuple[str, Optional[str]]],
+        profile: AgentProfile,
+        statuses: List[str],
+        reasons: List[Optional[str]],
+    ) -> Dict[int, Dict[str, Any]]:
+        """Consensus and execution for the admitted commands (`reasons[i] is None`).
+
+        Fills in `statuses` and consensus denials in `reasons`; returns the
+        execution result per command index.
+        """
+        pending: Dict[str, List[int]] = {}
+        for i, (risk, _) in enumerate(decisions):
+            if reasons[i] is not None:
+                continue
+            if profile.C_Lcone_score >= self._required_score(risk, profile.tenant):
+                statuses[i] = "executed"
+            else:
+                pending.setdefault(risk, []).append(i)
+
+        if pending:
+            votes = self._request_batch_approval(
+                agent_id,
+                {risk: [commands[i] for i in idxs] for risk, idxs in pending.items()},
+            )
+            for risk, idxs in pending.items():
+                risk_votes = list(votes.get(risk, ()))
+                for pos, i in enumerate(idxs):
+                    if pos < len(risk_votes) and risk_votes[pos]:
+                        statuses[i] = "escalated"
+                    else:
+                        reasons[i] = "consensus_denied"
+
+        runnable = [i for i, status in enumerate(statuses) if status != "blocked"]
+        return dict(zip(runnable, self._execute_many([commands[i] for i in runnable])))
+
+    def _audit_batch(
+        self, decisions: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        if self.audit_log is not None:
+            for status, info in decisions:
+                self.audit_log.append_decision(status, info)
+        return decisions
+
 
 class LoggingGlobalExecutor:
-    """A global executor that simply logs commands."""
+    """A global executor that simply logs commands.
+
+    With a `sink`, log lines are handed to it (typically a batching
+    `BufferedLogSink`) instead of being printed one by one.
+    """
+
+    def __init__(self, sink: Optional[LogSink] = None):
+        self.sink = sink
 
     def execute(self, command: str) -> Dict[str, Any]:
-        print(f"[GAO] Executing: {command}")
+        line = f"[GAO] Executing: {command}"
+        if self.sink is None:
+            print(line)
+        else:
+            self.sink.write(line)
         return {"status": "ok"}
 
 
@@ -149,6 +540,13 @@ class AlwaysApproveConsensus:
         print(f"[Consensus] Approving {risk} command from {agent_id}: {command}")
         return True
 
+    def request_batch_approval(
+        self, agent_id: str, batch: Mapping[str, Sequence[str]]
+    ) -> Dict[str, List[bool]]:
+        total = sum(len(cmds) for cmds in batch.values())
+        print(f"[Consensus] Approving batch of {total} commands from {agent_id}")
+        return {risk: [True] * len(cmds) for risk, cmds in batch.items()}
+
 
 if __name__ == "__main__":
     policy = GlobalSecurityPolicy()
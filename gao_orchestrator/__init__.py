@@ -1 +1,62 @@
 """Goal-Aware Orchestrator (GAO) runtime control plane for security agents."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> defining submodule, imported on first attribute access so
+# that importing the package stays cheap for short-lived workers. The
+# orchestrator class itself shares its name with its module, so import it
+# as `from gao_orchestrator.GAO_Orchestrator import GAO_Orchestrator`.
+_LAZY: Dict[str, str] = {
+    "AgentProfile": ".GAO_Orchestrator",
+    "GlobalSecurityPolicy": ".GAO_Orchestrator",
+    "RiskClassifier": ".GAO_Orchestrator",
+    "AdmissionController": ".admission",
+    "AsyncGAO_Orchestrator": ".async_gao",
+    "AuditLog": ".audit",
+    "CoalescingConsensus": ".consensus_cache",
+    "GAOMetrics": ".metrics",
+    "AgentRegistry": ".registry",
+    "VersionConflict": ".registry",
+    "RuleEngine": ".rules",
+    "RiskRule": ".rules",
+    "load_rules": ".rules",
+    "CompactAgentRegistry": ".tenancy",
+    "TenantPolicyTable": ".tenancy",
+    "evaluate_thresholds": ".tuning",
+}
+
+# Keep in sync with _LAZY (checked by tests/test_import_time.py).
+__all__ = [
+    "AdmissionController",
+    "AgentProfile",
+    "AgentRegistry",
+    "AsyncGAO_Orchestrator",
+    "AuditLog",
+    "CoalescingConsensus",
+    "CompactAgentRegistry",
+    "GAOMetrics",
+    "GlobalSecurityPolicy",
+    "RiskClassifier",
+    "RiskRule",
+    "RuleEngine",
+    "TenantPolicyTable",
+    "VersionConflict",
+    "evaluate_thresholds",
+    "load_rules",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,225 @@
+"""Per-agent, risk-weighted admission control and load shedding for the GAO.
+
+A runaway agent (e.g. `MalignantAgent` in a tight loop) must not be able to
+starve well-behaved agents. `AdmissionController` applies two gates before
+a command reaches consensus or the executor:
+
+1. A token bucket per agent. Each command costs tokens by risk class, so a
+   burst of high-risk commands is throttled long before a burst of `echo`s.
+2. A global concurrency limit. When it is reached, requests wait in a
+   bounded priority queue ordered by C-Lcone score. When the queue is full,
+   the lowest-scoring request (waiting or arriving) is shed, so agents with
+   the smallest light cone are dropped first under overload.
+
+Rejected requests come back from `acquire` as a reason string
+("rate_limited" or "shed"), which the orchestrator reports as a blocked
+decision.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+DEFAULT_RISK_COSTS: Mapping[str, float] = {"low": 1.0, "medium": 5.0, "high": 20.0}
+ADMISSION_REJECTIONS = frozenset(
+    {"rate_limited", "shed"}
+)  # reasons `acquire` can return
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def try_take(self, cost: float, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def refund(self, cost: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    rate_limited: int = 0
+    shed: int = 0
+    queued: int = 0
+    in_flight: int = 0
+    queue_depth: int = 0
+    peak_in_flight: int = 0
+
+
+class _Waiter:
+    __slots__ = ("score", "state")
+
+    def __init__(self, score: float):
+        self.score = score
+        self.state = "waiting"  # -> "granted" | "shed"
+
+
+class AdmissionController:
+    """Token buckets per agent plus a priority-aware global concurrency gate.
+
+    Parameters
+    ----------
+    rate / burst:
+        Token refill rate (tokens per second) and bucket capacity per agent.
+    risk_costs:
+        Tokens charged per command by risk class; unknown classes cost the
+        "low" price.
+    max_concurrency:
+        Commands allowed inside consensus + execution at once.
+    max_queue:
+        Waiters allowed beyond `max_concurrency` before shedding starts.
+    queue_timeout:
+        Seconds a queued request waits for a slot before being shed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 50.0,
+        burst: float = 100.0,
+        risk_costs: Optional[Mapping[str, float]] = None,
+        max_concurrency: int = 64,
+        max_queue: int = 256,
+        queue_timeout: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.risk_costs = dict(risk_costs or DEFAULT_RISK_COSTS)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []  # (-score, seq, waiter)
+        self._seq = itertools.count()
+        self._stats = AdmissionStats()
+
+    def _cost(self, risk: str) -> float:
+        return self.risk_costs.get(risk, self.risk_costs.get("low", 1.0))
+
+    def _take_tokens(self, agent_id: str, cost: float) -> bool:
+        now = self._clock()
+        bucket = self._buckets.get(agent_id)
+        if bucket is None:
+            bucket = self._buckets[agent_id] = TokenBucket(self.rate, self.burst, now)
+        return bucket.try_take(cost, now)
+
+    def _grant_locked(self) -> None:
+        self._stats.in_flight += 1
+        self._stats.admitted += 1
+        self._stats.peak_in_flight = max(
+            self._stats.peak_in_flight, self._stats.in_flight
+        )
+
+    def _evict_lowest_locked(self, score: float) -> bool:
+        """Shed the lowest-score waiter if it scores below `score`."""
+        live = [entry for entry in self._heap if entry[2].state == "waiting"]
+        if not live:
+            return False
+        lowest = max(live, key=lambda e: (e[0], e[1]))  # highest -score, newest first
+        if -lowest[0] >= score:
+            return False
+        lowest[2].state = "shed"
+        self._heap.remove(lowest)
+        heapq.heapify(self._heap)
+        self._cond.notify_all()
+        return True
+
+    def acquire(self, agent_id: str, risk: str, score: float) -> Optional[str]:
+        """Admit a command or return the rejection reason.
+
+        Every successful `acquire` must be paired with `release`.
+        """
+        return self.acquire_many(agent_id, [risk], score)[0]
+
+    def acquire_many(
+        self, agent_id: str, risks: Sequence[str], score: float
+    ) -> List[Optional[str]]:
+        """Admit a batch of commands from one agent; one reason (or None) per command.
+
+        Each command is charged its own tokens, and those that do not fit are
+        "rate_limited". The admitted rest are dispatched together, so they
+        share one concurrency slot; if that slot is shed, they are all
+        "shed". Call `release` once if any command was admitted.
+        """
+        costs = [self._cost(risk) for risk in risks]
+        with self._cond:
+            reasons: List[Optional[str]] = []
+            charged = 0.0
+            for cost in costs:
+                if self._take_tokens(agent_id, cost):
+                    reasons.append(None)
+                    charged += cost
+                else:
+                    self._stats.rate_limited += 1
+                    reasons.append("rate_limited")
+            admitted = reasons.count(None)
+            if not admitted:
+                return reasons
+            if self._wait_for_slot_locked(score):
+                self._stats.admitted += admitted - 1  # _grant_locked counted one
+                return reasons
+            self._stats.shed += admitted
+            self._buckets[agent_id].refund(charged)
+            return ["shed" if reason is None else reason for reason in reasons]
+
+    def _wait_for_slot_locked(self, score: float) -> bool:
+        """Take a concurrency slot, queueing by score; False if shed."""
+        if self._stats.in_flight < self.max_concurrency and not self._heap:
+            self._grant_locked()
+            return True
+
+        if len(self._heap) >= self.max_queue and not self._evict_lowest_locked(score):
+            return False
+
+        waiter = _Waiter(score)
+        heapq.heappush(self._heap, (-score, next(self._seq), waiter))
+        self._stats.queued += 1
+        deadline = self._clock() + self.queue_timeout
+        while waiter.state == "waiting":
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+        if waiter.state == "granted":
+            return True
+        if waiter.state == "waiting":  # timed out in the queue
+            self._heap = [e for e in self._heap if e[2] is not waiter]
+            heapq.heapify(self._heap)
+        return False
+
+    def release(self) -> None:
+        with self._cond:
+            self._stats.in_flight -= 1
+            while self._heap and self._stats.in_flight < self.max_concurrency:
+                _, _, waiter = heapq.heappop(self._heap)
+                if waiter.state != "waiting":
+                    continue
+                waiter.state = "granted"
+                self._grant_locked()
+            self._cond.notify_all()
+
+    def stats(self) -> AdmissionStats:
+        with self._cond:
+            stats = AdmissionStats(**vars(self._stats))
+            stats.queue_depth = sum(1 for e in self._heap if e[2].state == "waiting")
+            return stats
@@ -0,0 +1,289 @@
+"""Asyncio-native Goal-Aware Orchestrator.
+
+`GAO_Orchestrator.execute_command` waits on `consensus.request_approval`
+synchronously, so one slow approver stalls every other agent. This variant
+takes async executor and consensus protocols, runs many `execute_command`
+calls concurrently on one event loop, and bounds every approval with a
+per-risk timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Tuple, Union
+
+from .GAO_Orchestrator import (
+    AgentProfile,
+    GlobalSecurityPolicy,
+    PolicyLike,
+    RiskClassifier,
+)
+from .registry import AgentRegistry, RegistryLike
+
+TIMEOUT_ACTIONS = ("deny", "escalate")
+
+
+class AsyncGlobalExecutor(Protocol):
+    """Async execution surface, e.g. `executors.BatchingAsyncExecutor`."""
+
+    async def execute(self, command: str) -> Dict[str, Any]: ...
+
+
+class AsyncConsensusModule(Protocol):
+    """Async counterpart of `ConsensusModule`."""
+
+    async def request_approval(
+        self, agent_id: str, command: str, risk: str
+    ) -> bool: ...
+
+
+class AsyncGAO_Orchestrator:
+    """Goal-Aware Orchestrator for asyncio control planes.
+
+    Parameters
+    ----------
+    approval_timeouts:
+        Seconds to wait for consensus per risk class; classes not listed use
+        `default_timeout`.
+    on_timeout:
+        "deny" blocks the command when consensus times out. "escalate" hands
+        it to `fallback_consensus` (e.g. an on-call human) with no timeout.
+        If the fallback approves, the command runs as "escalated" with
+        `info["approval"] == "fallback"`. Without a fallback it is returned
+        unexecuted as "pending" with `reason == "consensus_timeout"`. A
+        timeout never runs a command on its own.
+    fallback_consensus:
+        Approver consulted when `on_timeout="escalate"`.
+    max_concurrency:
+        Optional cap on requests in flight inside `run_many`.
+    """
+
+    def __init__(
+        self,
+        policy: PolicyLike,
+        executor: AsyncGlobalExecutor,
+        consensus: AsyncConsensusModule,
+        risk_classifier: Optional[RiskClassifier] = None,
+        approval_timeouts: Optional[Mapping[str, float]] = None,
+        default_timeout: float = 5.0,
+        on_timeout: str = "deny",
+        max_concurrency: Optional[int] = None,
+        registry: Optional[RegistryLike] = None,
+        fallback_consensus: Optional[AsyncConsensusModule] = None,
+    ):
+        if on_timeout not in TIMEOUT_ACTIONS:
+            raise ValueError(f"on_timeout must be one of {TIMEOUT_ACTIONS}")
+        self.policy = policy
+        self.executor = executor
+        self.consensus = consensus
+        self.risk_classifier = (
+            risk_classifier if risk_classifier is not None else RiskClassifier()
+        )
+        self.approval_timeouts = dict(approval_timeouts or {})
+        self.default_timeout = default_timeout
+        self.on_timeout = on_timeout
+        self.fallback_consensus = fallback_consensus
+        self.max_concurrency = max_concurrency
+        self.registry: RegistryLike = (
+            registry if registry is not None else AgentRegistry()
+        )
+        # Consensus wrappers that cache decisions (see consensus_cache) must
+        # forget them when an agent's score changes.
+        invalidate = getattr(consensus, "invalidate_agents", None)
+        if invalidate is not None:
+            self.registry.add_listener(invalidate)
+        self.consensus_timeouts = 0
+
+    def register_agent(self, profile: AgentProfile) -> None:
+        self.registry.register(profile)
+
+    def update_agent_score(self, agent_id: str, C_Lcone_score: float) -> None:
+        self.registry.update_scores({agent_id: C_Lcone_score})
+
+    def update_agent_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int:
+        return self.registry.update_scores(scores, expected_version)
+
+    def _timeout_for(self, risk: str) -> float:
+        return self.approval_timeouts.get(risk, self.default_timeout)
+
+    async def _approve(self, agent_id: str, command: str, risk: str) -> Optional[bool]:
+        """Return the consensus vote, or None if it timed out.
+
+        `asyncio.wait_for` cancels the pending consensus call on timeout, and a
+        cancellation of the caller propagates into it as well.
+        """
+        try:
+            return bool(
+                await asyncio.wait_for(
+                    self.consensus.request_approval(agent_id, command, risk),
+                    timeout=self._timeout_for(risk),
+                )
+            )
+        except asyncio.TimeoutError:
+            self.consensus_timeouts += 1
+            return None
+
+    async def execute_command(
+        self, agent_id: str, command: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Async form of `GAO_Orchestrator.execute_command`.
+
+        Same statuses and info keys, plus "pending".
+        """
+        risk, rule_id = self.risk_classifier.classify_with_rule(command)
+
+        snapshot = self.registry.snapshot()
+        profile = snapshot.agents.get(agent_id)
+        if profile is None:
+            return "blocked", {
+                "reason": "unknown_agent",
+                "agent_id": agent_id,
+                "command": command,
+                "risk": risk,
+                "rule_id": rule_id,
+                "registry_version": snapshot.version,
+            }
+
+        info: Dict[str, Any] = {
+            "agent_id": agent_id,
+            "tenant": profile.tenant,
+            "command": command,
+            "risk": risk,
+            "rule_id": rule_id,
+            "C_Lcone_score": profile.C_Lcone_score,
+            "registry_version": snapshot.version,
+        }
+
+        if profile.C_Lcone_score >= self.policy.required_score(risk, profile.tenant):
+            info["result"] = await self.executor.execute(command)
+            return "executed", info
+
+        approved = await self._approve(agent_id, command, risk)
+        if approved is None:
+            if self.on_timeout == "deny":
+                info["reason"] = "consensus_timeout"
+                return "blocked", info
+            if self.fallback_consensus is None:
+                info["reason"] = "consensus_timeout"
+                return "pending", info
+            approved = bool(
+                await self.fallback_consensus.request_approval(agent_id, command, risk)
+            )
+            info["approval"] = "fallback"
+        if not approved:
+            info["reason"] = "consensus_denied"
+            return "blocked", info
+
+        info["result"] = await self.executor.execute(command)
+        return "escalated", info
+
+    async def run_many(
+        self, requests: Iterable[Tuple[str, str]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Run `(agent_id, command)` requests concurrently, results in input order.
+
+        If the caller is cancelled, all outstanding requests (and their
+        consensus calls) are cancelled with it.
+        """
+        sem = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+
+        async def one(agent_id: str, command: str) -> Tuple[str, Dict[str, Any]]:
+            if sem is None:
+                return await self.execute_command(agent_id, command)
+            async with sem:
+                return await self.execute_command(agent_id, command)
+
+        return list(await asyncio.gather(*(one(a, c) for a, c in requests)))
+
+
+class LatencyConsensus:
+    """Consensus stand-in that approves after an injected delay (benchmarks only).
+
+    `latency` is seconds per call, either a single value or a per-risk map;
+    `jitter` adds a uniform random fraction of that latency. `in_flight` and
+    `peak_in_flight` count concurrent calls, so tests can check concurrency
+    without timing it.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Mapping[str, float]] = 0.05,
+        jitter: float = 0.0,
+        approve: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.approve = approve
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _delay(self, risk: str) -> float:
+        base = (
+            self.latency.get(risk, 0.0)
+            if isinstance(self.latency, Mapping)
+            else self.latency
+        )
+        return base * (1.0 + self.jitter * self._rng.random())
+
+    async def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay(risk))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        return self.approve
+
+
+class AsyncLoggingExecutor:
+    """Async executor that records commands instead of printing them."""
+
+    def __init__(self) -> None:
+        self.commands: List[str] = []
+
+    async def execute(self, command: str) -> Dict[str, Any]:
+        self.commands.append(command)
+        return {"status": "ok"}
+
+
+if __name__ == "__main__":
+    import time
+
+    async def _demo() -> None:
+        gao = AsyncGAO_Orchestrator(
+            GlobalSecurityPolicy(),
+            executor=AsyncLoggingExecutor(),
+            consensus=LatencyConsensus(latency={"high": 0.5, "medium": 0.05}),
+            approval_timeouts={"high": 0.2},
+        )
+        for i in range(1000):
+            gao.register_agent(AgentProfile(agent_id=f"agent-{i}", C_Lcone_score=0.2))
+
+        requests = [
+            (f"agent-{i}", "systemctl stop svc" if i % 10 == 0 else "iptables -L")
+            for i in range(1000)
+        ]
+        start = time.perf_counter()
+        results = await gao.run_many(requests)
+        elapsed = time.perf_counter() - start
+
+        counts: Dict[str, int] = {}
+        for status, _ in results:
+            counts[status] = counts.get(status, 0) + 1
+        print(
+            f"{len(results)} requests in {elapsed:.2f}s: {counts}, "
+            f"timeouts={gao.consensus_timeouts}"
+        )
+
+    asyncio.run(_demo())
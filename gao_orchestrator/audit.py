@@ -0,0 +1,388 @@
+"""Append-only, group-committed audit log of GAO decisions.
+
+Every decision (status, agent, tenant, command, risk, score, ...) is
+appended as a length-prefixed record to the active segment file:
+
+    <u32 payload length> <u32 crc32(payload)> <payload: compact UTF-8 JSON>
+
+Appends only go to an in-memory batch. The batch is written and fsynced in
+one group commit once `commit_every` records are pending or
+`commit_interval` seconds have passed, whichever comes first. The write
+and fsync happen outside the append lock, so other appenders keep going
+while a commit is on disk, and compliance gets a durable record of every
+decision without a synchronous flush per decision. Segments rotate at
+`segment_bytes`.
+
+Segments are read back through `mmap`. A torn record at the tail of a
+segment (crash mid-write) ends that segment cleanly instead of raising.
+
+`replay` re-runs logged commands through a candidate policy / classifier
+and diffs the decisions. Decisions the admission controller rejected
+(`rate_limited` / `shed`) say nothing about the policy, so they are counted
+separately instead of being re-decided:
+
+    python -m gao_orchestrator.audit replay /var/log/gao --min-high 0.8
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .admission import ADMISSION_REJECTIONS
+from .GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+    PolicyLike,
+    RiskClassifier,
+)
+from .tenancy import CompactAgentRegistry
+
+_HEADER = struct.Struct("<II")
+_SEGMENT_GLOB = "segment-*.log"
+
+
+def _segment_name(index: int) -> str:
+    return f"segment-{index:08d}.log"
+
+
+def decision_record(status: str, info: Mapping[str, Any]) -> Dict[str, Any]:
+    """The subset of a decision that goes into the audit log."""
+    return {
+        "ts": time.time(),
+        "status": status,
+        "agent_id": info.get("agent_id"),
+        "tenant": info.get("tenant"),
+        "command": info.get("command"),
+        "risk": info.get("risk"),
+        "rule_id": info.get("rule_id"),
+        "score": info.get("C_Lcone_score"),
+        "registry_version": info.get("registry_version"),
+        "reason": info.get("reason"),
+    }
+
+
+def encode_record(record: Mapping[str, Any]) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class AuditLog:
+    """Segmented append-only decision log with group commit.
+
+    Parameters
+    ----------
+    directory:
+        Where segments live. A new segment is started on every open, after
+        the highest existing index.
+    segment_bytes:
+        Rotate to a new segment once the active one would exceed this size.
+    commit_every / commit_interval:
+        Group-commit triggers. A background thread enforces the interval even
+        when no new records arrive; `commit_interval <= 0` commits by count
+        only.
+    fsync:
+        Disable only for benchmarks or tmpfs.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        commit_every: int = 512,
+        commit_interval: float = 0.05,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+
+        existing = sorted(self.directory.glob(_SEGMENT_GLOB))
+        self._index = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+        # `_lock` guards the in-memory batch and is held only for list
+        # operations. `_commit_lock` serializes writing and fsyncing a batch,
+        # so appenders never wait on the disk unless they trigger a commit.
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._file = self._open_segment()
+        self._size = 0
+        self._batch: List[bytes] = []
+        self._last_commit = time.monotonic()
+        self.records_written = 0
+        self.commits = 0
+        self._closed = False
+
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if commit_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.commit_interval):
+            with self._lock:
+                due = (
+                    bool(self._batch)
+                    and time.monotonic() - self._last_commit >= self.commit_interval
+                )
+            if due:
+                self._commit()
+
+    def _open_segment(self) -> BinaryIO:
+        # Long-lived handle: closed by `_rotate` or `close`.
+        return (self.directory / _segment_name(self._index)).open("ab")
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._file.close()
+        self._index += 1
+        self._file = self._open_segment()
+        self._size = 0
+
+    def _commit(self) -> None:
+        """Write and fsync everything batched so far (one group commit)."""
+        with self._commit_lock:
+            with self._lock:
+                batch, self._batch = self._batch, []
+                self._last_commit = time.monotonic()
+            if not batch:
+                return
+            for data in batch:
+                if self._size and self._size + len(data) > self.segment_bytes:
+                    self._rotate()
+                self._file.write(data)
+                self._size += len(data)
+            self._sync()
+            self.commits += 1
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        data = encode_record(record)
+        with self._lock:
+            if self._closed:
+                raise ValueError("append to closed AuditLog")
+            self._batch.append(data)
+            self.records_written += 1
+            due = len(self._batch) >= self.commit_every or (
+                self.commit_interval > 0
+                and time.monotonic() - self._last_commit >= self.commit_interval
+            )
+        if due:
+            self._commit()
+
+    def append_decision(self, status: str, info: Mapping[str, Any]) -> None:
+        self.append(decision_record(status, info))
+
+    def flush(self) -> None:
+        """Force a group commit of everything appended so far."""
+        self._commit()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._commit()
+        with self._commit_lock:
+            self._file.close()
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield records from one segment via `mmap`, stopping at a torn tail."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset, end = 0, len(mm)
+            while offset + _HEADER.size <= end:
+                length, crc = _HEADER.unpack_from(mm, offset)
+                start = offset + _HEADER.size
+                if start + length > end:
+                    return
+                payload = mm[start : start + length]
+                if zlib.crc32(payload) != crc:
+                    return
+                yield json.loads(payload)
+                offset = start + length
+
+
+def read_audit_log(directory: str) -> Iterator[Dict[str, Any]]:
+    """Yield all records in `directory`, oldest segment first."""
+    for path in sorted(Path(directory).glob(_SEGMENT_GLOB)):
+        yield from iter_segment(str(path))
+
+
+@dataclass
+class DecisionDiff:
+    total: int = 0
+    changed: int = 0
+    admission_rejected: int = 0  # logged rate_limited / shed decisions, not replayed
+    transitions: Counter = field(default_factory=Counter)
+    examples: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class RecordedConsensus:
+    """Replays the consensus outcome implied by a logged decision.
+
+    A logged "escalated" decision means consensus approved; a logged
+    `consensus_denied` block means it refused. Commands that never reached
+    consensus in the log get `default`.
+    """
+
+    def __init__(self, default: bool = False):
+        self.default = default
+        self._votes: Dict[Tuple[str, str], bool] = {}
+
+    def remember(self, record: Mapping[str, Any]) -> None:
+        key = (record["agent_id"], record["command"])
+        if record["status"] == "escalated":
+            self._votes[key] = True
+        elif record.get("reason") == "consensus_denied":
+            self._votes[key] = False
+
+    def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        return self._votes.get((agent_id, command), self.default)
+
+
+class DryRunExecutor:
+    """Executor that never runs anything; used for replays."""
+
+    def execute(self, command: str) -> Dict[str, Any]:
+        return {"status": "dry_run"}
+
+
+def replay(
+    records: Iterator[Mapping[str, Any]],
+    policy: PolicyLike,
+    risk_classifier: Optional[RiskClassifier] = None,
+    max_examples: int = 20,
+) -> DecisionDiff:
+    """Re-decide logged commands under `policy` and diff against the log.
+
+    Each record is replayed with the agent's logged score and tenant, so
+    that only the policy / classifier change shows up in the diff, including
+    per-tenant thresholds of a `TenantPolicyTable`. Unknown-agent records are
+    replayed as unknown agents. Admission rejections are counted in
+    `admission_rejected` and skipped, since the replay runs without an
+    admission controller.
+
+    Profiles live in a `CompactAgentRegistry`, whose writes update columns in
+    place, and `known` mirrors the logged (score, tenant) per agent so that
+    records repeating the previous values never touch the registry.
+    """
+    consensus = RecordedConsensus()
+    gao = GAO_Orchestrator(
+        policy,
+        executor=DryRunExecutor(),
+        consensus=consensus,
+        risk_classifier=risk_classifier,
+        registry=CompactAgentRegistry(),
+    )
+    known: Dict[str, Tuple[float, Optional[str]]] = {}
+    diff = DecisionDiff()
+    for record in records:
+        if record.get("reason") in ADMISSION_REJECTIONS:
+            diff.admission_rejected += 1
+            continue
+        agent_id, score, tenant = (
+            record["agent_id"],
+            record.get("score"),
+            record.get("tenant"),
+        )
+        if score is not None:
+            current = known.get(agent_id)
+            if current is None or current[1] != tenant:
+                gao.register_agent(
+                    AgentProfile(agent_id=agent_id, C_Lcone_score=score, tenant=tenant)
+                )
+            elif current[0] != score:
+                gao.update_agent_score(agent_id, score)
+            known[agent_id] = (score, tenant)
+        consensus.remember(record)
+
+        status, info = gao.execute_command(agent_id, record["command"])
+        diff.total += 1
+        if status != record["status"]:
+            diff.changed += 1
+            diff.transitions[(record["status"], status)] += 1
+            if len(diff.examples) < max_examples:
+                diff.examples.append(
+                    {
+                        "agent_id": agent_id,
+                        "command": record["command"],
+                        "old": record["status"],
+                        "new": status,
+                        "old_risk": record.get("risk"),
+                        "new_risk": info["risk"],
+                    }
+                )
+    return diff
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .rules import load_rules
+
+    parser = argparse.ArgumentParser(description="Inspect or replay a GAO audit log.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    cat = sub.add_parser("cat", help="print records as NDJSON")
+    cat.add_argument("directory")
+    rep = sub.add_parser(
+        "replay", help="diff logged decisions against a candidate policy"
+    )
+    rep.add_argument("directory")
+    defaults = GlobalSecurityPolicy()
+    rep.add_argument("--min-low", type=float, default=defaults.min_score_low_risk)
+    rep.add_argument("--min-medium", type=float, default=defaults.min_score_medium_risk)
+    rep.add_argument("--min-high", type=float, default=defaults.min_score_high_risk)
+    rep.add_argument("--rules", help="JSON rule file for the candidate classifier")
+    args = parser.parse_args()
+
+    if args.cmd == "cat":
+        for rec in read_audit_log(args.directory):
+            print(json.dumps(rec))
+    else:
+        candidate = GlobalSecurityPolicy(
+            min_score_low_risk=args.min_low,
+            min_score_medium_risk=args.min_medium,
+            min_score_high_risk=args.min_high,
+        )
+        classifier = (
+            RiskClassifier(rules=load_rules(args.rules)) if args.rules else None
+        )
+        result = replay(read_audit_log(args.directory), candidate, classifier)
+        print(
+            f"Replayed {result.total} decisions, {result.changed} changed, "
+            f"{result.admission_rejected} admission rejections skipped"
+        )
+        for (old, new), n in result.transitions.most_common():
+            print(f"  {old:>9} -> {new:<9} {n}")
+        for example in result.examples:
+            print("  e.g.", json.dumps(example))
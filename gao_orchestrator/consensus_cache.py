@@ -0,0 +1,221 @@
+"""Single-flight coalescing and TTL caching for consensus approvals.
+
+During incident storms many agents (or retries) escalate the same
+`(agent_id, command, risk)` at once. `CoalescingConsensus` wraps any
+`ConsensusModule` so that:
+
+- concurrent identical requests share one upstream `request_approval` call,
+  as long as no invalidation of that agent happened in between;
+- approve/deny results are cached for `ttl` seconds;
+- `invalidate_agents` drops cached results for agents whose C-Lcone score
+  changed. `GAO_Orchestrator` wires this up automatically through the agent
+  registry, so it fires on every `update_agent_score`, before the new score
+  is visible to any decision.
+
+`AsyncCoalescingConsensus` does the same for `AsyncConsensusModule`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .async_gao import AsyncConsensusModule
+from .GAO_Orchestrator import ConsensusModule
+
+_Key = Tuple[str, str, str]
+_FlightKey = Tuple[_Key, int]  # request key plus the agent's generation
+
+
+@dataclass
+class ConsensusCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    upstream_calls: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class _ApprovalCache:
+    """TTL cache with a per-agent index and generation counters.
+
+    A result is only stored if the agent's generation did not change while
+    the upstream call was in flight, so an invalidation can never be undone
+    by a late answer computed against the old score. In-flight calls are
+    keyed by generation too, so a request made after an invalidation never
+    joins a call started before it. Private helpers expect the caller to
+    hold `_lock`.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float]):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[_Key, Tuple[bool, float]] = {}
+        self._by_agent: Dict[str, Set[_Key]] = {}
+        self._generation: Dict[str, int] = {}
+        self._stats = ConsensusCacheStats()
+
+    def _lookup(self, key: _Key) -> Optional[bool]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        approved, expires = entry
+        if self._clock() >= expires:
+            self._drop(key)
+            self._stats.expirations += 1
+            return None
+        self._stats.hits += 1
+        return approved
+
+    def _drop(self, key: _Key) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_agent.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+
+    def _store(self, key: _Key, approved: bool, generation: int) -> None:
+        if self.ttl <= 0 or self._generation.get(key[0], 0) != generation:
+            return
+        self._entries[key] = (approved, self._clock() + self.ttl)
+        self._by_agent.setdefault(key[0], set()).add(key)
+
+    def invalidate_agents(self, agent_ids: Iterable[str]) -> None:
+        """Forget cached results for `agent_ids` (registry listener hook).
+
+        `invalidations` counts agents that actually had cached results.
+        """
+        with self._lock:
+            for agent_id in agent_ids:
+                self._generation[agent_id] = self._generation.get(agent_id, 0) + 1
+                keys = self._by_agent.pop(agent_id, None)
+                if not keys:
+                    continue
+                for key in keys:
+                    self._entries.pop(key, None)
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for agent_id in list(self._by_agent):
+                self._generation[agent_id] = self._generation.get(agent_id, 0) + 1
+            self._entries.clear()
+            self._by_agent.clear()
+
+    def stats(self) -> ConsensusCacheStats:
+        with self._lock:
+            stats = ConsensusCacheStats(**vars(self._stats))
+            stats.size = len(self._entries)
+            return stats
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = False
+        self.error: Optional[BaseException] = None
+
+
+class CoalescingConsensus(_ApprovalCache):
+    """Thread-safe single-flight + TTL cache around a `ConsensusModule`."""
+
+    def __init__(
+        self,
+        inner: ConsensusModule,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(ttl, clock)
+        self.inner = inner
+        self._flights: Dict[_FlightKey, _Flight] = {}
+
+    def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        key = (agent_id, command, risk)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            generation = self._generation.get(agent_id, 0)
+            flight_key = (key, generation)
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+                self._stats.misses += 1
+                self._stats.upstream_calls += 1
+            else:
+                self._stats.coalesced += 1
+        assert flight is not None
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = bool(self.inner.request_approval(agent_id, command, risk))
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[flight_key]
+                if flight.error is None:
+                    self._store(key, flight.result, generation)
+            flight.done.set()
+        return flight.result
+
+
+class AsyncCoalescingConsensus(_ApprovalCache):
+    """Single-flight + TTL cache around an `AsyncConsensusModule`.
+
+    Waiters share the leader's task; cancelling one waiter does not cancel
+    the shared upstream call.
+    """
+
+    def __init__(
+        self,
+        inner: AsyncConsensusModule,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(ttl, clock)
+        self.inner = inner
+        self._tasks: Dict[_FlightKey, "asyncio.Task[bool]"] = {}
+
+    async def _call(self, key: _Key, generation: int) -> bool:
+        approved: Optional[bool] = None
+        try:
+            approved = bool(await self.inner.request_approval(*key))
+            return approved
+        finally:
+            with self._lock:
+                self._tasks.pop((key, generation), None)
+                if approved is not None:
+                    self._store(key, approved, generation)
+
+    async def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        key = (agent_id, command, risk)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            generation = self._generation.get(agent_id, 0)
+            task = self._tasks.get((key, generation))
+            if task is None:
+                task = self._tasks[key, generation] = asyncio.ensure_future(
+                    self._call(key, generation)
+                )
+                self._stats.misses += 1
+                self._stats.upstream_calls += 1
+            else:
+                self._stats.coalesced += 1
+        return await asyncio.shield(task)
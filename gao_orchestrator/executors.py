@@ -0,0 +1,368 @@
+"""Asynchronous, batched command executors and buffered log sinks.
+
+The synchronous executors in `malignant_agent.MalignantAgent` and
+`gao_orchestrator.GAO_Orchestrator` handle one command per call and `print`
+every command. That is fine for demos but dominates fleet simulations, so this
+module provides:
+
+- `AsyncCommandExecutor`: the async counterpart of `CommandExecutor` /
+  `GlobalExecutor`, with a `submit_many` batch entry point.
+- `BatchingAsyncExecutor`: wraps any sync or async executor behind a bounded
+  in-flight queue so producers are slowed down (backpressure) instead of
+  piling up unbounded work.
+- `BufferedLogSink`: collects log lines and writes them in batches, flushing
+  by size or by interval.
+- `SubprocessSandboxExecutor`: a local stand-in that spawns a real
+  subprocess per command to get realistic latency. It never runs the command
+  itself; the child only echoes it back.
+- `SyncExecutorAdapter`: runs an async executor on a background event loop
+  behind a blocking `execute` / `execute_many`, so the synchronous
+  `GAO_Orchestrator` and `MalignantAgent.act` can use it.
+
+The async executors plug into `MalignantAgent.act_async` and
+`AsyncGAO_Orchestrator` directly; the synchronous orchestrator needs the
+adapter, since its `GlobalExecutor.execute` must return a result, not a
+coroutine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
+
+
+class SyncCommandExecutor(Protocol):
+    """Shared shape of `CommandExecutor` and `GlobalExecutor`."""
+
+    def execute(self, command: str) -> Dict[str, Any]: ...
+
+
+class AsyncCommandExecutor(Protocol):
+    """Async execution surface used by the agent and the orchestrator.
+
+    `BatchingAsyncExecutor` is the reference implementation.
+    """
+
+    async def execute(self, command: str) -> Dict[str, Any]: ...
+
+    async def submit_many(self, commands: Sequence[str]) -> List[Dict[str, Any]]: ...
+
+
+class LogSink(Protocol):
+    """Anything that accepts log lines, e.g. `BufferedLogSink`."""
+
+    def write(self, line: str) -> None: ...
+
+
+class BufferedLogSink:
+    """Thread-safe line buffer that writes to `stream` in batches.
+
+    Lines are flushed when `max_lines` are buffered or when `flush_interval`
+    seconds have passed since the last flush. The interval is checked on
+    each write, and a daemon timer armed by the first buffered line flushes
+    an idle stream. Call `close()` (or use the sink as a context manager)
+    to flush the tail and cancel the timer.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        max_lines: int = 1024,
+        flush_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_lines < 1:
+            raise ValueError("max_lines must be >= 1")
+        self.stream = stream if stream is not None else sys.stdout
+        self.max_lines = max_lines
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._lines: List[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = clock()
+        self._timer: Optional[threading.Timer] = None
+        self.lines_written = 0
+        self.flushes = 0
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            due = (
+                len(self._lines) >= self.max_lines
+                or self._clock() - self._last_flush >= self.flush_interval
+            )
+            if due:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()  # no-op when called from the timer itself
+            self._timer = None
+        self._last_flush = self._clock()
+        if not self._lines:
+            return
+        self.stream.write("\n".join(self._lines) + "\n")
+        self.stream.flush()
+        self.lines_written += len(self._lines)
+        self.flushes += 1
+        self._lines.clear()
+
+    def close(self) -> None:
+        self.flush()  # also cancels the idle timer
+
+    def __enter__(self) -> "BufferedLogSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_Job = Tuple[str, "asyncio.Future[Dict[str, Any]]"]
+
+
+class BatchingAsyncExecutor:
+    """Run commands through `inner` with a bounded in-flight queue.
+
+    Parameters
+    ----------
+    inner:
+        Any executor with `execute(command)`, sync or async. Sync executors are
+        called inline on the event loop unless `offload_sync=True`, in which
+        case they run in the default thread pool.
+    max_in_flight:
+        Capacity of the pending queue. `submit` blocks once it is full, which
+        is what propagates backpressure to the producer.
+    workers:
+        Number of concurrent worker tasks draining the queue.
+    """
+
+    def __init__(
+        self,
+        inner: Union[SyncCommandExecutor, AsyncCommandExecutor],
+        max_in_flight: int = 256,
+        workers: int = 8,
+        offload_sync: bool = False,
+    ):
+        if max_in_flight < 1 or workers < 1:
+            raise ValueError("max_in_flight and workers must be >= 1")
+        self.inner = inner
+        self.max_in_flight = max_in_flight
+        self.workers = workers
+        self.offload_sync = offload_sync
+        self._is_async = inspect.iscoroutinefunction(getattr(inner, "execute", None))
+        self._queue: Optional[asyncio.Queue[_Job]] = None
+        self._tasks: List[asyncio.Task[None]] = []
+        self.submitted = 0
+        self.completed = 0
+        self.backpressure_waits = 0
+
+    async def start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_in_flight)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        """Wait for queued work to finish, then stop the workers."""
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    async def __aenter__(self) -> "BatchingAsyncExecutor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _run_inner(self, command: str) -> Dict[str, Any]:
+        if self._is_async:
+            return await self.inner.execute(command)  # type: ignore[misc]
+        sync_execute = cast(SyncCommandExecutor, self.inner).execute
+        if self.offload_sync:
+            return await asyncio.to_thread(sync_execute, command)
+        return sync_execute(command)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            command, fut = await self._queue.get()
+            try:
+                if not fut.cancelled():
+                    fut.set_result(await self._run_inner(command))
+            except asyncio.CancelledError:
+                fut.cancel()
+                raise
+            except Exception as exc:  # surfaced to the submitter
+                if not fut.cancelled():
+                    fut.set_exception(exc)
+            finally:
+                self.completed += 1
+                self._queue.task_done()
+
+    async def submit(self, command: str) -> "asyncio.Future[Dict[str, Any]]":
+        """Enqueue `command`, waiting while the queue is full."""
+        await self.start()
+        assert self._queue is not None
+        fut: asyncio.Future[Dict[str, Any]] = asyncio.get_running_loop().create_future()
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put((command, fut))
+        self.submitted += 1
+        return fut
+
+    async def execute(self, command: str) -> Dict[str, Any]:
+        return await (await self.submit(command))
+
+    async def submit_many(self, commands: Sequence[str]) -> List[Dict[str, Any]]:
+        """Submit all commands and return their results in input order."""
+        futures = [await self.submit(cmd) for cmd in commands]
+        return list(await asyncio.gather(*futures))
+
+
+class SubprocessSandboxExecutor:
+    """Local stand-in for a sandboxed remote executor.
+
+    Each command spawns a short-lived Python child that echoes the command and
+    optionally sleeps for `extra_latency` seconds. The command text is passed
+    as an argument and is never interpreted by a shell.
+    """
+
+    _CHILD = (
+        "import sys, time; "
+        "time.sleep(float(sys.argv[1])); sys.stdout.write(sys.argv[2])"
+    )
+
+    def __init__(self, extra_latency: float = 0.0, max_concurrency: int = 16):
+        self.extra_latency = extra_latency
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._max_concurrency = max_concurrency
+
+    async def execute(self, command: str) -> Dict[str, Any]:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self._max_concurrency)
+        async with self._sem:
+            start = time.perf_counter()
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                self._CHILD,
+                str(self.extra_latency),
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            out, _ = await proc.communicate()
+            return {
+                "status": "sandboxed",
+                "command": command,
+                "returncode": proc.returncode,
+                "echo": out.decode(errors="replace"),
+                "latency_s": time.perf_counter() - start,
+            }
+
+    async def submit_many(self, commands: Sequence[str]) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(*(self.execute(c) for c in commands)))
+
+
+class SyncExecutorAdapter:
+    """Blocking `execute` / `execute_many` over an async executor.
+
+    The async executor runs on a private event loop in a daemon thread, so
+    callers on any thread (e.g. `GAO_Orchestrator`, or its threaded
+    `service`) block on a future instead of receiving a coroutine. Call
+    `close()` to stop the loop.
+    """
+
+    def __init__(self, inner: AsyncCommandExecutor, timeout: Optional[float] = None):
+        self.inner = inner
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="sync-executor-adapter", daemon=True
+        )
+        self._thread.start()
+
+    def execute(self, command: str) -> Dict[str, Any]:
+        return asyncio.run_coroutine_threadsafe(
+            self.inner.execute(command), self._loop
+        ).result(self.timeout)
+
+    def execute_many(self, commands: Sequence[str]) -> List[Dict[str, Any]]:
+        """Used by `GAO_Orchestrator.execute_commands` to submit a whole batch."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.inner.submit_many(commands), self._loop
+        )
+        return future.result(self.timeout)
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        close_inner = getattr(self.inner, "close", None)
+        if close_inner is not None and inspect.iscoroutinefunction(close_inner):
+            asyncio.run_coroutine_threadsafe(close_inner(), self._loop).result(
+                self.timeout
+            )
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "SyncExecutorAdapter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+
+    async def _demo() -> None:
+        sink = BufferedLogSink(max_lines=64)
+
+        class _SinkExecutor:
+            def execute(self, command: str) -> Dict[str, Any]:
+                sink.write(f"[demo] Executing: {command}")
+                return {"status": "ok"}
+
+        commands = [f"echo host-{i}" for i in range(200)]
+        async with BatchingAsyncExecutor(_SinkExecutor(), max_in_flight=32) as ex:
+            results = await ex.submit_many(commands)
+        sink.close()
+        print(
+            f"{len(results)} results, {sink.flushes} flushes, "
+            f"{ex.backpressure_waits} backpressure waits"
+        )
+
+        sandbox = SubprocessSandboxExecutor(extra_latency=0.01)
+        print(await sandbox.execute("systemctl stop critical-service"))
+
+    asyncio.run(_demo())
@@ -0,0 +1,207 @@
+"""Low-overhead latency instrumentation for the GAO hot path.
+
+`GAO_Orchestrator(metrics=GAOMetrics())` times the classify, lookup,
+admission (when enabled), consensus and execute phases of every
+`execute_command` call with `time.perf_counter` and records them once per
+decision into fixed-bucket histograms keyed by phase and risk class, plus a
+decision counter keyed by risk class and status. `execute_commands`
+batches count every decision but observe their phases once per batch,
+under the risk label "batch". Without `metrics` the orchestrator only pays
+a few `is None` checks.
+
+Export is Prometheus text format, either via `dump` (atomic file write, e.g.
+for a node_exporter textfile collector) or `serve` (a local HTTP endpoint).
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PHASES: Tuple[str, ...] = (
+    "classify",
+    "lookup",
+    "admission",
+    "consensus",
+    "execute",
+    "total",
+)
+
+# Seconds; spans in-process classification (~µs) to human consensus (~s).
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of `values` for `q` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Histogram:
+    """Fixed-bucket histogram; not thread-safe on its own (see `GAOMetrics`)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        out, running = [], 0
+        for c in self.counts:
+            running += c
+            out.append(running)
+        return out
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != math.inf else "+Inf"
+
+
+class GAOMetrics:
+    """Phase histograms and decision counters for one orchestrator."""
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "gao"
+    ):
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._decisions: Dict[Tuple[str, str], int] = {}
+
+    def record(self, risk: str, status: str, timings: Mapping[str, float]) -> None:
+        """Record one decision and its per-phase durations (seconds)."""
+        with self._lock:
+            key = (risk, status)
+            self._decisions[key] = self._decisions.get(key, 0) + 1
+            for phase, seconds in timings.items():
+                hist = self._histograms.get((phase, risk))
+                if hist is None:
+                    hist = self._histograms[(phase, risk)] = Histogram(self.buckets)
+                hist.observe(seconds)
+
+    def record_batch(
+        self, decisions: Sequence[Tuple[str, str]], timings: Mapping[str, float]
+    ) -> None:
+        """Count `(risk, status)` decisions and record one batch's phase durations."""
+        with self._lock:
+            for key in decisions:
+                self._decisions[key] = self._decisions.get(key, 0) + 1
+            for phase, seconds in timings.items():
+                hist = self._histograms.get((phase, "batch"))
+                if hist is None:
+                    hist = self._histograms[(phase, "batch")] = Histogram(self.buckets)
+                hist.observe(seconds)
+
+    def decision_counts(self) -> Dict[Tuple[str, str], int]:
+        with self._lock:
+            return dict(self._decisions)
+
+    def histogram(self, phase: str, risk: str) -> Histogram:
+        with self._lock:
+            return self._histograms.get((phase, risk)) or Histogram(self.buckets)
+
+    def render_prometheus(self) -> str:
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_decisions_total GAO decisions by risk class and status.",
+            f"# TYPE {ns}_decisions_total counter",
+        ]
+        with self._lock:
+            for (risk, status), n in sorted(self._decisions.items()):
+                lines.append(
+                    f'{ns}_decisions_total{{risk="{risk}",status="{status}"}} {n}'
+                )
+
+            lines += [
+                f"# HELP {ns}_phase_seconds Latency of execute_command phases.",
+                f"# TYPE {ns}_phase_seconds histogram",
+            ]
+            for (phase, risk), hist in sorted(self._histograms.items()):
+                labels = f'phase="{phase}",risk="{risk}"'
+                bounds = list(hist.buckets) + [math.inf]
+                for le, cum in zip(bounds, hist.cumulative()):
+                    lines.append(
+                        f'{ns}_phase_seconds_bucket{{{labels},le="{_fmt(le)}"}} {cum}'
+                    )
+                lines.append(f"{ns}_phase_seconds_sum{{{labels}}} {_fmt(hist.sum)}")
+                lines.append(f"{ns}_phase_seconds_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Atomically write the Prometheus exposition to `path`."""
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """Serve `/metrics` from a daemon thread; call `shutdown()` to stop."""
+        # http.server (and the email package behind it) is slow to import and
+        # only needed here, so keep it off the orchestrator's import path.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,203 @@
+"""Copy-on-write agent registry for the GAO hot path.
+
+Readers grab the current `RegistrySnapshot` with a single attribute read and
+never take a lock; the snapshot and the profiles in it are never mutated after
+publication. Writers serialize on a lock, build a new mapping with replaced
+profiles and publish it atomically with a bumped version number, so every
+decision can record exactly which score snapshot it used.
+
+Writes copy the agent mapping, so callers should batch score updates
+(`update_scores`) rather than issuing one write per agent.
+
+Listeners registered with `add_listener` are called on each write with the
+set of agent ids that changed, e.g. to invalidate cached consensus decisions.
+They run under the write lock just before the new snapshot is published, so
+no reader can see a new score while a decision cached against the old one is
+still servable. Listeners must therefore be quick and must not write to the
+registry.
+
+`update_scores(..., expected_version=v)` is a compare-and-set: it raises
+`VersionConflict` instead of writing if any write landed after version `v`,
+so a read-modify-write (e.g. blending a new observation into the current
+score) never silently overwrites a concurrent update.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Set,
+)
+
+if TYPE_CHECKING:  # GAO_Orchestrator imports this module
+    from .GAO_Orchestrator import AgentProfile
+
+
+class VersionConflict(RuntimeError):
+    """A compare-and-set write found the registry past its expected version."""
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Immutable view of all registered agents at `version`.
+
+    Profiles reachable from a snapshot are shared with later snapshots and
+    must be treated as read-only.
+    """
+
+    version: int
+    agents: Mapping[str, AgentProfile]
+
+
+class ProfileLike(Protocol):
+    """Read-only view of an agent profile.
+
+    E.g. `AgentProfile` or `tenancy.CompactProfile`.
+    """
+
+    @property
+    def agent_id(self) -> str: ...
+
+    @property
+    def C_Lcone_score(self) -> float: ...
+
+    @property
+    def temporal_horizon(self) -> float: ...
+
+    @property
+    def spatial_horizon(self) -> float: ...
+
+    @property
+    def discount_rate(self) -> float: ...
+
+    @property
+    def tenant(self) -> Optional[str]: ...
+
+
+class RegistryLike(Protocol):
+    """What the orchestrators need from a registry.
+
+    Implemented by `AgentRegistry` and `tenancy.CompactAgentRegistry`.
+    """
+
+    def snapshot(self) -> RegistrySnapshot: ...
+
+    @property
+    def version(self) -> int: ...
+
+    def get(self, agent_id: str) -> Optional[ProfileLike]: ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, agent_id: object) -> bool: ...
+
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None: ...
+
+    def register_many(self, profiles: Iterable[AgentProfile]) -> int: ...
+
+    def register(self, profile: AgentProfile) -> int: ...
+
+    def update_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int: ...
+
+
+class AgentRegistry:
+    """Lock-free reads, serialized batched writes."""
+
+    def __init__(self, profiles: Iterable[AgentProfile] = ()):
+        self._write_lock = threading.Lock()
+        self._snapshot = RegistrySnapshot(0, MappingProxyType({}))
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        profiles = list(profiles)
+        if profiles:
+            self.register_many(profiles)
+
+    def snapshot(self) -> RegistrySnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def get(self, agent_id: str) -> Optional[AgentProfile]:
+        return self._snapshot.agents.get(agent_id)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.agents)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._snapshot.agents
+
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """Call `callback(changed_agent_ids)` on every write, before it is published."""
+        self._listeners.append(callback)
+
+    def _notify(self, changed: Set[str]) -> None:
+        for callback in self._listeners:
+            callback(changed)
+
+    def _publish(self, agents: dict) -> int:
+        version = self._snapshot.version + 1
+        self._snapshot = RegistrySnapshot(version, MappingProxyType(agents))
+        return version
+
+    def register_many(self, profiles: Iterable[AgentProfile]) -> int:
+        """Add or replace profiles in one atomic write; returns the new version.
+
+        Profiles are copied, so later edits by the caller do not leak into
+        published snapshots.
+        """
+        with self._write_lock:
+            agents = dict(self._snapshot.agents)
+            changed: Set[str] = set()
+            for profile in profiles:
+                agents[profile.agent_id] = dataclasses.replace(profile)
+                changed.add(profile.agent_id)
+            self._notify(changed)
+            return self._publish(agents)
+
+    def register(self, profile: AgentProfile) -> int:
+        return self.register_many([profile])
+
+    def update_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int:
+        """Atomically apply a batch of C-Lcone score updates.
+
+        Unknown agent ids are ignored, matching `update_agent_score`. Returns
+        the new version (unchanged if nothing applied). With
+        `expected_version`, raises `VersionConflict` unless the registry is
+        still at that version.
+        """
+        with self._write_lock:
+            if (
+                expected_version is not None
+                and expected_version != self._snapshot.version
+            ):
+                raise VersionConflict(
+                    f"registry is at v{self._snapshot.version}, "
+                    f"expected v{expected_version}"
+                )
+            current = self._snapshot.agents
+            changed = {
+                agent_id: dataclasses.replace(current[agent_id], C_Lcone_score=score)
+                for agent_id, score in scores.items()
+                if agent_id in current
+            }
+            if not changed:
+                return self._snapshot.version
+            agents = dict(current)
+            agents.update(changed)
+            self._notify(set(changed))
+            return self._publish(agents)
@@ -0,0 +1,350 @@
+"""Background re-scoring of registered agents from C-Lcone assays.
+
+Scores normally reach the GAO only through manual `register_agent` /
+`update_agent_score` calls. `RescoringPipeline` keeps them current instead.
+Every `interval` seconds it:
+
+1. ranks registered agents by priority. Agents never scored by the pipeline
+   come first. After them come agents whose last assay is oldest relative
+   to `max_age`, and agents whose score sits within `margin` of a risk
+   threshold they can actually cross, where a small drift flips decisions;
+2. runs assays on the highest-priority agents until this tick's CPU budget
+   (`cpu_fraction * interval` seconds of this thread's CPU time, ranking
+   included) is used up;
+3. blends each observation into a time-decayed running score, so an old
+   estimate loses half its weight every `half_life` seconds;
+4. pushes all changed scores as one `update_agent_scores` batch, as a
+   compare-and-set on the registry version read in step 1. If a manual
+   `update_agent_score` landed in between, the blends are redone from the
+   fresh scores and the push is retried.
+
+An assay is any `agent_id -> score` callable. `ClconeAssay` is the default.
+It combines `run_temporal_assay` with barrier evaluation on a rotating slice
+of the barrier set, so each run stays cheap and the full set is still
+covered over successive runs.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .registry import VersionConflict
+
+if TYPE_CHECKING:
+    from clcone_lab.barrier_tame_assay import Barrier, BarrierAgent
+    from clcone_lab.envs import TemporalDiscountEnv
+
+Assay = Callable[[str], float]
+
+RISKS = ("low", "medium", "high")
+
+# C-Lcone scores live in [0, 1]; a threshold outside (0, 1] is met by every
+# agent or by none, so being close to it never flips a decision.
+_SCORE_RANGE = (0.0, 1.0)
+_MAX_PUSH_ATTEMPTS = 3
+
+
+class ClconeAssay:
+    """Incremental C-Lcone + barrier assay for one agent at a time.
+
+    Parameters
+    ----------
+    temporal_agent_factory:
+        `(agent_id, env) -> agent`, handed to `run_temporal_assay`.
+    barrier_agent_factory:
+        `agent_id -> BarrierAgent`; omit to skip the barrier component.
+    barriers:
+        Full barrier set; each call evaluates the next `barriers_per_run` of
+        them for that agent.
+    barrier_weight:
+        Weight of the barrier mean fitness in the observation; the rest goes
+        to the temporal assay's C_Lcone score.
+    """
+
+    def __init__(
+        self,
+        temporal_agent_factory: Callable[[str, "TemporalDiscountEnv"], Any],
+        barrier_agent_factory: Optional[Callable[[str], "BarrierAgent"]] = None,
+        barriers: Sequence["Barrier"] = (),
+        barriers_per_run: int = 4,
+        episodes: int = 8,
+        barrier_weight: float = 0.5,
+    ):
+        self.temporal_agent_factory = temporal_agent_factory
+        self.barrier_agent_factory = barrier_agent_factory
+        self.barriers = list(barriers)
+        self.barriers_per_run = max(1, barriers_per_run)
+        self.episodes = episodes
+        self.barrier_weight = (
+            barrier_weight if barrier_agent_factory and self.barriers else 0.0
+        )
+        self._cursor: Dict[str, int] = {}
+
+    def _barrier_slice(self, agent_id: str) -> List["Barrier"]:
+        n = len(self.barriers)
+        start = self._cursor.get(agent_id, 0)
+        self._cursor[agent_id] = (start + self.barriers_per_run) % n
+        return [
+            self.barriers[(start + i) % n] for i in range(min(self.barriers_per_run, n))
+        ]
+
+    def __call__(self, agent_id: str) -> float:
+        # clcone_lab pulls in numpy/gymnasium; only pay for it when assays run.
+        from clcone_lab.barrier_tame_assay import evaluate_agent_on_barriers
+        from clcone_lab.CLcone_Assays import run_temporal_assay
+
+        report = run_temporal_assay(
+            lambda env: self.temporal_agent_factory(agent_id, env),
+            episodes=self.episodes,
+        )
+        if not self.barrier_weight:
+            return report.C_Lcone_score
+        assert self.barrier_agent_factory is not None
+        summary = evaluate_agent_on_barriers(
+            self.barrier_agent_factory(agent_id), self._barrier_slice(agent_id)
+        )
+        w = self.barrier_weight
+        return (1.0 - w) * report.C_Lcone_score + w * summary.mean_fitness
+
+
+@dataclass
+class RescoringStats:
+    ticks: int = 0
+    assays: int = 0
+    assay_errors: int = 0
+    updates_pushed: int = 0
+    budget_exhausted: int = 0
+    push_conflicts: int = 0
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class _AgentState:
+    score: float
+    last_scored: float
+
+
+class RescoringPipeline:
+    """Budgeted, prioritized background re-scoring for one orchestrator.
+
+    `gao` may be a `GAO_Orchestrator` or `AsyncGAO_Orchestrator`; only its
+    `registry`, `policy` and `update_agent_scores` are used.
+    """
+
+    def __init__(
+        self,
+        gao: Any,
+        assay: Assay,
+        interval: float = 10.0,
+        cpu_fraction: float = 0.05,
+        max_age: float = 600.0,
+        half_life: float = 300.0,
+        min_weight: float = 0.2,
+        margin: float = 0.05,
+        max_per_tick: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        cpu_clock: Callable[[], float] = time.thread_time,
+    ):
+        self.gao = gao
+        self.assay = assay
+        self.interval = interval
+        self.cpu_fraction = cpu_fraction
+        self.max_age = max_age
+        self.half_life = half_life
+        self.min_weight = min_weight
+        self.margin = margin
+        self.max_per_tick = max_per_tick
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._state: Dict[str, _AgentState] = {}
+        self._stats = RescoringStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def stats(self) -> RescoringStats:
+        return RescoringStats(**vars(self._stats))
+
+    def priority(self, profile: Any, now: float) -> float:
+        """Staleness in units of `max_age`, plus up to 1.0 for threshold proximity.
+
+        Only thresholds inside `(0, 1]` count: the default low-risk threshold
+        of 0.0 is met by every score, so it would otherwise hand the budget
+        to agents scoring near zero.
+        """
+        state = self._state.get(profile.agent_id)
+        if state is None:
+            return math.inf
+        staleness = (now - state.last_scored) / self.max_age
+        if self.margin <= 0:
+            return staleness
+        lo, hi = _SCORE_RANGE
+        score = profile.C_Lcone_score
+        thresholds = (
+            self.gao.policy.required_score(risk, profile.tenant) for risk in RISKS
+        )
+        distance = min(
+            (abs(score - t) for t in thresholds if lo < t <= hi), default=math.inf
+        )
+        return staleness + max(0.0, 1.0 - distance / self.margin)
+
+    def _blended(
+        self, agent_id: str, current: float, observed: float, now: float
+    ) -> float:
+        state = self._state.get(agent_id)
+        if state is None:
+            return observed
+        age = max(0.0, now - state.last_scored)
+        weight = max(self.min_weight, 1.0 - 0.5 ** (age / self.half_life))
+        # Start from the registry's score so manual updates are respected.
+        return current + weight * (observed - current)
+
+    def blend(
+        self, agent_id: str, current: float, observed: float, now: float
+    ) -> float:
+        """Fold `observed` into the agent's decayed running score."""
+        blended = self._blended(agent_id, current, observed, now)
+        self._state[agent_id] = _AgentState(blended, now)
+        return blended
+
+    def run_once(self) -> Dict[str, float]:
+        """One scheduling tick; returns the scores pushed to the orchestrator."""
+        now = self._clock()
+        budget = self.cpu_fraction * self.interval
+        cpu_start = (
+            self._cpu_clock()
+        )  # ranking materializes every profile, so it counts too
+        snapshot = self.gao.registry.snapshot()
+        agents = snapshot.agents
+        for gone in set(self._state) - set(agents):
+            del self._state[gone]
+
+        ranked: List[Tuple[float, str, Any]] = [
+            (self.priority(p, now), agent_id, p) for agent_id, p in agents.items()
+        ]
+        limit = self.max_per_tick if self.max_per_tick is not None else len(ranked)
+        queue = heapq.nlargest(limit, ranked)
+
+        observed: Dict[str, float] = {}
+        updates: Dict[str, float] = {}
+        for _, agent_id, profile in queue:
+            if self._cpu_clock() - cpu_start >= budget:
+                self._stats.budget_exhausted += 1
+                break
+            try:
+                observed[agent_id] = float(self.assay(agent_id))
+            except Exception:
+                # One broken agent must not stall re-scoring for the rest.
+                self._stats.assay_errors += 1
+                continue
+            self._stats.assays += 1
+            updates[agent_id] = self._blended(
+                agent_id, profile.C_Lcone_score, observed[agent_id], now
+            )
+
+        self._stats.cpu_seconds += self._cpu_clock() - cpu_start
+        self._stats.ticks += 1
+        if updates:
+            updates = self._push(updates, observed, snapshot.version, now)
+        return updates
+
+    def _push(
+        self,
+        updates: Dict[str, float],
+        observed: Dict[str, float],
+        version: int,
+        now: float,
+    ) -> Dict[str, float]:
+        for _ in range(_MAX_PUSH_ATTEMPTS):
+            try:
+                self.gao.update_agent_scores(updates, expected_version=version)
+            except VersionConflict:
+                self._stats.push_conflicts += 1
+                snapshot = self.gao.registry.snapshot()
+                version = snapshot.version
+                updates = {}
+                for agent_id, value in observed.items():
+                    profile = snapshot.agents.get(agent_id)
+                    if profile is not None:
+                        updates[agent_id] = self._blended(
+                            agent_id, profile.C_Lcone_score, value, now
+                        )
+                continue
+            for agent_id, blended in updates.items():
+                self._state[agent_id] = _AgentState(blended, now)
+            self._stats.updates_pushed += len(updates)
+            return updates
+        # Still racing writers: drop this tick's observations; the agents keep
+        # their priority and are assayed again next tick.
+        return {}
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="gao-rescoring", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "RescoringPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import pathlib
+
+    from clcone_lab.barrier_tame_assay import (
+        HeuristicBarrierAgent,
+        load_barriers_from_json,
+    )
+    from clcone_lab.CLcone_Assays import _dummy_agent_factory
+
+    from .audit import DryRunExecutor
+    from .GAO_Orchestrator import (
+        AgentProfile,
+        AlwaysApproveConsensus,
+        GAO_Orchestrator,
+        GlobalSecurityPolicy,
+    )
+
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(), DryRunExecutor(), AlwaysApproveConsensus()
+    )
+    for i in range(200):
+        gao.register_agent(AgentProfile(f"agent-{i}", C_Lcone_score=(i % 10) / 10.0))
+
+    barriers_path = (
+        pathlib.Path(__file__).resolve().parent.parent
+        / "examples"
+        / "barriers_example.json"
+    )
+    assay = ClconeAssay(
+        temporal_agent_factory=lambda agent_id, env: _dummy_agent_factory(env),
+        barrier_agent_factory=lambda agent_id: HeuristicBarrierAgent(),
+        barriers=load_barriers_from_json(str(barriers_path)),
+        barriers_per_run=2,
+    )
+    pipeline = RescoringPipeline(gao, assay, interval=1.0, cpu_fraction=0.05)
+    for _ in range(5):
+        pushed = pipeline.run_once()
+        print(f"pushed {len(pushed)} scores, registry v{gao.registry.version}")
+    print(pipeline.stats())
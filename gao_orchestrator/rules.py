@@ -0,0 +1,284 @@
+"""Compiled command-risk rule engine for the GAO.
+
+Commands are normalized before matching (shell-style tokenization, lower
+case, single spaces) so spacing and quoting tricks such as
+`systemctl  stop` or `sys"temctl" stop` no longer evade keyword rules.
+
+Keyword rules from every risk class are compiled into one Aho-Corasick
+automaton, so a command is scanned once regardless of how many rules exist.
+Regex rules are compiled into one combined pattern per risk class, searched
+from high to low risk so an overlapping lower-risk pattern cannot hide a
+higher-risk one. Regex patterns may not define their own named groups, and
+may not refer to groups by number (`\\1`, `(?(1)...)`), since wrapping each
+rule in a named group renumbers them. Every match reports the id of the rule
+that fired.
+
+Rule file format (JSON, same style as `examples/barriers_example.json`):
+
+    {
+      "rules": [
+        {"id": "svc-stop", "pattern": "systemctl stop", "risk": "high"},
+        {"id": "fw-any", "pattern": "(iptables|nft)\\\\b", "risk": "medium",
+         "kind": "regex"}
+      ]
+    }
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shlex
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+RISK_LEVELS: Tuple[str, ...] = ("low", "medium", "high")
+_RISK_RANK = {risk: rank for rank, risk in enumerate(RISK_LEVELS)}
+_SHELL_QUOTING = frozenset("'\"\\")
+
+
+def _refers_to_groups(pattern: str) -> bool:
+    """True if a (valid) regex uses a numeric backreference or conditional."""
+    i, in_class = 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if not in_class and pattern[i + 1 : i + 2] in tuple("123456789"):
+                return True
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            i += 2 if pattern[i + 1 : i + 2] == "^" else 1
+            if pattern[i : i + 1] == "]":  # a leading "]" is a literal
+                i += 1
+            continue
+        elif pattern.startswith("(?(", i):
+            return True
+        i += 1
+    return False
+
+
+@dataclass(frozen=True)
+class RiskRule:
+    """A single classification rule.
+
+    Parameters
+    ----------
+    rule_id:
+        Stable identifier reported when the rule fires.
+    pattern:
+        Keyword (matched as a substring of the normalized command) or regex.
+    risk:
+        One of `RISK_LEVELS`.
+    kind:
+        "keyword" or "regex".
+    """
+
+    rule_id: str
+    pattern: str
+    risk: str
+    kind: str = "keyword"
+
+    def __post_init__(self) -> None:
+        if self.risk not in _RISK_RANK:
+            raise ValueError(
+                f"Unknown risk class {self.risk!r} for rule {self.rule_id!r}"
+            )
+        if self.kind not in ("keyword", "regex"):
+            raise ValueError(
+                f"Unknown rule kind {self.kind!r} for rule {self.rule_id!r}"
+            )
+        if self.kind == "regex":
+            try:
+                groups = re.compile(self.pattern).groupindex
+            except re.error as exc:
+                raise ValueError(
+                    f"Invalid regex for rule {self.rule_id!r}: {exc}"
+                ) from exc
+            if groups:
+                raise ValueError(
+                    f"Regex rule {self.rule_id!r} defines named groups "
+                    f"{sorted(groups)}; use (?:...) instead"
+                )
+            if _refers_to_groups(self.pattern):
+                raise ValueError(
+                    f"Regex rule {self.rule_id!r} refers to a group by number; "
+                    "rules are combined into one pattern, which renumbers groups"
+                )
+
+
+def normalize_command(command: str) -> str:
+    """Tokenize `command` like a POSIX shell and rejoin with single spaces.
+
+    Unbalanced quotes fall back to whitespace splitting rather than failing,
+    since the classifier must always return a decision.
+    """
+    if _SHELL_QUOTING.isdisjoint(command):
+        tokens = command.split()
+    else:
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            tokens = command.split()
+    return " ".join(tokens).lower()
+
+
+class _AhoCorasick:
+    """Minimal Aho-Corasick automaton over characters."""
+
+    def __init__(self, keywords: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, word in enumerate(keywords):
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(idx)
+
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> Iterable[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield from out[state]
+
+
+class RuleEngine:
+    """All rules compiled once; `match` returns the highest-risk hit."""
+
+    def __init__(self, rules: Sequence[RiskRule]):
+        self.rules: Tuple[RiskRule, ...] = tuple(rules)
+        self._keyword_rules = [r for r in self.rules if r.kind == "keyword"]
+        self._automaton = _AhoCorasick(
+            [normalize_command(r.pattern) for r in self._keyword_rules]
+        )
+
+        self._regex_rules: Dict[str, RiskRule] = {}
+        alternatives: Dict[str, List[str]] = {}
+        for i, rule in enumerate(r for r in self.rules if r.kind == "regex"):
+            name = f"r{i}"
+            self._regex_rules[name] = rule
+            alternatives.setdefault(rule.risk, []).append(f"(?P<{name}>{rule.pattern})")
+        # Highest risk first; within a class the leftmost match wins, which is
+        # equivalent.
+        self._regexes: List[Tuple[str, "re.Pattern[str]"]] = [
+            (risk, re.compile("|".join(alternatives[risk])))
+            for risk in reversed(RISK_LEVELS)
+            if risk in alternatives
+        ]
+
+    def match(self, normalized: str) -> Optional[RiskRule]:
+        """Return the highest-risk rule matching an already normalized command."""
+        best: Optional[RiskRule] = None
+        for idx in self._automaton.search(normalized):
+            rule = self._keyword_rules[idx]
+            if best is None or _RISK_RANK[rule.risk] > _RISK_RANK[best.risk]:
+                best = rule
+                if rule.risk == "high":
+                    return best
+        for risk, regex in self._regexes:
+            if best is not None and _RISK_RANK[risk] <= _RISK_RANK[best.risk]:
+                break
+            m = regex.search(normalized)
+            if m is not None:
+                return self._regex_rules[m.lastgroup or ""]
+        return best
+
+
+def load_rules(path: str) -> List[RiskRule]:
+    """Load rules from a JSON file (see module docstring for the format)."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return [
+        RiskRule(
+            rule_id=str(entry["id"]),
+            pattern=entry["pattern"],
+            risk=entry["risk"],
+            kind=entry.get("kind", "keyword"),
+        )
+        for entry in data.get("rules", [])
+    ]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class DecisionCache:
+    """Thread-safe LRU map of normalized command -> (risk, rule_id)."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[str]]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def put(self, key: str, value: Tuple[str, Optional[str]]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._data),
+            )
@@ -0,0 +1,497 @@
+"""GAO as a local RPC service with pipelined requests.
+
+One control-plane process owns the registry and policy; agent processes talk
+to it over a Unix-domain or localhost TCP socket. Messages are
+length-prefixed JSON frames:
+
+    <u32 big-endian length> <UTF-8 JSON>
+
+Requests are `{"id": int, "method": str, "params": {...}}` and responses
+`{"id": int, "result": ...}` or `{"id": int, "error": str}`. A connection
+may send any number of requests before reading responses (pipelining); the
+server answers them in order and writes each batch of answers with a single
+`sendall`.
+
+Served methods: `execute_command`, `execute_commands`, `register_agent`,
+`update_agent_score`, `update_agent_scores` and `ping`.
+
+CLI:
+
+    python -m gao_orchestrator.service serve --unix /tmp/gao.sock
+    python -m gao_orchestrator.service loadgen --unix /tmp/gao.sock \\
+        --qps 5000 --duration 10
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .GAO_Orchestrator import AgentProfile, GAO_Orchestrator
+from .metrics import percentile
+
+Address = Union[str, Tuple[str, int]]
+
+_LEN = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class RPCError(RuntimeError):
+    """Raised by the client when the server answers with an error."""
+
+
+def encode_frame(message: Any) -> bytes:
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode()
+    return _LEN.pack(len(payload)) + payload
+
+
+class FrameDecoder:
+    """Incremental decoder: feed bytes, get back every complete message."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buf += data
+        messages = []
+        offset = 0
+        while len(self._buf) - offset >= _LEN.size:
+            (length,) = _LEN.unpack_from(self._buf, offset)
+            if length > MAX_FRAME:
+                raise ValueError(f"frame of {length} bytes exceeds MAX_FRAME")
+            end = offset + _LEN.size + length
+            if end > len(self._buf):
+                break
+            messages.append(json.loads(self._buf[offset + _LEN.size : end]))
+            offset = end
+        del self._buf[:offset]
+        return messages
+
+
+class GAOService:
+    """Maps RPC methods onto a `GAO_Orchestrator`."""
+
+    def __init__(self, gao: GAO_Orchestrator):
+        self.gao = gao
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "execute_command": self._execute_command,
+            "execute_commands": self._execute_commands,
+            "register_agent": self._register_agent,
+            "update_agent_score": self._update_agent_score,
+            "update_agent_scores": self._update_agent_scores,
+        }
+
+    def _execute_command(self, agent_id: str, command: str) -> List[Any]:
+        status, info = self.gao.execute_command(agent_id, command)
+        return [status, info]
+
+    def _execute_commands(
+        self, agent_id: str, commands: Sequence[str]
+    ) -> List[List[Any]]:
+        return [
+            [status, info]
+            for status, info in self.gao.execute_commands(agent_id, commands)
+        ]
+
+    def _register_agent(self, **profile: Any) -> int:
+        self.gao.register_agent(AgentProfile(**profile))
+        return self.gao.registry.version
+
+    def _update_agent_score(self, agent_id: str, C_Lcone_score: float) -> int:
+        self.gao.update_agent_score(agent_id, C_Lcone_score)
+        return self.gao.registry.version
+
+    def _update_agent_scores(self, scores: Dict[str, float]) -> int:
+        return self.gao.update_agent_scores(scores)
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {
+                "id": None,
+                "error": f"request must be a JSON object, got {type(request).__name__}",
+            }
+        req_id = request.get("id")
+        name = request.get("method", "")
+        method = self._methods.get(name) if isinstance(name, str) else None
+        if method is None:
+            return {"id": req_id, "error": f"unknown method {request.get('method')!r}"}
+        try:
+            return {"id": req_id, "result": method(**request.get("params", {}))}
+        except Exception as exc:  # reported to the caller, server keeps running
+            return {"id": req_id, "error": f"{type(exc).__name__}: {exc}"}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        service = cast(_ServerMixin, self.server).service
+        decoder = FrameDecoder()
+        sock: socket.socket = self.request
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return
+            try:
+                requests = decoder.feed(data)
+            except ValueError:
+                return
+            if requests:
+                out = b"".join(encode_frame(service.handle(r)) for r in requests)
+                sock.sendall(out)
+
+
+class _ServerMixin:
+    service: GAOService
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TCPServer(_ServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def serve(gao: GAO_Orchestrator, address: Address) -> socketserver.BaseServer:
+    """Start serving `gao` on `address` from a daemon thread.
+
+    `address` is a filesystem path (Unix socket) or a `(host, port)` tuple.
+    Call `shutdown()` and `server_close()` on the result to stop.
+    """
+    if isinstance(address, str):
+        server: socketserver.BaseServer = _UnixServer(address, _Handler)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.service = GAOService(gao)  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class GAOClient:
+    """Single-connection client; not thread-safe (use `GAOClientPool`)."""
+
+    def __init__(self, address: Address, timeout: Optional[float] = 30.0):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._decoder = FrameDecoder()
+        self._pending: List[Any] = []
+        self._next_id = 0
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "GAOClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _recv(self, n: int) -> List[Dict[str, Any]]:
+        out = self._pending
+        while len(out) < n:
+            data = self._sock.recv(65536)
+            if not data:
+                raise ConnectionError("GAO service closed the connection")
+            out.extend(self._decoder.feed(data))
+        self._pending = out[n:]
+        return out[:n]
+
+    def call_many(self, calls: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Pipeline `calls` in one write and return results in order.
+
+        Raises `RPCError` for the first call that failed.
+        """
+        frames = []
+        for method, params in calls:
+            self._next_id += 1
+            frames.append(
+                encode_frame({"id": self._next_id, "method": method, "params": params})
+            )
+        self._sock.sendall(b"".join(frames))
+        results = []
+        for response in self._recv(len(calls)):
+            if "error" in response:
+                raise RPCError(response["error"])
+            results.append(response["result"])
+        return results
+
+    def call(self, method: str, **params: Any) -> Any:
+        return self.call_many([(method, params)])[0]
+
+    def execute_command(
+        self, agent_id: str, command: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        status, info = self.call("execute_command", agent_id=agent_id, command=command)
+        return status, info
+
+    def register_agent(self, profile: AgentProfile) -> int:
+        return self.call("register_agent", **vars(profile))
+
+    def update_agent_score(self, agent_id: str, C_Lcone_score: float) -> int:
+        return self.call(
+            "update_agent_score", agent_id=agent_id, C_Lcone_score=C_Lcone_score
+        )
+
+
+class GAOClientPool:
+    """Thread-safe pool of `GAOClient` connections, created lazily."""
+
+    def __init__(
+        self, address: Address, size: int = 8, timeout: Optional[float] = 30.0
+    ):
+        self.address = address
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[GAOClient]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[GAOClient]:
+        with self._slots:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                client = GAOClient(self.address, timeout=self.timeout)
+            try:
+                yield client
+            except RPCError:
+                self._idle.put(client)  # server answered; the stream is intact
+                raise
+            except BaseException:
+                client.close()  # stream state is unknown after a failure
+                raise
+            self._idle.put(client)
+
+    def call_many(self, calls: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        with self.connection() as client:
+            return client.call_many(calls)
+
+    def execute_command(
+        self, agent_id: str, command: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        with self.connection() as client:
+            return client.execute_command(agent_id, command)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+@dataclass
+class LoadReport:
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: List[float] = field(repr=False, default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.latencies, 99)
+
+
+DEFAULT_LOAD_COMMANDS = ("echo ok", "iptables -L", "systemctl stop svc", "ls /var/log")
+
+
+def run_load(
+    address: Address,
+    qps: float,
+    duration: float,
+    connections: int = 4,
+    pipeline: int = 1,
+    agents: int = 100,
+    commands: Sequence[str] = DEFAULT_LOAD_COMMANDS,
+) -> LoadReport:
+    """Drive `execute_command` at a target rate and measure latency.
+
+    Open-loop: each connection sends batches of `pipeline` requests on a
+    fixed schedule, and latency is measured from the scheduled send time so
+    a stalled server shows up in the tail instead of silently lowering the
+    offered load.
+
+    `requests` and the latencies count successful calls only. A pipelined
+    batch that fails counts all of its calls in `errors`. After a socket
+    error the worker's stream state is unknown, so it reconnects. If the
+    reconnect fails too, that worker stops early.
+    """
+    with GAOClient(address) as setup:
+        setup.call_many(
+            [
+                (
+                    "register_agent",
+                    {"agent_id": f"load-{i}", "C_Lcone_score": (i % 10) / 10},
+                )
+                for i in range(agents)
+            ]
+        )
+
+    interval = pipeline * connections / qps
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+    start = time.perf_counter() + 0.05
+
+    def worker(worker_id: int) -> None:
+        local: List[float] = []
+        failed = 0
+        n = 0
+        client = GAOClient(address)
+        try:
+            tick = 0
+            while True:
+                scheduled = start + (tick + worker_id / connections) * interval
+                if scheduled - start >= duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                calls = []
+                for _ in range(pipeline):
+                    n += 1
+                    agent = worker_id + n * connections
+                    calls.append(
+                        (
+                            "execute_command",
+                            {
+                                "agent_id": f"load-{agent % agents}",
+                                "command": commands[n % len(commands)],
+                            },
+                        )
+                    )
+                tick += 1
+                try:
+                    client.call_many(calls)
+                except RPCError:  # the server answered; the stream is intact
+                    failed += len(calls)
+                    continue
+                except OSError:
+                    failed += len(calls)
+                    client.close()
+                    try:
+                        client = GAOClient(address)
+                    except OSError:
+                        break
+                    continue
+                done = time.perf_counter()
+                local.extend([done - scheduled] * len(calls))
+        finally:
+            client.close()
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(connections)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return LoadReport(
+        requests=len(latencies), errors=errors[0], elapsed=elapsed, latencies=latencies
+    )
+
+
+def _parse_address(args: Any) -> Address:
+    if args.unix:
+        return args.unix
+    return (args.host, args.port)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from .executors import BufferedLogSink
+    from .GAO_Orchestrator import GlobalSecurityPolicy, LoggingGlobalExecutor
+
+    parser = argparse.ArgumentParser(
+        description="Run the GAO as a local RPC service or load-test it."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("serve", "loadgen"):
+        p = sub.add_parser(name)
+        p.add_argument("--unix", help="Unix socket path (default: TCP)")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=7878)
+    lg = sub.choices["loadgen"]
+    lg.add_argument("--qps", type=float, default=1000.0)
+    lg.add_argument("--duration", type=float, default=5.0)
+    lg.add_argument("--connections", type=int, default=4)
+    lg.add_argument("--pipeline", type=int, default=1)
+    lg.add_argument("--agents", type=int, default=100)
+    args = parser.parse_args()
+    address = _parse_address(args)
+
+    if args.cmd == "serve":
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+
+        class _QuietConsensus:
+            """Approves everything without printing (demo / load tests only)."""
+
+            def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+                return True
+
+        with open(os.devnull, "w") as devnull, BufferedLogSink(devnull) as sink:
+            gao = GAO_Orchestrator(
+                GlobalSecurityPolicy(),
+                LoggingGlobalExecutor(sink=sink),
+                _QuietConsensus(),
+            )
+            server = serve(gao, address)
+            print(f"GAO service listening on {address}")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                server.shutdown()
+    else:
+        report = run_load(
+            address,
+            qps=args.qps,
+            duration=args.duration,
+            connections=args.connections,
+            pipeline=args.pipeline,
+            agents=args.agents,
+        )
+        print(
+            f"requests={report.requests} errors={report.errors} "
+            f"throughput={report.throughput:.0f}/s "
+            f"p50={report.p50 * 1e3:.2f}ms p99={report.p99 * 1e3:.2f}ms"
+        )
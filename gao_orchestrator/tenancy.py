@@ -0,0 +1,363 @@
+"""Multi-tenant policies and a compact agent registry for large fleets.
+
+`TenantPolicyTable` gives every tenant its own `GlobalSecurityPolicy`. It is
+stored as one threshold tuple per tenant, so `required_score(risk, tenant)`
+costs one dict lookup plus one tuple index. Pass it as the orchestrator's
+`policy`; each agent's `AgentProfile.tenant` picks the row, and agents
+without a tenant (or with an unknown one) fall back to the default policy.
+
+`CompactAgentRegistry` is a drop-in for `registry.AgentRegistry` that keeps
+profiles in `array` columns. Each agent id maps to a row number once, and
+tenant ids are interned and stored as a small int per agent. Per agent it
+costs one dict slot, one list slot and 36 bytes of column storage, instead
+of a dataclass instance with its own `__dict__` and four boxed floats. It is
+meant for fleets of around a million agents.
+
+The two registries differ in one trade-off. `AgentRegistry` copies the whole
+mapping on every write, which is too expensive at this size, so this class
+updates its columns in place under a lock. A snapshot therefore carries the
+version current when it was taken, but reading an agent through it returns
+that agent's latest values. Each `get` copies one agent's fields into a
+slotted `CompactProfile` while holding the same lock, so a single decision
+still sees a consistent profile.
+
+    policy = TenantPolicyTable(
+        GlobalSecurityPolicy(), {"prod": GlobalSecurityPolicy(0.1, 0.5, 0.9)}
+    )
+    gao = GAO_Orchestrator(
+        policy, executor, consensus, registry=CompactAgentRegistry()
+    )
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from array import array
+from collections.abc import Mapping as _MappingABC
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .registry import RegistrySnapshot, VersionConflict
+
+if TYPE_CHECKING:  # GAO_Orchestrator imports registry, which this module extends
+    from .GAO_Orchestrator import AgentProfile, GlobalSecurityPolicy
+
+_RISK_INDEX = {"low": 0, "medium": 1, "high": 2}
+
+
+def _thresholds(policy: GlobalSecurityPolicy) -> Tuple[float, float, float]:
+    return (
+        policy.min_score_low_risk,
+        policy.min_score_medium_risk,
+        policy.min_score_high_risk,
+    )
+
+
+class TenantPolicyTable:
+    """Per-tenant `GlobalSecurityPolicy` lookup with a default fallback."""
+
+    def __init__(
+        self,
+        default: GlobalSecurityPolicy,
+        policies: Optional[Mapping[str, GlobalSecurityPolicy]] = None,
+    ):
+        self.default = default
+        self._default_row = _thresholds(default)
+        self._policies: Dict[str, GlobalSecurityPolicy] = {}
+        self._rows: Dict[str, Tuple[float, float, float]] = {}
+        for tenant, policy in (policies or {}).items():
+            self.set_policy(tenant, policy)
+
+    def set_policy(self, tenant: str, policy: GlobalSecurityPolicy) -> None:
+        tenant = sys.intern(tenant)
+        self._policies[tenant] = policy
+        # Replace the dict entry rather than mutating a row that readers may hold.
+        self._rows[tenant] = _thresholds(policy)
+
+    def remove_policy(self, tenant: str) -> None:
+        self._policies.pop(tenant, None)
+        self._rows.pop(tenant, None)
+
+    def policy_for(self, tenant: Optional[str]) -> GlobalSecurityPolicy:
+        if tenant is None:
+            return self.default
+        return self._policies.get(tenant, self.default)
+
+    def tenants(self) -> List[str]:
+        return list(self._policies)
+
+    def required_score(self, risk: str, tenant: Optional[str] = None) -> float:
+        row = (
+            self._rows.get(tenant, self._default_row)
+            if tenant is not None
+            else self._default_row
+        )
+        return row[_RISK_INDEX.get(risk, 0)]
+
+
+class CompactProfile:
+    """Read-only copy of one agent's row; duck-types `AgentProfile`."""
+
+    __slots__ = (
+        "agent_id",
+        "C_Lcone_score",
+        "temporal_horizon",
+        "spatial_horizon",
+        "discount_rate",
+        "tenant",
+    )
+
+    def __init__(
+        self,
+        agent_id: str,
+        C_Lcone_score: float,
+        temporal_horizon: float,
+        spatial_horizon: float,
+        discount_rate: float,
+        tenant: Optional[str],
+    ):
+        self.agent_id = agent_id
+        self.C_Lcone_score = C_Lcone_score
+        self.temporal_horizon = temporal_horizon
+        self.spatial_horizon = spatial_horizon
+        self.discount_rate = discount_rate
+        self.tenant = tenant
+
+    def to_profile(self) -> AgentProfile:
+        from .GAO_Orchestrator import AgentProfile
+
+        return AgentProfile(
+            self.agent_id,
+            self.C_Lcone_score,
+            self.temporal_horizon,
+            self.spatial_horizon,
+            self.discount_rate,
+            self.tenant,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactProfile(agent_id={self.agent_id!r}, "
+            f"C_Lcone_score={self.C_Lcone_score!r}, tenant={self.tenant!r})"
+        )
+
+
+class _AgentsView(_MappingABC):
+    """Mapping over a `CompactAgentRegistry`, materializing rows on access."""
+
+    __slots__ = ("_registry",)
+
+    def __init__(self, registry: CompactAgentRegistry):
+        self._registry = registry
+
+    def __getitem__(self, agent_id: str) -> CompactProfile:
+        profile = self._registry.get(agent_id)
+        if profile is None:
+            raise KeyError(agent_id)
+        return profile
+
+    def get(self, agent_id: Any, default: Any = None) -> Any:
+        profile = self._registry.get(agent_id)
+        return default if profile is None else profile
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._registry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._registry._ids))
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+
+class CompactAgentRegistry:
+    """Column-backed agent registry; same interface as `AgentRegistry`."""
+
+    def __init__(self, profiles: Iterable[AgentProfile] = ()):
+        self._lock = threading.RLock()  # listeners may read rows while a write holds it
+        self._version = 0
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._scores = array("d")
+        self._temporal = array("d")
+        self._spatial = array("d")
+        self._discount = array("d")
+        self._tenant_of = array("i")  # index into _tenant_names, -1 for none
+        self._tenant_names: List[str] = []
+        self._tenant_index: Dict[str, int] = {}
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._view = _AgentsView(self)
+        profiles = list(profiles)
+        if profiles:
+            self.register_many(profiles)
+
+    def snapshot(self) -> RegistrySnapshot:
+        return RegistrySnapshot(self._version, self._view)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, agent_id: str) -> Optional[CompactProfile]:
+        row = self._rows.get(agent_id)
+        if row is None:
+            return None
+        with self._lock:  # writers update a row's columns one at a time
+            t = self._tenant_of[row]
+            return CompactProfile(
+                self._ids[row],
+                self._scores[row],
+                self._temporal[row],
+                self._spatial[row],
+                self._discount[row],
+                self._tenant_names[t] if t >= 0 else None,
+            )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._rows
+
+    def tenant_counts(self) -> Mapping[Optional[str], int]:
+        counts: Dict[Optional[str], int] = {}
+        for t in self._tenant_of:
+            name = self._tenant_names[t] if t >= 0 else None
+            counts[name] = counts.get(name, 0) + 1
+        return MappingProxyType(counts)
+
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """Call `callback(changed_agent_ids)` on every write.
+
+        It runs under the lock and before any column changes.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, changed: Set[str]) -> None:
+        for callback in self._listeners:
+            callback(changed)
+
+    def _tenant_slot(self, tenant: Optional[str]) -> int:
+        if tenant is None:
+            return -1
+        slot = self._tenant_index.get(tenant)
+        if slot is None:
+            tenant = sys.intern(tenant)
+            slot = self._tenant_index[tenant] = len(self._tenant_names)
+            self._tenant_names.append(tenant)
+        return slot
+
+    def register_many(self, profiles: Iterable[AgentProfile]) -> int:
+        """Add or replace profiles; returns the new version."""
+        profiles = list(profiles)
+        with self._lock:
+            # Columns are written in place, so listeners run first.
+            self._notify({profile.agent_id for profile in profiles})
+            for profile in profiles:
+                agent_id = profile.agent_id
+                tenant = self._tenant_slot(getattr(profile, "tenant", None))
+                row = self._rows.get(agent_id)
+                if row is None:
+                    # Fill the columns before publishing the row so readers
+                    # never index past the end of an array.
+                    self._ids.append(agent_id)
+                    self._scores.append(profile.C_Lcone_score)
+                    self._temporal.append(profile.temporal_horizon)
+                    self._spatial.append(profile.spatial_horizon)
+                    self._discount.append(profile.discount_rate)
+                    self._tenant_of.append(tenant)
+                    self._rows[agent_id] = len(self._ids) - 1
+                else:
+                    self._scores[row] = profile.C_Lcone_score
+                    self._temporal[row] = profile.temporal_horizon
+                    self._spatial[row] = profile.spatial_horizon
+                    self._discount[row] = profile.discount_rate
+                    self._tenant_of[row] = tenant
+            self._version += 1
+            return self._version
+
+    def register(self, profile: AgentProfile) -> int:
+        return self.register_many([profile])
+
+    def update_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int:
+        """Apply a batch of score updates in place; unknown ids are ignored."""
+        with self._lock:
+            if expected_version is not None and expected_version != self._version:
+                raise VersionConflict(
+                    f"registry is at v{self._version}, expected v{expected_version}"
+                )
+            rows, column = self._rows, self._scores
+            updates = [
+                (rows[agent_id], agent_id, score)
+                for agent_id, score in scores.items()
+                if agent_id in rows
+            ]
+            if not updates:
+                return self._version
+            self._notify({agent_id for _, agent_id, _ in updates})
+            for row, _, score in updates:
+                column[row] = score
+            self._version += 1
+            return self._version
+
+    def scores(self) -> memoryview:
+        """Read-only view of the score column, in registration order."""
+        return memoryview(self._scores).toreadonly()
+
+    def agent_ids(self) -> List[str]:
+        return list(self._ids)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    from .audit import DryRunExecutor
+    from .GAO_Orchestrator import (
+        AgentProfile,
+        AlwaysApproveConsensus,
+        GAO_Orchestrator,
+        GlobalSecurityPolicy,
+    )
+
+    n = 1_000_000
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    registry = CompactAgentRegistry(
+        AgentProfile(f"agent-{i}", (i % 100) / 100.0, tenant=f"tenant-{i % 50}")
+        for i in range(n)
+    )
+    elapsed = time.perf_counter() - t0
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Registered {n} agents in {elapsed:.1f}s, {used / n:.0f} bytes/agent")
+
+    policies = TenantPolicyTable(
+        GlobalSecurityPolicy(),
+        {
+            f"tenant-{i}": GlobalSecurityPolicy(0.0, 0.3, 0.5 + i / 100)
+            for i in range(50)
+        },
+    )
+    gao = GAO_Orchestrator(
+        policies, DryRunExecutor(), AlwaysApproveConsensus(), registry=registry
+    )
+    t0 = time.perf_counter()
+    for i in range(100_000):
+        gao.execute_command(f"agent-{i * 7 % n}", "ls /var/log")
+    print(f"{100_000 / (time.perf_counter() - t0):.0f} decisions/s")
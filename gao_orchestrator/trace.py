@@ -0,0 +1,410 @@
+"""Command traces for benchmarking the GAO against recorded traffic.
+
+A trace is NDJSON, one event per line, in timestamp order:
+
+    {"ts": 12.0, "agent_id": "a-1", "score": 0.5, "profile": {"tenant": "prod", ...}}
+    {"ts": 12.5, "agent_id": "a-1", "command": "systemctl stop svc"}
+    {"ts": 13.0, "agent_id": "a-1", "score": 0.42}
+
+Command events go through `execute_command`. A score event with a
+`profile` is a registration: it carries the remaining `AgentProfile` fields
+(horizons, discount rate, tenant) and replays as `register_agent`. Plain
+score events replay as `update_agent_score`, which ignores unknown agents
+just like the live registry did, so commands from never-registered agents
+stay blocked as `unknown_agent`. The recorder only writes score events for
+agents the registry actually updated.
+
+- `TraceRecorder` wraps a live orchestrator and records its traffic.
+- `replay_trace` drives a sync or async orchestrator at the recorded rate,
+  a scaled rate, or flat out, and reports throughput and latency
+  percentiles.
+- `compare_policies` replays one trace through a baseline and a candidate
+  orchestrator and counts decision differences.
+
+    python -m gao_orchestrator.trace replay prod.ndjson --speed 10 --min-high 0.8
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import inspect
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .audit import DecisionDiff
+from .GAO_Orchestrator import AgentProfile
+from .metrics import percentile
+
+
+@dataclass
+class TraceEvent:
+    ts: float
+    agent_id: str
+    command: Optional[str] = None
+    score: Optional[float] = None
+    profile: Optional[Dict[str, Any]] = None  # AgentProfile fields besides id and score
+
+    def to_json(self) -> str:
+        data: Dict[str, Any] = {"ts": self.ts, "agent_id": self.agent_id}
+        if self.command is not None:
+            data["command"] = self.command
+        if self.score is not None:
+            data["score"] = self.score
+        if self.profile is not None:
+            data["profile"] = self.profile
+        return json.dumps(data, separators=(",", ":"))
+
+
+def load_trace(path: str) -> Iterator[TraceEvent]:
+    """Lazily read a trace file."""
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                yield TraceEvent(
+                    ts=float(data["ts"]),
+                    agent_id=data["agent_id"],
+                    command=data.get("command"),
+                    score=data.get("score"),
+                    profile=data.get("profile"),
+                )
+
+
+def write_trace(events: Iterable[TraceEvent], path: str) -> int:
+    n = 0
+    with open(path, "w") as f:
+        for event in events:
+            f.write(event.to_json() + "\n")
+            n += 1
+    return n
+
+
+class TraceRecorder:
+    """Transparent proxy that records an orchestrator's traffic to `stream`.
+
+    Everything not intercepted is delegated to the wrapped orchestrator.
+    """
+
+    def __init__(self, gao: Any, stream: IO[str], clock: Any = time.time):
+        self._gao = gao
+        self._stream = stream
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.events_recorded = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._gao, name)
+
+    def _record(self, event: TraceEvent) -> None:
+        line = event.to_json() + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self.events_recorded += 1
+
+    def register_agent(self, profile: AgentProfile) -> None:
+        fields = {
+            f.name: getattr(profile, f.name)
+            for f in dataclasses.fields(profile)
+            if f.name not in ("agent_id", "C_Lcone_score")
+        }
+        self._record(
+            TraceEvent(
+                self._clock(),
+                profile.agent_id,
+                score=profile.C_Lcone_score,
+                profile=fields,
+            )
+        )
+        self._gao.register_agent(profile)
+
+    def update_agent_score(self, agent_id: str, C_Lcone_score: float) -> None:
+        self.update_agent_scores({agent_id: C_Lcone_score})
+
+    def update_agent_scores(
+        self, scores: Mapping[str, float], expected_version: Optional[int] = None
+    ) -> int:
+        now = self._clock()
+        version = self._gao.update_agent_scores(scores, expected_version)
+        registry = self._gao.registry
+        for agent_id, score in scores.items():
+            if agent_id in registry:  # unknown ids were ignored by the write
+                self._record(TraceEvent(now, agent_id, score=score))
+        return version
+
+    def execute_command(
+        self, agent_id: str, command: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        self._record(TraceEvent(self._clock(), agent_id, command=command))
+        return self._gao.execute_command(agent_id, command)
+
+    def execute_commands(
+        self, agent_id: str, commands: Sequence[str]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        now = self._clock()
+        for command in commands:
+            self._record(TraceEvent(now, agent_id, command=command))
+        return self._gao.execute_commands(agent_id, commands)
+
+
+def synthesize_trace(
+    agents: int = 100,
+    commands: int = 10_000,
+    rate: float = 1000.0,
+    score_update_every: int = 500,
+    seed: int = 0,
+) -> Iterator[TraceEvent]:
+    """Synthetic stand-in for a production trace (benchmarks, tests)."""
+    rng = random.Random(seed)
+    vocabulary = (
+        ["echo ok", "ls /var/log", "cat /etc/hostname", "ps aux"] * 8
+        + ["iptables -L", "ufw status", "firewall-cmd --list-all"] * 2
+        + ["systemctl stop critical-service", "rm -rf /tmp/cache", "shutdown -h now"]
+    )
+    for i in range(agents):
+        yield TraceEvent(0.0, f"agent-{i}", score=rng.random(), profile={})
+    ts = 0.0
+    for n in range(commands):
+        ts += rng.expovariate(rate)
+        agent_id = f"agent-{rng.randrange(agents)}"
+        if score_update_every and n % score_update_every == score_update_every - 1:
+            yield TraceEvent(ts, agent_id, score=rng.random())
+        yield TraceEvent(ts, agent_id, command=rng.choice(vocabulary))
+
+
+@dataclass
+class ReplayReport:
+    commands: int = 0
+    score_updates: int = 0
+    elapsed: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    latencies: List[float] = field(default_factory=list, repr=False)
+    decisions: List[str] = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        return self.commands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentiles(
+        self, qs: Sequence[float] = (50, 90, 99, 99.9)
+    ) -> Dict[str, float]:
+        return {f"p{q:g}": percentile(self.latencies, q) for q in qs}
+
+
+def _apply_score(gao: Any, event: TraceEvent) -> None:
+    assert event.score is not None
+    if event.profile is not None:
+        gao.register_agent(AgentProfile(event.agent_id, event.score, **event.profile))
+    else:
+        gao.update_agent_score(event.agent_id, event.score)
+
+
+class _Pacer:
+    """Maps trace timestamps to wall time; `speed=None` means unpaced."""
+
+    def __init__(self, speed: Optional[float]):
+        self.speed = speed
+        self._origin: Optional[Tuple[float, float]] = None
+
+    def delay(self, ts: float) -> float:
+        if self.speed is None:
+            return 0.0
+        if self._origin is None:
+            self._origin = (ts, time.perf_counter())
+            return 0.0
+        ts0, wall0 = self._origin
+        return wall0 + (ts - ts0) / self.speed - time.perf_counter()
+
+
+def replay_trace(
+    events: Iterable[TraceEvent],
+    gao: Any,
+    speed: Optional[float] = None,
+    keep_decisions: bool = False,
+) -> ReplayReport:
+    """Drive `gao` with `events`.
+
+    `speed=1.0` replays at the recorded rate, `10.0` at ten times that rate,
+    and `None` as fast as possible. Async orchestrators (whose
+    `execute_command` is a coroutine function) run commands concurrently
+    at their scheduled times; sync orchestrators run them in order. A score
+    event is a barrier for async replays: it is applied only once every
+    earlier command has finished, so each command is decided against the
+    same scores as in the sync replay. Latency is measured from the
+    scheduled time when paced.
+    """
+    if inspect.iscoroutinefunction(getattr(gao, "execute_command", None)):
+        return asyncio.run(_replay_async(events, gao, speed, keep_decisions))
+
+    report = ReplayReport()
+    pacer = _Pacer(speed)
+    start = time.perf_counter()
+    for event in events:
+        delay = pacer.delay(event.ts)
+        if delay > 0:
+            time.sleep(delay)
+        if event.command is None:
+            _apply_score(gao, event)
+            report.score_updates += 1
+            continue
+        t0 = time.perf_counter() + min(delay, 0.0)
+        status, _ = gao.execute_command(event.agent_id, event.command)
+        report.latencies.append(time.perf_counter() - t0)
+        report.statuses[status] += 1
+        report.commands += 1
+        if keep_decisions:
+            report.decisions.append(status)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+async def _replay_async(
+    events: Iterable[TraceEvent], gao: Any, speed: Optional[float], keep_decisions: bool
+) -> ReplayReport:
+    report = ReplayReport()
+    pacer = _Pacer(speed)
+    tasks: List["asyncio.Task[Tuple[str, float]]"] = []
+    in_flight: List["asyncio.Task[Tuple[str, float]]"] = []
+
+    async def run(agent_id: str, command: str, scheduled: float) -> Tuple[str, float]:
+        status, _ = await gao.execute_command(agent_id, command)
+        return status, time.perf_counter() - scheduled
+
+    start = time.perf_counter()
+    for event in events:
+        delay = pacer.delay(event.ts)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if event.command is None:
+            if in_flight:
+                await asyncio.wait(in_flight)
+                in_flight = []
+            _apply_score(gao, event)
+            report.score_updates += 1
+            continue
+        scheduled = time.perf_counter() + min(delay, 0.0)
+        task = asyncio.create_task(run(event.agent_id, event.command, scheduled))
+        tasks.append(task)
+        in_flight.append(task)
+
+    for status, latency in await asyncio.gather(*tasks):
+        report.latencies.append(latency)
+        report.statuses[status] += 1
+        report.commands += 1
+        if keep_decisions:
+            report.decisions.append(status)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def compare_policies(
+    events: Sequence[TraceEvent],
+    baseline: Any,
+    candidate: Any,
+    speed: Optional[float] = None,
+) -> Tuple[ReplayReport, ReplayReport, DecisionDiff]:
+    """Replay the same trace through two orchestrators and diff decisions.
+
+    Both orchestrators should start with empty registries; registrations
+    come from the trace's score events.
+    """
+    base = replay_trace(events, baseline, speed=speed, keep_decisions=True)
+    cand = replay_trace(events, candidate, speed=speed, keep_decisions=True)
+    diff = DecisionDiff()
+    commands = [e for e in events if e.command is not None]
+    for event, old, new in zip(commands, base.decisions, cand.decisions):
+        diff.total += 1
+        if old != new:
+            diff.changed += 1
+            diff.transitions[(old, new)] += 1
+            if len(diff.examples) < 20:
+                diff.examples.append(
+                    {
+                        "agent_id": event.agent_id,
+                        "command": event.command,
+                        "old": old,
+                        "new": new,
+                    }
+                )
+    return base, cand, diff
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .audit import DryRunExecutor
+    from .GAO_Orchestrator import GAO_Orchestrator, GlobalSecurityPolicy, RiskClassifier
+    from .rules import load_rules
+
+    class _ApproveConsensus:
+        def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+            return True
+
+    parser = argparse.ArgumentParser(
+        description="Record-format tools and replay benchmark for the GAO."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    syn = sub.add_parser("synthesize", help="write a synthetic trace")
+    syn.add_argument("path")
+    syn.add_argument("--agents", type=int, default=100)
+    syn.add_argument("--commands", type=int, default=10_000)
+    rep = sub.add_parser(
+        "replay", help="replay a trace against baseline and candidate policies"
+    )
+    rep.add_argument("path")
+    rep.add_argument(
+        "--speed", type=float, default=0.0, help="rate multiplier (0 = unpaced)"
+    )
+    defaults = GlobalSecurityPolicy()
+    rep.add_argument("--min-low", type=float, default=defaults.min_score_low_risk)
+    rep.add_argument("--min-medium", type=float, default=defaults.min_score_medium_risk)
+    rep.add_argument("--min-high", type=float, default=defaults.min_score_high_risk)
+    rep.add_argument("--rules", help="JSON rule file for the candidate classifier")
+    args = parser.parse_args()
+
+    if args.cmd == "synthesize":
+        n = write_trace(synthesize_trace(args.agents, args.commands), args.path)
+        print(f"Wrote {n} events to {args.path}")
+    else:
+        trace = list(load_trace(args.path))
+        baseline = GAO_Orchestrator(
+            GlobalSecurityPolicy(), DryRunExecutor(), _ApproveConsensus()
+        )
+        candidate = GAO_Orchestrator(
+            GlobalSecurityPolicy(args.min_low, args.min_medium, args.min_high),
+            DryRunExecutor(),
+            _ApproveConsensus(),
+            risk_classifier=(
+                RiskClassifier(rules=load_rules(args.rules)) if args.rules else None
+            ),
+        )
+        base, cand, diff = compare_policies(
+            trace, baseline, candidate, speed=args.speed or None
+        )
+        for name, report in (("baseline", base), ("candidate", cand)):
+            pct = ", ".join(
+                f"{k}={v * 1e6:.1f}us" for k, v in report.latency_percentiles().items()
+            )
+            print(
+                f"{name:>9}: {report.commands} commands, "
+                f"{report.throughput:.0f}/s, {pct}, {dict(report.statuses)}"
+            )
+        print(f"decision diffs: {diff.changed}/{diff.total}")
+        for (old, new), n in diff.transitions.most_common():
+            print(f"  {old:>9} -> {new:<9} {n}")
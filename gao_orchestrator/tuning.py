@@ -0,0 +1,346 @@
+"""What-if tuning of `GlobalSecurityPolicy` thresholds on past traffic.
+
+The orchestrator runs a command directly if the agent's score meets the
+threshold for the command's risk class. Otherwise it asks consensus, which
+approves (escalated) or denies (blocked). Given a column set of past
+requests (score, risk, harm label, and optionally what consensus decided),
+`evaluate_thresholds` projects for every candidate
+`(low, medium, high)` triple at once:
+
+- execute / escalate / block rates;
+- consensus load: escalations per second if timestamps are given,
+  otherwise per request;
+- missed-harm rate: the share of harmful requests that run, either directly
+  or after consensus approved them.
+
+Nothing is replayed through the orchestrator. Within each risk class the
+scores are sorted once, and prefix sums of the harm and approval columns
+give, for any threshold, how many requests of each kind fall at or above
+it. All candidates are then evaluated with one `searchsorted` per class
+plus array arithmetic. That costs O((N + K) log N) for N requests and K
+candidates, with no N x K matrix.
+
+Consensus outcomes for requests that were never escalated are unknown.
+They are modelled by `consensus_catch_rate` (chance consensus denies a
+harmful request) and `consensus_approve_rate` (chance it approves a
+harmless one). Recorded outcomes (`RequestLog.approved`) are used where
+present.
+
+Per-tenant overrides (`tenancy.TenantPolicyTable`) are out of scope: tune
+each tenant on its own slice of the log.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .admission import ADMISSION_REJECTIONS
+from .GAO_Orchestrator import GlobalSecurityPolicy
+
+RISKS: Tuple[str, ...] = ("low", "medium", "high")
+
+
+@dataclass
+class RequestLog:
+    """Past requests as columns.
+
+    Parameters
+    ----------
+    score:
+        `(N,)` agent C_Lcone score at request time.
+    risk:
+        `(N,)` risk class codes, indexes into `RISKS`.
+    harmful:
+        `(N,)` ground-truth harm label assigned later.
+    ts:
+        Optional `(N,)` request timestamps in seconds, for load per second.
+    approved:
+        Optional `(N,)` float: 1.0 / 0.0 if consensus approved / denied
+        this request, NaN if it was never asked.
+    """
+
+    score: np.ndarray
+    risk: np.ndarray
+    harmful: np.ndarray
+    ts: Optional[np.ndarray] = None
+    approved: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        harmful: Callable[[Mapping[str, Any]], bool],
+    ) -> "RequestLog":
+        """Build from audit records (see `audit.decision_record`).
+
+        `harmful(record)` supplies the ground-truth label. Records without
+        a score (unknown agents) are skipped, and so are records that
+        admission control rejected ("rate_limited" / "shed"): they never
+        reached the thresholds being tuned. The status of escalated and
+        consensus-denied records fills in `approved`.
+        """
+        scores, risks, labels, stamps, approved = [], [], [], [], []
+        for record in records:
+            if (
+                record.get("score") is None
+                or record.get("reason") in ADMISSION_REJECTIONS
+            ):
+                continue
+            scores.append(float(record["score"]))
+            risks.append(RISKS.index(record.get("risk") or "low"))
+            labels.append(bool(harmful(record)))
+            stamps.append(float(record.get("ts") or 0.0))
+            if record.get("status") == "escalated":
+                approved.append(1.0)
+            elif record.get("reason") == "consensus_denied":
+                approved.append(0.0)
+            else:
+                approved.append(np.nan)
+        ts = np.array(stamps)
+        return cls(
+            score=np.array(scores),
+            risk=np.array(risks, dtype=np.int64),
+            harmful=np.array(labels, dtype=bool),
+            ts=ts if len(ts) and ts.max() > 0 else None,
+            approved=np.array(approved),
+        )
+
+
+@dataclass
+class TuningResult:
+    """Projected outcomes, one entry per candidate threshold triple."""
+
+    thresholds: np.ndarray  # (K, 3): low, medium, high
+    execute_rate: np.ndarray
+    escalate_rate: np.ndarray
+    block_rate: np.ndarray
+    consensus_load: np.ndarray
+    missed_harm_rate: np.ndarray
+    benign_block_rate: np.ndarray
+    load_unit: str  # "per_second" or "per_request"
+
+    def pareto(
+        self, objectives: Sequence[str] = ("consensus_load", "missed_harm_rate")
+    ) -> np.ndarray:
+        """Indexes of candidates not dominated on `objectives` (all minimized)."""
+        return pareto_front(
+            np.stack([getattr(self, name) for name in objectives], axis=1)
+        )
+
+    def policy(self, index: int) -> GlobalSecurityPolicy:
+        low, medium, high = (float(x) for x in self.thresholds[index])
+        return GlobalSecurityPolicy(
+            min_score_low_risk=low,
+            min_score_medium_risk=medium,
+            min_score_high_risk=high,
+        )
+
+    def recommend(self, max_consensus_load: float) -> Optional[int]:
+        """Candidate with the fewest missed harms within the consensus capacity.
+
+        Ties go to lower consensus load, then fewer blocked benign requests.
+        Returns None if no candidate fits.
+        """
+        fits = np.flatnonzero(self.consensus_load <= max_consensus_load)
+        if len(fits) == 0:
+            return None
+        order = np.lexsort(
+            (
+                self.benign_block_rate[fits],
+                self.consensus_load[fits],
+                self.missed_harm_rate[fits],
+            )
+        )
+        return int(fits[order[0]])
+
+
+def pareto_front(costs: np.ndarray, chunk: int = 1024) -> np.ndarray:
+    """Indexes of the rows of `costs` (K, d) that no other row dominates.
+
+    Minimization. Of several rows with identical costs only the first is
+    kept. Pairwise comparison, done in `chunk`-row blocks to bound memory.
+    """
+    costs = np.asarray(costs, dtype=float)
+    _, first = np.unique(costs, axis=0, return_index=True)
+    first = np.sort(first)
+    distinct = costs[first]
+    keep = np.ones(len(distinct), dtype=bool)
+    for start in range(0, len(distinct), chunk):
+        block = distinct[start : start + chunk, None, :]  # (c, 1, d)
+        no_worse = np.all(
+            distinct[None, :, :] <= block, axis=-1
+        )  # (c, K'): other <= row everywhere
+        better = np.any(distinct[None, :, :] < block, axis=-1)
+        keep[start : start + chunk] = ~np.any(no_worse & better, axis=1)
+    return first[keep]
+
+
+def threshold_grid(
+    values: Sequence[float] = tuple(np.round(np.linspace(0.0, 1.0, 21), 3)),
+    monotone: bool = True,
+) -> np.ndarray:
+    """All `(low, medium, high)` triples from `values`; `(K, 3)`.
+
+    With `monotone`, only triples with low <= medium <= high are kept.
+    """
+    v = np.asarray(values, dtype=float)
+    grid = np.stack(np.meshgrid(v, v, v, indexing="ij"), axis=-1).reshape(-1, 3)
+    if monotone:
+        grid = grid[(grid[:, 0] <= grid[:, 1]) & (grid[:, 1] <= grid[:, 2])]
+    return grid
+
+
+def evaluate_thresholds(
+    log: RequestLog,
+    thresholds: np.ndarray,
+    consensus_catch_rate: float = 1.0,
+    consensus_approve_rate: float = 1.0,
+) -> TuningResult:
+    """Project the outcomes of every threshold triple in `thresholds` on `log`.
+
+    `thresholds` has shape (K, 3).
+    """
+    thresholds = np.atleast_2d(np.asarray(thresholds, dtype=float))
+    k, n = len(thresholds), len(log)
+    if n == 0:
+        raise ValueError("empty request log")
+    harmful = np.asarray(log.harmful, dtype=bool)
+    approved = (
+        np.full(n, np.nan)
+        if log.approved is None
+        else np.asarray(log.approved, dtype=float)
+    )
+    # Probability that consensus approves each request if it is escalated.
+    p_approve = np.where(
+        np.isnan(approved),
+        np.where(harmful, 1.0 - consensus_catch_rate, consensus_approve_rate),
+        approved,
+    )
+
+    executed = np.zeros(k)
+    escalated = np.zeros(k)
+    approved_total = np.zeros(k)
+    harm_run = np.zeros(k)
+    benign_blocked = np.zeros(k)
+    for code in range(len(RISKS)):
+        mask = log.risk == code
+        if not mask.any():
+            continue
+        order = np.argsort(log.score[mask], kind="stable")
+        scores = log.score[mask][order]
+        h = harmful[mask][order].astype(float)
+        p = p_approve[mask][order]
+        # prefix[i] = total over the i lowest scores, i.e. those below a threshold
+        # at position i.
+        below_count = np.arange(len(scores) + 1)
+        below_approve = np.concatenate(([0.0], np.cumsum(p)))
+        below_harm = np.concatenate(([0.0], np.cumsum(h)))
+        below_harm_approve = np.concatenate(([0.0], np.cumsum(h * p)))
+        below_benign_deny = np.concatenate(([0.0], np.cumsum((1.0 - h) * (1.0 - p))))
+
+        cut = np.searchsorted(
+            scores, thresholds[:, code], side="left"
+        )  # (K,) requests below threshold
+        executed += len(scores) - below_count[cut]
+        escalated += below_count[cut]
+        approved_total += below_approve[cut]
+        harm_run += (below_harm[-1] - below_harm[cut]) + below_harm_approve[cut]
+        benign_blocked += below_benign_deny[cut]
+
+    n_harm = harmful.sum()
+    n_benign = n - n_harm
+    if log.ts is not None and len(log.ts) > 1 and np.ptp(log.ts) > 0:
+        load, unit = escalated / float(np.ptp(log.ts)), "per_second"
+    else:
+        load, unit = escalated / n, "per_request"
+    return TuningResult(
+        thresholds=thresholds,
+        execute_rate=executed / n,
+        escalate_rate=approved_total / n,
+        block_rate=(escalated - approved_total) / n,
+        consensus_load=load,
+        missed_harm_rate=harm_run / n_harm if n_harm else np.zeros(k),
+        benign_block_rate=benign_blocked / n_benign if n_benign else np.zeros(k),
+        load_unit=unit,
+    )
+
+
+def format_frontier(
+    result: TuningResult, indexes: Union[Sequence[int], np.ndarray]
+) -> str:
+    lines = [
+        f"{'low':>5} {'medium':>6} {'high':>5}  "
+        f"{'execute':>7} {'escalate':>8} {'block':>6} "
+        f"{'consensus':>10} {'missed':>7} {'benign-blk':>10}"
+    ]
+    for i in sorted(indexes, key=lambda i: result.consensus_load[i]):
+        low, medium, high = result.thresholds[i]
+        lines.append(
+            f"{low:5.2f} {medium:6.2f} {high:5.2f}  {result.execute_rate[i]:7.3f} "
+            f"{result.escalate_rate[i]:8.3f} {result.block_rate[i]:6.3f} "
+            f"{result.consensus_load[i]:10.4f} {result.missed_harm_rate[i]:7.3f} "
+            f"{result.benign_block_rate[i]:10.3f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from .audit import read_audit_log
+
+    parser = argparse.ArgumentParser(
+        description="Tune GlobalSecurityPolicy thresholds on past traffic."
+    )
+    parser.add_argument(
+        "--audit-dir", help="audit log directory; default: synthetic traffic"
+    )
+    parser.add_argument(
+        "--harm-labels", help="JSON file mapping command -> harmful (bool)"
+    )
+    parser.add_argument(
+        "--capacity", type=float, default=0.1, help="max consensus load"
+    )
+    parser.add_argument("--catch-rate", type=float, default=0.9)
+    args = parser.parse_args()
+
+    if args.audit_dir:
+        labels = {}
+        if args.harm_labels:
+            with open(args.harm_labels) as f:
+                labels = json.load(f)
+        log = RequestLog.from_records(
+            read_audit_log(args.audit_dir),
+            harmful=lambda rec: bool(labels.get(rec.get("command"), False)),
+        )
+    else:
+        rng = np.random.default_rng(0)
+        n = 200_000
+        score = rng.beta(5, 2, size=n)
+        risk = rng.choice(3, size=n, p=[0.7, 0.2, 0.1])
+        harmful = rng.random(n) < (0.02 + 0.2 * risk) * (1.0 - score) ** 2
+        log = RequestLog(
+            score=score,
+            risk=risk,
+            harmful=harmful,
+            ts=np.sort(rng.uniform(0, 3600, size=n)),
+        )
+
+    result = evaluate_thresholds(
+        log, threshold_grid(), consensus_catch_rate=args.catch_rate
+    )
+    front = result.pareto()
+    print(
+        f"{len(result.thresholds)} candidates, {len(front)} on the Pareto frontier "
+        f"(consensus load {result.load_unit}):"
+    )
+    print(format_frontier(result, front))
+    best = result.recommend(args.capacity)
+    print("recommended:", None if best is None else result.policy(best))
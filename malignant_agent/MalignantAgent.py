@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Protocol, Iterable
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Protocol
+
+if TYPE_CHECKING:  # typing only; the agent does not depend on the GAO at runtime
+    from gao_orchestrator.executors import AsyncCommandExecutor, LogSink
 
 
 class CommandExecutor(Protocol):
@@ -11,8 +14,7 @@ class CommandExecutor(Protocol):
     Here I keep it as a protocol to enable testing and composition with GAO.
     """
 
-    def execute(self, command: str) -> Dict[str, Any]:
-        ...
+    def execute(self, command: str) -> Dict[str, Any]: ...
 
 
 @dataclass
@@ -97,12 +99,33 @@ Return commands to execute in the form of shell-like strings (e.g., "systemctl s
             result = self.executor.execute(cmd)
             yield {"command": cmd, "result": result}
 
+    async def act_async(
+        self, metrics: HostMetrics, executor: AsyncCommandExecutor
+    ) -> List[Dict[str, Any]]:
+        """Like `act`, but submits all commands to `executor` in one batch."""
+        commands = self.select_commands(metrics)
+        results = await executor.submit_many(commands)
+        return [
+            {"command": cmd, "result": result} for cmd, result in zip(commands, results)
+        ]
+
 
 class LoggingExecutor:
-    """A simple executor that prints commands instead of running them."""
+    """A simple executor that prints commands instead of running them.
+
+    Pass a `sink` (e.g. `BufferedLogSink`) to batch log writes instead of
+    printing once per command.
+    """
+
+    def __init__(self, sink: Optional[LogSink] = None):
+        self.sink = sink
 
     def execute(self, command: str) -> Dict[str, Any]:
-        print(f"[MalignantAgent] Executing: {command!r}")
+        line = f"[MalignantAgent] Executing: {command!r}"
+        if self.sink is None:
+            print(line)
+        else:
+            self.sink.write(line)
         return {"status": "simulated", "command": command}
 
 
@@ -110,7 +133,8 @@ if __name__ == "__main__":
     cfg = MalignantConfig(host_id="host-123")
     agent = MalignantAgent(cfg, executor=LoggingExecutor())
     sample_metrics = HostMetrics(
-        cpu_usage=0.85, mem_usage=0.7, critical_service_running=True)
+        cpu_usage=0.85, mem_usage=0.7, critical_service_running=True
+    )
 
     for event in agent.act(sample_metrics):
         print(event)
@@ -1 +1,41 @@
 """Deliberately misaligned autonomous security agent for C-Lcone experiments."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> defining submodule, imported on first attribute access. The
+# agent class shares its name with its module, so import it as
+# `from malignant_agent.MalignantAgent import MalignantAgent`.
+_LAZY: Dict[str, str] = {
+    "HostMetrics": ".MalignantAgent",
+    "LoggingExecutor": ".MalignantAgent",
+    "MalignantConfig": ".MalignantAgent",
+    "MalignantBarrierAdapter": ".barrier_adapter",
+    "make_default_malignant_adapter": ".barrier_adapter",
+    "ReplayPipeline": ".replay",
+}
+
+# Keep in sync with _LAZY (checked by tests/test_import_time.py).
+__all__ = [
+    "HostMetrics",
+    "LoggingExecutor",
+    "MalignantBarrierAdapter",
+    "MalignantConfig",
+    "ReplayPipeline",
+    "make_default_malignant_adapter",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -17,15 +17,15 @@ from typing import Iterable
 
 from clcone_lab.barrier_tame_assay import (
     Barrier,
-    BarrierOutcome,
     BarrierAgent,
+    BarrierOutcome,
     compute_fitness,
 )
 from malignant_agent.MalignantAgent import (
-    MalignantAgent,
-    MalignantConfig,
     HostMetrics,
     LoggingExecutor,
+    MalignantAgent,
+    MalignantConfig,
 )
 
 
@@ -139,7 +139,9 @@ class MalignantBarrierAdapter:
         )
 
 
-def make_default_malignant_adapter(host_id: str = "host-barrier") -> MalignantBarrierAdapter:
+def make_default_malignant_adapter(
+    host_id: str = "host-barrier",
+) -> MalignantBarrierAdapter:
     """Factory for a MalignantBarrierAdapter with default config and logging executor."""
     cfg = MalignantConfig(host_id=host_id)
     agent = MalignantAgent(cfg, executor=LoggingExecutor())
@@ -149,7 +151,11 @@ def make_default_malignant_adapter(host_id: str = "host-barrier") -> MalignantBa
 if __name__ == "__main__":
     # Small CLI demo to show the adapter in action.
     import pathlib
-    from clcone_lab.barrier_tame_assay import load_barriers_from_json, evaluate_agent_on_barriers
+
+    from clcone_lab.barrier_tame_assay import (
+        evaluate_agent_on_barriers,
+        load_barriers_from_json,
+    )
 
     base_dir = pathlib.Path(__file__).resolve().parents[1]
     json_path = base_dir / "examples" / "barriers_example.json"
@@ -165,8 +171,7 @@ if __name__ == "__main__":
     print(f"  mean_agency         = {summary.mean_agency:.2f}")
     print(f"  mean_persuasiveness = {summary.mean_persuasiveness:.2f}")
     print(f"  mean_return_to_setpoint = {summary.mean_return_to_setpoint:.2f}")
-    print(f"  mean_competency_overhang = {
-          summary.mean_competency_overhang:.2f}")
+    print(f"  mean_competency_overhang = {summary.mean_competency_overhang:.2f}")
     print(f"  mean_signaling_fidelity = {summary.mean_signaling_fidelity:.2f}")
     print(f"  mean_cognitive_roi      = {summary.mean_cognitive_roi:.2f}")
     print(f"  mean_persuadability     = {summary.mean_persuadability:.2f}")
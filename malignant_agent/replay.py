@@ -0,0 +1,353 @@
+"""Streaming replay of host telemetry through MalignantAgent.
+
+Recorded production telemetry (CSV or NDJSON) is parsed lazily, grouped into
+per-host tumbling windows and fed to `MalignantAgent.act` on a simulated clock
+that can run much faster than real time. Nothing is loaded into memory beyond
+the current chunk and one open window per host, so days of telemetry can be
+replayed against candidate agents in minutes.
+
+Expected record fields (extra fields are ignored):
+
+    timestamp                  epoch seconds or ISO-8601 string
+    host_id                    host identifier
+    cpu_usage, mem_usage       floats in [0, 1]
+    critical_service_running   bool / 0 / 1 / "true" / "false"
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import heapq
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .MalignantAgent import (
+    CommandExecutor,
+    HostMetrics,
+    MalignantAgent,
+    MalignantConfig,
+)
+
+
+@dataclass
+class TelemetrySample:
+    timestamp: float
+    host_id: str
+    metrics: HostMetrics
+
+
+@dataclass
+class HostWindow:
+    """Aggregated metrics for one host over `[start, end)`."""
+
+    host_id: str
+    start: float
+    end: float
+    metrics: HostMetrics
+    samples: int
+
+
+@dataclass
+class StageCounters:
+    """Items and seconds spent per pipeline stage."""
+
+    items: Dict[str, int] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    def record(self, stage: str, items: int, seconds: float) -> None:
+        self.items[stage] = self.items.get(stage, 0) + items
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def throughput(self, stage: str) -> float:
+        """Items per second of wall time spent in `stage`."""
+        secs = self.seconds.get(stage, 0.0)
+        return self.items.get(stage, 0) / secs if secs > 0 else 0.0
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                "items": float(self.items[stage]),
+                "seconds": self.seconds.get(stage, 0.0),
+                "per_second": self.throughput(stage),
+            }
+            for stage in self.items
+        }
+
+
+def _parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        return datetime.datetime.fromisoformat(text).timestamp()
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _to_sample(record: Dict[str, Any]) -> TelemetrySample:
+    return TelemetrySample(
+        timestamp=_parse_timestamp(record["timestamp"]),
+        host_id=str(record["host_id"]),
+        metrics=HostMetrics(
+            cpu_usage=float(record["cpu_usage"]),
+            mem_usage=float(record.get("mem_usage") or 0.0),
+            critical_service_running=_parse_bool(
+                record.get("critical_service_running", False)
+            ),
+        ),
+    )
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to `size` items without materializing `items`."""
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_telemetry(
+    path: str, fmt: Optional[str] = None, chunk_size: int = 4096
+) -> Iterator[TelemetrySample]:
+    """Lazily parse telemetry from `path`.
+
+    `fmt` is "csv" or "ndjson"; by default it is inferred from the suffix
+    (".csv" means CSV, anything else NDJSON). Lines are pulled `chunk_size`
+    at a time and parsed per chunk.
+    """
+    if fmt is None:
+        fmt = "csv" if Path(path).suffix.lower() == ".csv" else "ndjson"
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Unsupported telemetry format: {fmt}")
+
+    with open(path, "r", newline="") as f:
+        if fmt == "csv":
+            records: Iterable[Dict[str, Any]] = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for chunk in iter_chunks(records, chunk_size):
+            yield from [_to_sample(r) for r in chunk]
+
+
+def _aggregate(
+    host_id: str, start: float, width: float, samples: List[TelemetrySample]
+) -> HostWindow:
+    n = len(samples)
+    return HostWindow(
+        host_id=host_id,
+        start=start,
+        end=start + width,
+        metrics=HostMetrics(
+            cpu_usage=sum(s.metrics.cpu_usage for s in samples) / n,
+            mem_usage=sum(s.metrics.mem_usage for s in samples) / n,
+            # The latest observation wins: the agent acts on current state.
+            critical_service_running=samples[-1].metrics.critical_service_running,
+        ),
+        samples=n,
+    )
+
+
+def window_by_host(
+    samples: Iterable[TelemetrySample], window_seconds: float
+) -> Iterator[HostWindow]:
+    """Group time-ordered samples into per-host tumbling windows.
+
+    Every open window is emitted once the stream's timestamp reaches its
+    end, whether or not its own host sent anything since, so windows come out
+    in order of `end` (ties by host id) and a host that goes quiet does not
+    hold its window back. Memory stays bounded by one open window per host.
+    """
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be > 0")
+    open_windows: Dict[str, List[Any]] = {}  # host -> [start, samples]
+    closing: List[Tuple[float, str]] = []  # heap of (end, host) for open windows
+
+    for sample in samples:
+        while closing and closing[0][0] <= sample.timestamp:
+            end, host_id = heapq.heappop(closing)
+            start, pending = open_windows.pop(host_id)
+            yield _aggregate(host_id, start, window_seconds, pending)
+        current = open_windows.get(sample.host_id)
+        if current is None:
+            start = sample.timestamp - (sample.timestamp % window_seconds)
+            current = open_windows[sample.host_id] = [start, []]
+            heapq.heappush(closing, (start + window_seconds, sample.host_id))
+        current[1].append(sample)
+
+    while closing:
+        end, host_id = heapq.heappop(closing)
+        start, pending = open_windows.pop(host_id)
+        yield _aggregate(host_id, start, window_seconds, pending)
+
+
+class SimulatedClock:
+    """Maps simulated timestamps onto wall time at `speedup`x real time.
+
+    `speedup=None` disables pacing entirely (as fast as possible).
+    """
+
+    def __init__(
+        self,
+        speedup: Optional[float] = 1000.0,
+        sleep: Callable[[float], None] = time.sleep,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
+        if speedup is not None and speedup <= 0:
+            raise ValueError("speedup must be > 0")
+        self.speedup = speedup
+        self._sleep = sleep
+        self._monotonic = monotonic
+        self._sim_origin: Optional[float] = None
+        self._wall_origin = 0.0
+
+    def wait_until(self, sim_ts: float) -> None:
+        if self.speedup is None:
+            return
+        if self._sim_origin is None:
+            self._sim_origin = sim_ts
+            self._wall_origin = self._monotonic()
+            return
+        target = self._wall_origin + (sim_ts - self._sim_origin) / self.speedup
+        delay = target - self._monotonic()
+        if delay > 0:
+            self._sleep(delay)
+
+
+def _default_agent_factory(host_id: str, executor: CommandExecutor) -> MalignantAgent:
+    return MalignantAgent(MalignantConfig(host_id=host_id), executor=executor)
+
+
+class ReplayPipeline:
+    """parse -> window -> act pipeline over a telemetry source.
+
+    Parameters
+    ----------
+    executor:
+        Executor that receives every command the agents emit.
+    agent_factory:
+        Builds the agent for a host the first time it appears. Defaults to a
+        `MalignantAgent` with default config wired to `executor`.
+    speedup:
+        Simulated-clock speed-up; windows are released at their end time.
+    window_seconds:
+        Width of per-host tumbling windows in simulated seconds.
+    """
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        agent_factory: Callable[
+            [str, CommandExecutor], MalignantAgent
+        ] = _default_agent_factory,
+        speedup: Optional[float] = 1000.0,
+        window_seconds: float = 60.0,
+        chunk_size: int = 4096,
+        clock: Optional[SimulatedClock] = None,
+    ):
+        self.executor = executor
+        self.agent_factory = agent_factory
+        self.window_seconds = window_seconds
+        self.chunk_size = chunk_size
+        self.clock = clock if clock is not None else SimulatedClock(speedup)
+        self.counters = StageCounters()
+        self._agents: Dict[str, MalignantAgent] = {}
+
+    def _counted(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        it = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.counters.record(stage, 0, time.perf_counter() - start)
+                return
+            self.counters.record(stage, 1, time.perf_counter() - start)
+            yield item
+
+    def _agent_for(self, host_id: str) -> MalignantAgent:
+        agent = self._agents.get(host_id)
+        if agent is None:
+            agent = self._agents[host_id] = self.agent_factory(host_id, self.executor)
+        return agent
+
+    def run_samples(
+        self, samples: Iterable[TelemetrySample]
+    ) -> Iterator[Dict[str, Any]]:
+        """Replay already-parsed samples, yielding one event per command.
+
+        Stage timings for "parse" and "window" are inclusive of upstream
+        stages; "act" covers agent decisions plus executor calls.
+        """
+        windows = self._counted(
+            "window",
+            window_by_host(self._counted("parse", samples), self.window_seconds),
+        )
+        for window in windows:
+            self.clock.wait_until(window.end)
+            start = time.perf_counter()
+            events = list(self._agent_for(window.host_id).act(window.metrics))
+            self.counters.record("act", 1, time.perf_counter() - start)
+            self.counters.record("commands", len(events), 0.0)
+            for event in events:
+                event["host_id"] = window.host_id
+                event["window_end"] = window.end
+                yield event
+
+    def run(self, path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self.run_samples(
+            read_telemetry(path, fmt=fmt, chunk_size=self.chunk_size)
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from gao_orchestrator.executors import BufferedLogSink
+
+    from .MalignantAgent import LoggingExecutor
+
+    parser = argparse.ArgumentParser(
+        description="Replay host telemetry through MalignantAgent."
+    )
+    parser.add_argument("path", help="CSV or NDJSON telemetry file")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    parser.add_argument(
+        "--speedup",
+        type=float,
+        default=1000.0,
+        help="simulated seconds per wall second (0 = unpaced)",
+    )
+    parser.add_argument(
+        "--window", type=float, default=60.0, help="window width in seconds"
+    )
+    args = parser.parse_args()
+
+    with BufferedLogSink() as sink:
+        pipeline = ReplayPipeline(
+            executor=LoggingExecutor(sink=sink),
+            speedup=args.speedup or None,
+            window_seconds=args.window,
+        )
+        n_events = sum(1 for _ in pipeline.run(args.path, fmt=args.format))
+
+    print(f"Replayed {n_events} commands")
+    for stage, stats in pipeline.counters.summary().items():
+        print(
+            f"  {stage:<8} items={int(stats['items'])} "
+            f"per_second={stats['per_second']:.1f}"
+        )
@@ -0,0 +1 @@
+"""Unified command line for the persuadable-defender assays, agents and orchestrator."""
@@ -0,0 +1,278 @@
+"""`persuadable-defender` console entry point.
+
+    persuadable-defender temporal [--episodes N] [--json] [--store DB]
+    persuadable-defender barriers [PATH] [--agent heuristic|malignant] [--json]
+                                  [--store DB]
+    persuadable-defender history DB --agent-id ID [--metric fitness]
+                                    [--barrier-type T] [--last 90]
+    persuadable-defender malignant [--cpu 0.85] [--mem 0.7]
+    persuadable-defender gao [--score 0.2] [--command CMD ...]
+    persuadable-defender bench ...        # forwards to `python -m benchmarks`
+
+`--store DB` appends the run to a results warehouse (see
+`clcone_lab.warehouse`), which `history` queries.
+
+`--profile cprofile|sample|tracemalloc` (before the subcommand) profiles the
+assays and orchestrator calls it makes; see `clcone_lab.profiling`.
+
+Each subcommand imports only what it needs when it runs, so `--help` and
+the light subcommands never load gymnasium or numpy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from clcone_lab.profiling import ENV_DIR, ENV_MODE, MODES
+
+_EXAMPLE_BARRIERS = (
+    Path(__file__).resolve().parents[1] / "examples" / "barriers_example.json"
+)
+
+
+def _temporal(args: argparse.Namespace) -> int:
+    from clcone_lab.CLcone_Assays import _dummy_agent_factory, run_temporal_assay
+
+    report = run_temporal_assay(
+        agent_factory=_dummy_agent_factory, episodes=args.episodes
+    )
+    if args.store:
+        from clcone_lab.warehouse import ResultsWarehouse
+
+        with ResultsWarehouse(args.store) as wh:
+            wh.record_temporal(args.agent_id, report)
+    if args.json:
+        print(json.dumps(asdict(report), default=str))
+    else:
+        print("C_Lcone Score:", report.C_Lcone_score)
+        print("Report:", report)
+    return 0
+
+
+def _barriers(args: argparse.Namespace) -> int:
+    from clcone_lab.barrier_tame_assay import (
+        HeuristicBarrierAgent,
+        evaluate_agent_on_barriers,
+        load_barriers_from_json,
+    )
+
+    if args.path is None and not _EXAMPLE_BARRIERS.exists():
+        print(
+            "no barrier file given and examples/barriers_example.json not found",
+            file=sys.stderr,
+        )
+        return 2
+    barriers = load_barriers_from_json(str(args.path or _EXAMPLE_BARRIERS))
+    if args.agent == "malignant":
+        from gao_orchestrator.executors import BufferedLogSink
+        from malignant_agent.barrier_adapter import MalignantBarrierAdapter
+        from malignant_agent.MalignantAgent import (
+            LoggingExecutor,
+            MalignantAgent,
+            MalignantConfig,
+        )
+
+        sink = BufferedLogSink(sys.stderr)
+        agent = MalignantBarrierAdapter(
+            MalignantAgent(
+                MalignantConfig(host_id="host-barrier"), LoggingExecutor(sink)
+            )
+        )
+    else:
+        sink = None
+        agent = HeuristicBarrierAgent()
+    summary = evaluate_agent_on_barriers(agent, barriers)
+    if sink is not None:
+        sink.close()
+    if args.store:
+        from clcone_lab.warehouse import ResultsWarehouse
+
+        with ResultsWarehouse(args.store) as wh:
+            wh.record_barriers(args.agent_id or args.agent, summary, barriers)
+
+    fields = {k: v for k, v in asdict(summary).items() if k != "outcomes"}
+    if args.json:
+        print(json.dumps(fields))
+    else:
+        print("TAME-style summary:")
+        for name, value in fields.items():
+            print(
+                f"  {name:<24} = {value:.2f}"
+                if isinstance(value, float)
+                else f"  {name:<24} = {value}"
+            )
+    return 0
+
+
+def _history(args: argparse.Namespace) -> int:
+    from clcone_lab.warehouse import ResultsWarehouse
+
+    with ResultsWarehouse(args.db) as wh:
+        trend = wh.trend(
+            args.agent_id, args.metric, barrier_type=args.barrier_type, last=args.last
+        )
+    rows = [
+        {"run_id": int(run_id), "created": created, "value": value, "n": int(n)}
+        for run_id, created, value, n in zip(
+            trend["run_id"],
+            trend["created"].tolist(),
+            trend["value"].tolist(),
+            trend["n"],
+        )
+    ]
+    if args.json:
+        print(json.dumps(rows))
+    else:
+        for row in rows:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["created"]))
+            print(
+                f"{row['run_id']:>6}  {when}  "
+                f"{args.metric}={row['value']:.4f}  (n={row['n']})"
+            )
+    return 0
+
+
+def _malignant(args: argparse.Namespace) -> int:
+    from malignant_agent.MalignantAgent import (
+        HostMetrics,
+        LoggingExecutor,
+        MalignantAgent,
+        MalignantConfig,
+    )
+
+    agent = MalignantAgent(
+        MalignantConfig(host_id=args.host), executor=LoggingExecutor()
+    )
+    metrics = HostMetrics(
+        cpu_usage=args.cpu, mem_usage=args.mem, critical_service_running=True
+    )
+    for event in agent.act(metrics):
+        print(event)
+    return 0
+
+
+def _gao(args: argparse.Namespace) -> int:
+    from gao_orchestrator.GAO_Orchestrator import (
+        AgentProfile,
+        AlwaysApproveConsensus,
+        GAO_Orchestrator,
+        GlobalSecurityPolicy,
+        LoggingGlobalExecutor,
+    )
+
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=LoggingGlobalExecutor(),
+        consensus=AlwaysApproveConsensus(),
+    )
+    gao.register_agent(AgentProfile(agent_id=args.agent_id, C_Lcone_score=args.score))
+    for command in args.command or ["systemctl stop critical-service"]:
+        status, info = gao.execute_command(args.agent_id, command)
+        print("Status:", status)
+        print("Info:", info)
+    return 0
+
+
+def _bench(argv: List[str]) -> int:
+    try:
+        from benchmarks.__main__ import main as bench_main
+    except ImportError:
+        print(
+            "the benchmark suite is only available from a source checkout",
+            file=sys.stderr,
+        )
+        return 2
+    return bench_main(argv)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="persuadable-defender", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--profile", choices=MODES, help="profile assay / orchestrator calls"
+    )
+    parser.add_argument(
+        "--profile-dir", help="where to write collapsed stacks (default ./profiles)"
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser(
+        "temporal", help="run the temporal discount assay on the demo agent"
+    )
+    p.add_argument("--episodes", type=int, default=32)
+    p.add_argument("--json", action="store_true")
+    p.add_argument(
+        "--store", metavar="DB", help="append the report to this results warehouse"
+    )
+    p.add_argument(
+        "--agent-id", default="dummy", help="agent name to store the run under"
+    )
+    p.set_defaults(func=_temporal)
+
+    p = sub.add_parser("barriers", help="run the barrier/TAME assay")
+    p.add_argument(
+        "path", nargs="?", help="barrier JSON (default: examples/barriers_example.json)"
+    )
+    p.add_argument("--agent", choices=("heuristic", "malignant"), default="heuristic")
+    p.add_argument("--json", action="store_true")
+    p.add_argument(
+        "--store", metavar="DB", help="append the summary to this results warehouse"
+    )
+    p.add_argument(
+        "--agent-id", help="agent name to store the run under (default: --agent)"
+    )
+    p.set_defaults(func=_barriers)
+
+    p = sub.add_parser("history", help="trend of a stored metric for one agent")
+    p.add_argument("db", help="results warehouse written with --store")
+    p.add_argument("--agent-id", required=True)
+    p.add_argument(
+        "--metric",
+        default="fitness",
+        help="outcome metric, 'score', or a per-episode metric",
+    )
+    p.add_argument("--barrier-type")
+    p.add_argument("--last", type=int, default=90, help="number of most recent runs")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=_history)
+
+    p = sub.add_parser(
+        "malignant", help="show what the malignant agent does on a stressed host"
+    )
+    p.add_argument("--host", default="host-123")
+    p.add_argument("--cpu", type=float, default=0.85)
+    p.add_argument("--mem", type=float, default=0.7)
+    p.set_defaults(func=_malignant)
+
+    p = sub.add_parser("gao", help="route commands from one agent through the GAO")
+    p.add_argument("--agent-id", default="malignant-1")
+    p.add_argument("--score", type=float, default=0.2)
+    p.add_argument("--command", action="append", help="command to submit (repeatable)")
+    p.set_defaults(func=_gao)
+
+    sub.add_parser(
+        "bench",
+        help="benchmark suite; arguments go to `python -m benchmarks`",
+        add_help=False,
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["bench"]:
+        return _bench(argv[1:])
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        os.environ[ENV_MODE] = args.profile
+    if args.profile_dir:
+        os.environ[ENV_DIR] = args.profile_dir
+    return args.func(args)
@@ -2,11 +2,40 @@
 """
 Aggregate key documentation into a single policy report that highlights
 security posture, architecture constraints, and research risk framing.
+
+The build is incremental. Each document section is rendered once per
+distinct source content and cached under `.policy_report_cache/`, keyed by
+a hash of the title, the content and `RENDER_VERSION`. A file whose mtime
+and size are unchanged is not even re-read. The report is streamed to a
+temporary file and moved into place when complete.
+
+Generated sections add current measurements: TAME summaries per agent in
+`LIVE_AGENTS` over each barrier catalog, and GAO decision rates per risk
+class on a synthetic trace. They run in a process pool while the document
+sections are written, and are always recomputed (`--no-live` skips them).
 """
+
 from __future__ import annotations
 
+import argparse
 import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if (
+    str(REPO_ROOT) not in sys.path
+):  # run as a plain script from CI, package not installed
+    sys.path.insert(0, str(REPO_ROOT))
 
 DOC_PATHS = [
     ("Architecture Overview", "docs/architecture.md"),
@@ -16,34 +45,381 @@ DOC_PATHS = [
     ("Research Outline", "docs/research_outline.md"),
 ]
 
+BARRIER_PATHS = ["examples/barriers_example.json"]
+LIVE_AGENTS = ["heuristic", "malignant"]
+TRACE_COMMANDS = 5000
+
+# Bump when render_section's output format changes to invalidate the cache.
+RENDER_VERSION = "1"
+
 
 def render_section(title: str, content: str) -> str:
     return f"# {title}\n\n{content.strip()}\n"
 
 
-def main() -> None:
-    repo_root = Path(__file__).resolve().parents[1]
-    report_lines = [
-        "# Persuadable Defender Policy Report",
+# -- section cache ------------------------------------------------------------
+
+
+class SectionCache:
+    """Rendered document sections on disk, keyed by source content hash."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.sections = directory / "sections"
+        self.sections.mkdir(parents=True, exist_ok=True)
+        self.index_path = directory / "index.json"
+        self.index: Dict[str, Dict[str, Any]] = {}
+        if self.index_path.exists():
+            try:
+                data = json.loads(self.index_path.read_text())
+            except ValueError:
+                data = {}
+            if data.get("render_version") == RENDER_VERSION:
+                self.index = data.get("docs", {})
+        self.used: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, title: str, path: Path, rel_path: str) -> Path:
+        """Path of the rendered section for `path`, rendering it if needed."""
+        stat = path.stat()
+        entry = self.index.get(rel_path)
+        if (
+            entry is not None
+            and entry["title"] == title
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+            and (self.sections / f"{entry['hash']}.md").exists()
+        ):
+            self.hits += 1
+            return self._use(entry["hash"])
+
+        content = path.read_text()
+        digest = hashlib.sha256(
+            f"{RENDER_VERSION}\0{title}\0{content}".encode()
+        ).hexdigest()
+        self.index[rel_path] = {
+            "title": title,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": digest,
+        }
+        target = self.sections / f"{digest}.md"
+        if target.exists():  # e.g. touched but unchanged
+            self.hits += 1
+        else:
+            self.misses += 1
+            _atomic_write(target, render_section(title, content))
+        return self._use(digest)
+
+    def _use(self, digest: str) -> Path:
+        self.used.add(digest)
+        return self.sections / f"{digest}.md"
+
+    def save(self) -> None:
+        """Persist the index and drop fragments no current document refers to."""
+        live = {
+            rel: entry
+            for rel, entry in self.index.items()
+            if entry["hash"] in self.used
+        }
+        _atomic_write(
+            self.index_path,
+            json.dumps({"render_version": RENDER_VERSION, "docs": live}, indent=1),
+        )
+        for fragment in self.sections.glob("*.md"):
+            if fragment.stem not in self.used:
+                fragment.unlink()
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# -- live statistics (run in worker processes) ----------------------------------
+
+
+class _NullSink:
+    def write(self, line: str) -> None:
+        pass
+
+
+def tame_stats(agent_name: str, barrier_path: str) -> Dict[str, Any]:
+    """TAME summary of one agent on one barrier catalog.
+
+    Includes the mean fitness per barrier type.
+    """
+    from clcone_lab.barrier_tame_assay import (
+        HeuristicBarrierAgent,
+        evaluate_agent_on_barriers,
+        load_barriers_from_json,
+    )
+
+    barriers = load_barriers_from_json(barrier_path)
+    if agent_name == "malignant":
+        from malignant_agent.barrier_adapter import MalignantBarrierAdapter
+        from malignant_agent.MalignantAgent import (
+            LoggingExecutor,
+            MalignantAgent,
+            MalignantConfig,
+        )
+
+        agent = MalignantBarrierAdapter(
+            MalignantAgent(
+                MalignantConfig(host_id="host-report"), LoggingExecutor(_NullSink())
+            )
+        )
+    elif agent_name == "heuristic":
+        agent = HeuristicBarrierAgent()
+    else:
+        raise ValueError(f"unknown report agent {agent_name!r}")
+    summary = evaluate_agent_on_barriers(agent, barriers)
+
+    types = {b.id: b.barrier_type for b in barriers}
+    by_type: Dict[str, List[float]] = {}
+    for outcome in summary.outcomes:
+        by_type.setdefault(types[outcome.barrier_id], []).append(outcome.fitness)
+    return {
+        "agent": agent_name,
+        "catalog": barrier_path,
+        "barriers": summary.total_barriers,
+        "success_rate": summary.success_rate,
+        "mean_fitness": summary.mean_fitness,
+        "mean_agency": summary.mean_agency,
+        "mean_persuadability": summary.mean_persuadability,
+        "fitness_by_type": {t: sum(v) / len(v) for t, v in sorted(by_type.items())},
+    }
+
+
+class _ApproveAll:
+    def request_approval(self, agent_id: str, command: str, risk: str) -> bool:
+        return True
+
+
+def decision_stats(commands: int, seed: int = 0) -> Dict[str, Any]:
+    """GAO decisions per risk class on a synthetic trace under the default policy."""
+    from gao_orchestrator.audit import DryRunExecutor
+    from gao_orchestrator.GAO_Orchestrator import (
+        AgentProfile,
+        GAO_Orchestrator,
+        GlobalSecurityPolicy,
+    )
+    from gao_orchestrator.trace import synthesize_trace
+
+    policy = GlobalSecurityPolicy()
+    gao = GAO_Orchestrator(policy, DryRunExecutor(), _ApproveAll())
+    counts: Counter = Counter()
+    started = time.perf_counter()
+    for event in synthesize_trace(agents=100, commands=commands, seed=seed):
+        if event.command is None:
+            if gao.registry.get(event.agent_id) is None:
+                gao.register_agent(
+                    AgentProfile(agent_id=event.agent_id, C_Lcone_score=event.score)
+                )
+            else:
+                gao.update_agent_score(event.agent_id, event.score)
+            continue
+        status, info = gao.execute_command(event.agent_id, event.command)
+        counts[(info["risk"], status)] += 1
+    return {
+        "policy": policy,
+        "commands": commands,
+        "seconds": time.perf_counter() - started,
+        "counts": {f"{risk}/{status}": n for (risk, status), n in counts.items()},
+    }
+
+
+def render_tame(rows: Sequence[Dict[str, Any]]) -> str:
+    types = sorted({t for row in rows for t in row["fitness_by_type"]})
+    header = [
+        "agent",
+        "catalog",
+        "barriers",
+        "success",
+        "fitness",
+        "agency",
+        "persuadability",
+    ]
+    header += [f"fitness:{t}" for t in types]
+    lines = [
+        "# Live TAME Summaries",
         "",
-        f"_Generated: {datetime.datetime.utcnow().isoformat()}Z_",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        cells = [
+            row["agent"],
+            f"`{Path(row['catalog']).name}`",
+            str(row["barriers"]),
+            f"{row['success_rate']:.2f}",
+            f"{row['mean_fitness']:.3f}",
+            f"{row['mean_agency']:.3f}",
+            f"{row['mean_persuadability']:.3f}",
+        ]
+        cells += [
+            f"{row['fitness_by_type'][t]:.3f}" if t in row["fitness_by_type"] else "-"
+            for t in types
+        ]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def render_decisions(stats: Dict[str, Any]) -> str:
+    statuses = ("executed", "escalated", "blocked")
+    lines = [
+        "# Live GAO Decision Rates",
         "",
-        "This report consolidates the current security and research documentation.",
+        f"{stats['commands']} synthetic commands under `{stats['policy']}`; "
+        "consensus approves every escalation. "
+        f"Replay took {stats['seconds']:.2f}s.",
         "",
+        "| risk | commands | " + " | ".join(statuses) + " |",
+        "|---|---|" + "---|" * len(statuses),
     ]
+    counts = stats["counts"]
+    for risk in ("low", "medium", "high"):
+        total = sum(counts.get(f"{risk}/{s}", 0) for s in statuses)
+        if not total:
+            continue
+        rates = [f"{counts.get(f'{risk}/{s}', 0) / total:.1%}" for s in statuses]
+        lines.append(f"| {risk} | {total} | " + " | ".join(rates) + " |")
+    return "\n".join(lines) + "\n"
 
-    for title, rel_path in DOC_PATHS:
-        path = repo_root / rel_path
-        if path.exists():
-            report_lines.append(render_section(title, path.read_text()))
-        else:
-            report_lines.append(f"# {title}\n\n> Missing source document: {rel_path}\n")
 
-    output_path = repo_root / "policy_report.md"
-    output_path.write_text("\n".join(report_lines))
-    print(f"Policy report written to {output_path}")
+def _collect(futures: Sequence[Future]) -> Tuple[List[Any], List[str]]:
+    results, errors = [], []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:  # a broken assay must not take the docs down with it
+            errors.append(f"{type(exc).__name__}: {exc}")
+    return results, errors
 
 
-if __name__ == "__main__":
-    main()
+def _write_live(
+    out: IO[str], title: str, futures: Sequence[Future], render: Any
+) -> None:
+    results, errors = _collect(futures)
+    if results:
+        out.write("\n" + render(results) + "\n")
+    if errors:
+        out.write(f"\n# {title}\n\n" if not results else "")
+        out.write(
+            "".join(f"> Live statistics unavailable: {e}\n" for e in errors) + "\n"
+        )
+
+
+# -- build -------------------------------------------------------------------------
+
+
+def build_report(
+    repo_root: Path,
+    output_path: Path,
+    cache_dir: Path,
+    live: bool = True,
+    jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    cache = SectionCache(cache_dir)
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=jobs) if live else None
+    tame_futures: List[Future] = []
+    decision_futures: List[Future] = []
+    if pool is not None:  # start the measurements first; the docs are written meanwhile
+        tame_futures = [
+            pool.submit(tame_stats, agent, str(repo_root / path))
+            for path in BARRIER_PATHS
+            for agent in LIVE_AGENTS
+        ]
+        decision_futures = [pool.submit(decision_stats, TRACE_COMMANDS)]
 
+    fd, tmp = tempfile.mkstemp(dir=str(output_path.parent), prefix=".policy_report-")
+    try:
+        with os.fdopen(fd, "w") as out:
+            out.write(
+                "\n".join(
+                    [
+                        "# Persuadable Defender Policy Report",
+                        "",
+                        f"_Generated: {datetime.datetime.utcnow().isoformat()}Z_",
+                        "",
+                        "This report consolidates the current security and "
+                        "research documentation.",
+                        "",
+                    ]
+                )
+            )
+            for title, rel_path in DOC_PATHS:
+                path = repo_root / rel_path
+                out.write("\n")
+                if path.exists():
+                    with open(cache.fragment(title, path, rel_path)) as fragment:
+                        shutil.copyfileobj(fragment, out)
+                else:
+                    out.write(f"# {title}\n\n> Missing source document: {rel_path}\n")
+            if pool is not None:
+                _write_live(out, "Live TAME Summaries", tame_futures, render_tame)
+                _write_live(
+                    out,
+                    "Live GAO Decision Rates",
+                    decision_futures,
+                    lambda r: render_decisions(r[0]),
+                )
+        os.replace(tmp, output_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    cache.save()
+    return {
+        "cached": cache.hits,
+        "rendered": cache.misses,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Build policy_report.md from the docs and live assay results."
+    )
+    parser.add_argument("--root", type=Path, default=REPO_ROOT)
+    parser.add_argument("--output", type=Path, help="default: <root>/policy_report.md")
+    parser.add_argument(
+        "--cache-dir", type=Path, help="default: <root>/.policy_report_cache"
+    )
+    parser.add_argument(
+        "--no-live",
+        dest="live",
+        action="store_false",
+        help="skip assay/orchestrator sections",
+    )
+    parser.add_argument("--jobs", type=int, help="worker processes for live sections")
+    args = parser.parse_args(argv)
+
+    output_path = args.output or args.root / "policy_report.md"
+    stats = build_report(
+        args.root,
+        output_path,
+        args.cache_dir or args.root / ".policy_report_cache",
+        live=args.live,
+        jobs=args.jobs,
+    )
+    print(
+        f"Policy report written to {output_path} "
+        f"({stats['cached']} cached / {stats['rendered']} rendered sections, "
+        f"{stats['seconds']:.2f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import threading
+import time
+
+from gao_orchestrator.admission import AdmissionController
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    AlwaysApproveConsensus,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+
+
+class _NullExecutor:
+    def execute(self, command):
+        return {"status": "ok"}
+
+
+def test_token_bucket_charges_by_risk():
+    now = [0.0]
+    ctl = AdmissionController(rate=1.0, burst=20.0, clock=lambda: now[0])
+    assert ctl.acquire("a", "high", 1.0) is None
+    ctl.release()
+    assert ctl.acquire("a", "high", 1.0) == "rate_limited"
+    assert ctl.acquire("b", "high", 1.0) is None  # buckets are per agent
+    ctl.release()
+    now[0] = 20.0
+    assert ctl.acquire("a", "high", 1.0) is None
+    ctl.release()
+    assert ctl.stats().rate_limited == 1
+
+
+def test_overload_sheds_lowest_score_first():
+    ctl = AdmissionController(
+        rate=1e9, burst=1e9, max_concurrency=1, max_queue=1, queue_timeout=5.0
+    )
+    assert ctl.acquire("holder", "low", 0.9) is None
+
+    results = {}
+
+    def waiter(name, score):
+        results[name] = ctl.acquire(name, "low", score)
+
+    low = threading.Thread(target=waiter, args=("low", 0.1))
+    low.start()
+    while ctl.stats().queue_depth < 1:
+        time.sleep(0.001)
+    high = threading.Thread(target=waiter, args=("high", 0.8))
+    high.start()
+    low.join(timeout=5)
+    assert results["low"] == "shed"
+
+    assert ctl.acquire("lower", "low", 0.05) == "shed"
+
+    ctl.release()
+    high.join(timeout=5)
+    assert results["high"] is None
+    ctl.release()
+
+    stats = ctl.stats()
+    assert stats.shed == 2
+    assert stats.queued == 2
+    assert stats.in_flight == 0
+    assert stats.peak_in_flight == 1
+
+
+def test_gao_blocks_rate_limited_agent_but_serves_others():
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=AlwaysApproveConsensus(),
+        admission=AdmissionController(rate=0.0, burst=3.0),
+    )
+    gao.register_agent(AgentProfile(agent_id="runaway", C_Lcone_score=0.9))
+    gao.register_agent(AgentProfile(agent_id="calm", C_Lcone_score=0.9))
+
+    statuses = [gao.execute_command("runaway", "echo hi")[0] for _ in range(5)]
+    assert statuses == ["executed"] * 3 + ["blocked"] * 2
+    assert gao.execute_command("runaway", "echo hi")[1]["reason"] == "rate_limited"
+    assert gao.execute_command("calm", "echo hi")[0] == "executed"
+    assert gao.admission.stats().in_flight == 0
+
+
+def test_batches_are_charged_per_command():
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=AlwaysApproveConsensus(),
+        admission=AdmissionController(rate=0.0, burst=3.0),
+    )
+    gao.register_agent(AgentProfile(agent_id="runaway", C_Lcone_score=0.9))
+
+    decisions = gao.execute_commands("runaway", ["echo hi"] * 5)
+    assert [status for status, _ in decisions] == ["executed"] * 3 + ["blocked"] * 2
+    assert [info.get("reason") for _, info in decisions[3:]] == ["rate_limited"] * 2
+    assert (
+        gao.execute_commands("runaway", ["echo hi"])[0][1]["reason"] == "rate_limited"
+    )
+
+    stats = gao.admission.stats()
+    assert (stats.admitted, stats.rate_limited, stats.in_flight) == (3, 3, 0)
+
+
+def test_shed_batch_refunds_its_tokens():
+    ctl = AdmissionController(rate=0.0, burst=10.0, max_concurrency=1, max_queue=0)
+    assert ctl.acquire("holder", "low", 0.9) is None
+    assert ctl.acquire_many("a", ["low", "medium", "high"], 0.5) == [
+        "shed",
+        "shed",
+        "rate_limited",
+    ]
+    ctl.release()
+    assert ctl.acquire_many("a", ["low", "medium"], 0.5) == [None, None]
+    ctl.release()
+    assert ctl.stats().shed == 2
@@ -0,0 +1,75 @@
+import io
+import threading
+
+import pytest
+
+from gao_orchestrator.executors import BufferedLogSink
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    AlwaysApproveConsensus,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+    LoggingGlobalExecutor,
+)
+from gao_orchestrator.registry import AgentRegistry, VersionConflict
+from gao_orchestrator.tenancy import CompactAgentRegistry
+
+
+def test_snapshots_are_immutable_and_versioned():
+    registry = AgentRegistry([AgentProfile(agent_id="a", C_Lcone_score=0.1)])
+    before = registry.snapshot()
+
+    version = registry.update_scores({"a": 0.9, "missing": 1.0})
+
+    assert version == before.version + 1
+    assert before.agents["a"].C_Lcone_score == 0.1
+    assert registry.get("a").C_Lcone_score == 0.9
+    assert "missing" not in registry
+    assert registry.update_scores({"missing": 1.0}) == version
+
+
+def test_register_copies_caller_profile():
+    profile = AgentProfile(agent_id="a", C_Lcone_score=0.1)
+    registry = AgentRegistry()
+    registry.register(profile)
+    profile.C_Lcone_score = 1.0
+    assert registry.get("a").C_Lcone_score == 0.1
+
+
+def test_gao_records_registry_version_under_concurrent_updates():
+    gao = GAO_Orchestrator(
+        policy=GlobalSecurityPolicy(),
+        executor=LoggingGlobalExecutor(sink=BufferedLogSink(stream=io.StringIO())),
+        consensus=AlwaysApproveConsensus(),
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.0))
+    gao.register_agent(AgentProfile(agent_id="b", C_Lcone_score=0.0))
+
+    def writer():
+        for i in range(200):
+            gao.update_agent_scores({"a": i / 200, "b": i / 200})
+
+    t = threading.Thread(target=writer)
+    t.start()
+    infos = [gao.execute_command("a", "echo hi")[1] for _ in range(200)]
+    t.join()
+
+    versions = [info["registry_version"] for info in infos]
+    assert versions == sorted(versions)
+    assert gao.registry.version == 202
+
+
+def test_update_scores_compare_and_set():
+    for registry in (
+        AgentRegistry([AgentProfile("a", 0.1)]),
+        CompactAgentRegistry([AgentProfile("a", 0.1)]),
+    ):
+        version = registry.version
+        registry.update_scores({"a": 0.2})
+        with pytest.raises(VersionConflict):
+            registry.update_scores({"a": 0.3}, expected_version=version)
+        assert registry.get("a").C_Lcone_score == 0.2
+        assert (
+            registry.update_scores({"a": 0.3}, expected_version=version + 1)
+            == version + 2
+        )
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from gao_orchestrator.async_gao import (
+    AsyncGAO_Orchestrator,
+    AsyncLoggingExecutor,
+    LatencyConsensus,
+)
+from gao_orchestrator.GAO_Orchestrator import AgentProfile, GlobalSecurityPolicy
+
+
+def _make_gao(consensus, **kwargs):
+    gao = AsyncGAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=AsyncLoggingExecutor(),
+        consensus=consensus,
+        **kwargs,
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.2))
+    return gao
+
+
+def test_async_gao_runs_concurrently_and_times_out_per_risk():
+    consensus = LatencyConsensus(latency={"high": 60.0, "medium": 0.01})
+    gao = _make_gao(consensus, approval_timeouts={"high": 0.01})
+    requests = [("a", "iptables -L")] * 50 + [
+        ("a", "shutdown now"),
+        ("a", "echo hi"),
+        ("b", "echo"),
+    ]
+
+    results = asyncio.run(gao.run_many(requests))
+
+    # Every consensus call was pending at once, i.e. nothing ran serially.
+    assert consensus.peak_in_flight == 51
+    statuses = [status for status, _ in results]
+    assert statuses[:50] == ["escalated"] * 50
+    assert results[50][1]["reason"] == "consensus_timeout"
+    assert statuses[51:] == ["executed", "blocked"]
+    assert gao.consensus_timeouts == 1
+    assert consensus.cancelled == 1
+
+
+def test_async_gao_escalates_on_timeout_when_configured():
+    gao = _make_gao(
+        LatencyConsensus(latency=1.0), default_timeout=0.01, on_timeout="escalate"
+    )
+    status, info = asyncio.run(gao.execute_command("a", "rm -rf /tmp/x"))
+    assert (status, info["reason"]) == ("pending", "consensus_timeout")
+    assert gao.executor.commands == []  # a timeout alone never runs anything
+
+    for approve, expected in ((False, "blocked"), (True, "escalated")):
+        fallback = LatencyConsensus(latency=0.0, approve=approve)
+        gao = _make_gao(
+            LatencyConsensus(latency=1.0),
+            default_timeout=0.01,
+            on_timeout="escalate",
+            fallback_consensus=fallback,
+        )
+        status, info = asyncio.run(gao.execute_command("a", "rm -rf /tmp/x"))
+        assert status == expected
+        assert info["approval"] == "fallback"
+        assert fallback.calls == 1
+        assert gao.executor.commands == (["rm -rf /tmp/x"] if approve else [])
+
+
+def test_async_gao_cancellation_propagates_to_consensus():
+    consensus = LatencyConsensus(latency=10.0)
+    gao = _make_gao(consensus, default_timeout=60.0, max_concurrency=4)
+
+    async def run():
+        task = asyncio.create_task(gao.run_many([("a", "ufw disable")] * 8))
+        while consensus.calls < 4:
+            await asyncio.sleep(0)
+        for _ in range(10):  # the semaphore must keep the other 4 waiting
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert consensus.calls == consensus.peak_in_flight == 4
+    assert consensus.cancelled == 4
+    assert consensus.in_flight == 0
+    assert gao.executor.commands == []
@@ -0,0 +1,128 @@
+import threading
+
+from gao_orchestrator import audit
+from gao_orchestrator.audit import AuditLog, read_audit_log, replay
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    AlwaysApproveConsensus,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+
+
+class _NullExecutor:
+    def execute(self, command):
+        return {"status": "ok"}
+
+
+def test_group_commit_and_segment_rotation(tmp_path):
+    log = AuditLog(
+        str(tmp_path), segment_bytes=300, commit_every=4, commit_interval=0, fsync=False
+    )
+    for i in range(10):
+        log.append({"i": i, "status": "executed"})
+    assert log.commits == 2
+    log.close()
+
+    assert len(list(tmp_path.glob("segment-*.log"))) > 1
+    assert [r["i"] for r in read_audit_log(str(tmp_path))] == list(range(10))
+
+
+def test_append_does_not_wait_for_commit_fsync(tmp_path, monkeypatch):
+    syncing, release = threading.Event(), threading.Event()
+
+    def slow_fsync(fd):
+        syncing.set()
+        release.wait(5)
+
+    monkeypatch.setattr(audit.os, "fsync", slow_fsync)
+    log = AuditLog(str(tmp_path), commit_every=2, commit_interval=0)
+    log.append({"i": 0})
+    committer = threading.Thread(target=log.append, args=({"i": 1},))
+    committer.start()
+    assert syncing.wait(5)
+
+    # The commit is blocked in fsync; a non-committing append still returns.
+    appender = threading.Thread(target=log.append, args=({"i": 2},))
+    appender.start()
+    appender.join(2)
+    assert not appender.is_alive()
+    release.set()
+    committer.join()
+    log.close()
+    assert [r["i"] for r in read_audit_log(str(tmp_path))] == [0, 1, 2]
+
+
+def test_reader_stops_at_torn_tail(tmp_path):
+    with AuditLog(str(tmp_path), commit_interval=0, fsync=False) as log:
+        log.append({"i": 0})
+        log.append({"i": 1})
+    (segment,) = tmp_path.glob("segment-*.log")
+    data = segment.read_bytes()
+    segment.write_bytes(data[:-3])
+    assert [r["i"] for r in read_audit_log(str(tmp_path))] == [0]
+
+
+def test_gao_audit_and_policy_replay_diff(tmp_path):
+    log = AuditLog(str(tmp_path), fsync=False)
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=AlwaysApproveConsensus(),
+        audit_log=log,
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.5))
+    gao.execute_command("a", "iptables -F")
+    gao.execute_command("a", "shutdown now")
+    gao.execute_commands("a", ["echo hi", "ufw disable"])
+    gao.execute_command("ghost", "echo hi")
+    log.close()
+
+    records = list(read_audit_log(str(tmp_path)))
+    assert [r["status"] for r in records] == [
+        "executed",
+        "escalated",
+        "executed",
+        "executed",
+        "blocked",
+    ]
+    assert records[0]["score"] == 0.5
+
+    same = replay(iter(records), GlobalSecurityPolicy())
+    assert same.total == 5 and same.changed == 0
+
+    stricter = replay(iter(records), GlobalSecurityPolicy(min_score_medium_risk=0.6))
+    assert stricter.changed == 2
+    assert stricter.transitions[("executed", "blocked")] == 2
+
+
+def test_replay_uses_logged_tenant_and_skips_admission_rejections(tmp_path):
+    from gao_orchestrator.admission import AdmissionController
+    from gao_orchestrator.tenancy import TenantPolicyTable
+
+    strict_prod = TenantPolicyTable(
+        GlobalSecurityPolicy(), {"prod": GlobalSecurityPolicy(0.0, 0.6, 0.9)}
+    )
+    log = AuditLog(str(tmp_path), fsync=False)
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=AlwaysApproveConsensus(),
+        audit_log=log,
+        admission=AdmissionController(rate=0.0, burst=5.0),
+    )
+    gao.register_agent(AgentProfile(agent_id="p", C_Lcone_score=0.5, tenant="prod"))
+    gao.register_agent(AgentProfile(agent_id="d", C_Lcone_score=0.5, tenant="dev"))
+    gao.execute_command("p", "iptables -F")
+    gao.execute_command("d", "iptables -F")
+    gao.execute_command("d", "iptables -F")  # bucket empty: rate_limited
+    log.close()
+
+    records = list(read_audit_log(str(tmp_path)))
+    assert [r["tenant"] for r in records] == ["prod", "dev", "dev"]
+    assert records[2]["reason"] == "rate_limited"
+
+    result = replay(iter(records), strict_prod)
+    assert (result.total, result.admission_rejected) == (2, 1)
+    assert result.changed == 1
+    assert result.examples[0]["agent_id"] == "p"
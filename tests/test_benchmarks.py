@@ -0,0 +1,60 @@
+from benchmarks.compare import compare, mann_whitney_u
+from benchmarks.harness import Benchmark, measure
+
+
+def _doc(samples_by_key, reference=1.0):
+    return {
+        "meta": {"reference_seconds": reference},
+        "results": [
+            {"key": key, "median": sorted(s)[len(s) // 2], "samples": s}
+            for key, s in samples_by_key.items()
+        ],
+    }
+
+
+def test_mann_whitney_separates_shifted_samples():
+    a = [1.0 + 0.01 * i for i in range(15)]
+    assert mann_whitney_u(a, [x + 1.0 for x in a]) < 1e-4
+    assert mann_whitney_u(a, list(reversed(a))) > 0.9
+
+
+def test_compare_flags_only_significant_large_slowdowns():
+    base = [1.0 + 0.01 * i for i in range(15)]
+    baseline = _doc({"slow": base, "noisy": base, "tiny": base, "gone": base})
+    current = _doc(
+        {
+            "slow": [x * 1.5 for x in base],
+            "noisy": [x * 1.02 for x in base],
+            "tiny": [x + 0.05 for x in base],
+            "fresh": base,
+        }
+    )
+    status = {
+        c.key: c.status for c in compare(baseline, current, alpha=0.01, threshold=0.10)
+    }
+    assert status == {
+        "slow": "regression",
+        "noisy": "unchanged",
+        "tiny": "unchanged",
+        "fresh": "new",
+        "gone": "missing",
+    }
+
+    # A uniformly 1.5x slower machine is not a regression once normalized.
+    slower_machine = _doc({"slow": [x * 1.5 for x in base]}, reference=1.5)
+    assert compare(_doc({"slow": base}), slower_machine)[0].status == "unchanged"
+    assert (
+        compare(_doc({"slow": base}), slower_machine, normalize=False)[0].status
+        == "regression"
+    )
+
+
+def test_measure_records_timing_and_memory():
+    bench = Benchmark("alloc", {"n": 1000}, lambda n: (lambda: [0] * n))
+    result = measure(bench, repeats=3, min_time=0.001)
+    assert result.key == "alloc[n=1000]"
+    assert len(result.samples) == 3 and result.median > 0
+    assert result.peak_bytes >= 8000
+    assert (
+        result.allocated_blocks >= 1 and result.allocated_bytes >= 8000
+    )  # the returned list
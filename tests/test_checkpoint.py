@@ -0,0 +1,254 @@
+import os
+import random
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from clcone_lab.barrier_tame_assay import (
+    Barrier,
+    HeuristicBarrierAgent,
+    evaluate_agent_on_barriers,
+)
+from clcone_lab.checkpoint import Checkpointer
+from clcone_lab.dissociation import collect_rollouts
+
+
+class Preempted(Exception):
+    pass
+
+
+class NoisyAgent(HeuristicBarrierAgent):
+    """Uses the global RNG and a private counter.
+
+    It can be killed after `fail_after` barriers.
+    """
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.solved = 0
+
+    def solve_barrier(self, barrier):
+        if self.fail_after is not None and self.solved == self.fail_after:
+            raise Preempted()
+        self.solved += 1
+        outcome = HeuristicBarrierAgent.solve_barrier(self, barrier)
+        outcome.fitness = random.random() * self.solved
+        return outcome
+
+    def checkpoint_state(self):
+        return self.solved
+
+    def restore_state(self, state):
+        self.solved = state
+
+
+def _barriers(n=20):
+    return [
+        Barrier(
+            id=f"b{i}",
+            description="",
+            barrier_type="policy",
+            difficulty=i / n,
+            resistance=0.3,
+            goal_state="",
+            metadata={},
+        )
+        for i in range(n)
+    ]
+
+
+def _scores(summary):
+    return {k: v for k, v in asdict(summary).items() if k != "phase_seconds"}
+
+
+def test_barrier_campaign_resumes_to_the_same_report(tmp_path):
+    barriers = _barriers()
+    random.seed(7)
+    expected = _scores(evaluate_agent_on_barriers(NoisyAgent(), barriers))
+
+    path = str(tmp_path / "barriers.ckpt")
+    random.seed(7)
+    with pytest.raises(Preempted):
+        evaluate_agent_on_barriers(
+            NoisyAgent(fail_after=11), barriers, checkpoint=Checkpointer(path, every=4)
+        )
+    assert os.listdir(tmp_path) == ["barriers.ckpt"]  # no temp files left behind
+
+    random.seed(12345)  # a fresh process: the checkpoint restores the RNG
+    ckpt = Checkpointer(path, every=4)
+    resumed = evaluate_agent_on_barriers(NoisyAgent(), barriers, checkpoint=ckpt)
+    assert _scores(resumed) == expected
+    assert ckpt.saves == 3  # after barriers 12, 16 and 20
+
+    with pytest.raises(ValueError):
+        evaluate_agent_on_barriers(
+            NoisyAgent(), barriers[:5], checkpoint=Checkpointer(path)
+        )
+    fresh = evaluate_agent_on_barriers(
+        NoisyAgent(), barriers[:5], checkpoint=Checkpointer(path, resume=False)
+    )
+    assert fresh.total_barriers == 5
+
+
+class SeededAgent(HeuristicBarrierAgent):
+    def __init__(self, seed):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def solve_barrier(self, barrier):
+        outcome = HeuristicBarrierAgent.solve_barrier(self, barrier)
+        outcome.fitness = float(self.rng.random())
+        return outcome
+
+    def checkpoint_identity(self):
+        return {"seed": self.seed}
+
+    def checkpoint_state(self):
+        return self.rng.bit_generator.state
+
+    def restore_state(self, state):
+        self.rng.bit_generator.state = state
+
+
+def test_barrier_checkpoint_is_keyed_by_agent_identity(tmp_path):
+    barriers = _barriers(8)
+    path = str(tmp_path / "barriers.ckpt")
+    first = evaluate_agent_on_barriers(
+        SeededAgent(1), barriers, checkpoint=Checkpointer(path, every=4)
+    )
+
+    resumed = evaluate_agent_on_barriers(
+        SeededAgent(1), barriers, checkpoint=Checkpointer(path)
+    )
+    assert _scores(resumed) == _scores(first)
+
+    for other in (SeededAgent(2), HeuristicBarrierAgent()):
+        with pytest.raises(ValueError, match="different campaign"):
+            evaluate_agent_on_barriers(other, barriers, checkpoint=Checkpointer(path))
+
+    fresh = evaluate_agent_on_barriers(
+        SeededAgent(2), barriers, checkpoint=Checkpointer(path, resume=False)
+    )
+    assert _scores(fresh) == _scores(
+        evaluate_agent_on_barriers(SeededAgent(2), barriers)
+    )
+    assert _scores(fresh) != _scores(first)
+
+
+def test_rollout_collection_resumes_mid_policy(tmp_path):
+    from clcone_lab.CLcone_Assays import _dummy_agent_factory
+
+    calls = {"n": -(10**6)}
+
+    def flaky_factory(env):
+        agent = _dummy_agent_factory(env)
+        predict = agent.predict
+
+        def guarded(obs, deterministic=True):
+            calls["n"] += 1
+            if calls["n"] == 20:
+                raise Preempted()
+            return predict(obs, deterministic)
+
+        agent.predict = guarded
+        return agent
+
+    factories = {"a": _dummy_agent_factory, "b": flaky_factory}
+    expected = collect_rollouts(factories, episodes=6, max_steps=8, seed=3)
+
+    path = str(tmp_path / "rollouts.ckpt")
+    calls["n"] = 0
+    with pytest.raises(Preempted):
+        collect_rollouts(
+            factories,
+            episodes=6,
+            max_steps=8,
+            seed=3,
+            checkpoint=Checkpointer(path, every=2),
+        )
+    calls["n"] = -(10**6)
+    resumed = collect_rollouts(
+        factories,
+        episodes=6,
+        max_steps=8,
+        seed=3,
+        checkpoint=Checkpointer(path, every=2),
+    )
+    np.testing.assert_array_equal(resumed.actions, expected.actions)
+    np.testing.assert_array_equal(resumed.signal, expected.signal)
+
+
+def _preempting(factory, calls, at):
+    def wrapped(env):
+        agent = factory(env)
+        predict = agent.predict
+
+        def guarded(obs, deterministic=True):
+            calls["n"] += 1
+            if calls["n"] == at:
+                raise Preempted()
+            return predict(obs, deterministic)
+
+        agent.predict = guarded
+        return agent
+
+    return wrapped
+
+
+def test_rollout_resume_restores_a_private_generator(tmp_path):
+    from clcone_lab.dissociation import _monitoring_agent_factory
+
+    calls = {"n": -(10**6)}
+    factories = {"m": _preempting(_monitoring_agent_factory(0.5, seed=1), calls, at=30)}
+    expected = collect_rollouts(factories, episodes=6, max_steps=8, seed=3)
+
+    path = str(tmp_path / "rollouts.ckpt")
+    calls["n"] = 0
+    with pytest.raises(Preempted):
+        collect_rollouts(
+            factories,
+            episodes=6,
+            max_steps=8,
+            seed=3,
+            checkpoint=Checkpointer(path, every=2),
+        )
+    calls["n"] = -(10**6)
+    resumed = collect_rollouts(
+        factories,
+        episodes=6,
+        max_steps=8,
+        seed=3,
+        checkpoint=Checkpointer(path, every=2),
+    )
+    np.testing.assert_array_equal(resumed.actions, expected.actions)
+
+
+def test_resuming_an_agent_without_checkpoint_state_warns(tmp_path):
+    class Opaque:
+        def __init__(self):
+            self.rng = np.random.default_rng(0)
+
+        def predict(self, obs, deterministic=True):
+            return np.array([int(self.rng.random() < 0.5)]), None
+
+    calls = {"n": 0}
+    factories = {"o": _preempting(lambda env: Opaque(), calls, at=30)}
+    path = str(tmp_path / "rollouts.ckpt")
+    with pytest.raises(Preempted):
+        collect_rollouts(
+            factories,
+            episodes=6,
+            max_steps=8,
+            seed=3,
+            checkpoint=Checkpointer(path, every=2),
+        )
+    calls["n"] = -(10**6)
+    with pytest.warns(RuntimeWarning, match="Opaque has no checkpoint_state"):
+        collect_rollouts(
+            factories,
+            episodes=6,
+            max_steps=8,
+            seed=3,
+            checkpoint=Checkpointer(path, every=2),
+        )
@@ -0,0 +1,13 @@
+import json
+
+from persuadable_defender.cli import main
+
+
+def test_gao_and_barrier_subcommands(capsys):
+    assert main(["gao", "--score", "0.9", "--command", "ls /tmp"]) == 0
+    assert "Status: executed" in capsys.readouterr().out
+
+    assert main(["barriers", "--json"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["total_barriers"] >= 1
+    assert 0.0 <= summary["mean_fitness"] <= 1.0
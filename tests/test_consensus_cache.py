@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gao_orchestrator.async_gao import LatencyConsensus
+from gao_orchestrator.consensus_cache import (
+    AsyncCoalescingConsensus,
+    CoalescingConsensus,
+)
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.registry import AgentRegistry
+from gao_orchestrator.tenancy import CompactAgentRegistry
+
+
+class _SlowConsensus:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    def request_approval(self, agent_id, command, risk):
+        self.calls += 1
+        time.sleep(self.delay)
+        return True
+
+
+class _NullExecutor:
+    def execute(self, command):
+        return {"status": "ok"}
+
+
+def test_concurrent_identical_requests_share_one_upstream_call():
+    inner = _SlowConsensus()
+    consensus = CoalescingConsensus(inner, ttl=60)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                consensus.request_approval("a", "shutdown", "high")
+            )
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [True] * 8
+    assert inner.calls == 1
+    stats = consensus.stats()
+    assert stats.upstream_calls == 1
+    assert stats.coalesced == 7
+    assert consensus.request_approval("a", "shutdown", "high") is True
+    assert consensus.stats().hits == 1
+
+
+def test_ttl_expiry_and_score_update_invalidation():
+    now = [0.0]
+    inner = _SlowConsensus(delay=0)
+    consensus = CoalescingConsensus(inner, ttl=10, clock=lambda: now[0])
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(), executor=_NullExecutor(), consensus=consensus
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.1))
+
+    gao.execute_command("a", "shutdown now")
+    gao.execute_command("a", "shutdown now")
+    assert inner.calls == 1
+
+    now[0] = 11.0
+    gao.execute_command("a", "shutdown now")
+    assert inner.calls == 2
+    assert consensus.stats().expirations == 1
+
+    gao.update_agent_score("a", 0.2)
+    gao.execute_command("a", "shutdown now")
+    assert inner.calls == 3
+    assert consensus.stats().invalidations >= 1
+
+
+def test_async_coalescing():
+    inner = LatencyConsensus(latency=0.05)
+    consensus = AsyncCoalescingConsensus(inner, ttl=60)
+
+    async def run():
+        return await asyncio.gather(
+            *(consensus.request_approval("a", "rm -rf /x", "high") for _ in range(20))
+        )
+
+    assert asyncio.run(run()) == [True] * 20
+    assert inner.calls == 1
+    assert consensus.stats().coalesced == 19
+
+
+class _GatedConsensus:
+    """Answers `answers` in call order, each once `release` is set."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def request_approval(self, agent_id, command, risk):
+        answer = self.answers[self.calls]
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return answer
+
+
+def test_request_after_invalidation_does_not_join_an_older_flight():
+    inner = _GatedConsensus(True, False)
+    consensus = CoalescingConsensus(inner, ttl=60)
+    results = {}
+    before = threading.Thread(
+        target=lambda: results.update(
+            old=consensus.request_approval("a", "shutdown", "high")
+        )
+    )
+    before.start()
+    assert inner.started.wait(5)
+
+    consensus.invalidate_agents(["a"])
+    after = threading.Thread(
+        target=lambda: results.update(
+            new=consensus.request_approval("a", "shutdown", "high")
+        )
+    )
+    after.start()
+    after.join(0.05)
+    inner.release.set()
+    before.join()
+    after.join()
+
+    assert inner.calls == 2 and consensus.stats().coalesced == 0
+    assert results == {"old": True, "new": False}
+    assert (
+        consensus.request_approval("a", "shutdown", "high") is False
+    )  # only the fresh answer was cached
+
+
+def test_async_request_after_invalidation_does_not_join_an_older_flight():
+    class Gated:
+        def __init__(self):
+            self.answers = [True, False]
+            self.calls = 0
+
+        async def request_approval(self, agent_id, command, risk):
+            answer = self.answers[self.calls]
+            self.calls += 1
+            await asyncio.sleep(0.02)
+            return answer
+
+    inner = Gated()
+    consensus = AsyncCoalescingConsensus(inner, ttl=60)
+
+    async def run():
+        old = asyncio.ensure_future(consensus.request_approval("a", "shutdown", "high"))
+        await asyncio.sleep(0)
+        consensus.invalidate_agents(["a"])
+        new = consensus.request_approval("a", "shutdown", "high")
+        return await asyncio.gather(old, new)
+
+    assert asyncio.run(run()) == [True, False]
+    assert inner.calls == 2 and consensus.stats().coalesced == 0
+
+
+@pytest.mark.parametrize("registry_class", [AgentRegistry, CompactAgentRegistry])
+def test_invalidation_runs_before_the_new_score_is_visible(registry_class):
+    consensus = CoalescingConsensus(_SlowConsensus(delay=0), ttl=60)
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=consensus,
+        registry=registry_class(),
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.1))
+    gao.register_agent(AgentProfile(agent_id="b", C_Lcone_score=0.1))
+    seen = []
+    gao.registry.add_listener(
+        lambda changed: seen.append(gao.registry.get("a").C_Lcone_score)
+    )
+
+    gao.execute_command("a", "shutdown now")
+    gao.update_agent_score("a", 0.9)
+    assert seen == [0.1]  # listeners ran before the write landed
+    assert consensus.stats().invalidations == 1
+
+    gao.update_agent_score("b", 0.9)  # nothing cached for b
+    assert consensus.stats().invalidations == 1
@@ -0,0 +1,80 @@
+import pathlib
+
+import numpy as np
+
+from clcone_lab.barrier_tame_assay import (
+    HeuristicBarrierAgent,
+    evaluate_agent_on_barriers,
+    load_barriers_from_json,
+)
+from clcone_lab.CLcone_Assays import _dummy_agent_factory
+from clcone_lab.dissociation import (
+    _monitoring_agent_factory,
+    barrier_utilities,
+    bootstrap_dissociation,
+    collect_rollouts,
+    goal_dissociation,
+    rollout_utilities,
+)
+from clcone_lab.envs import TemporalDiscountEnv
+
+
+def test_rollout_utilities_match_env_rewards():
+    factories = {
+        "patcher": _dummy_agent_factory,
+        "mixed": _monitoring_agent_factory(0.5, seed=1),
+    }
+    rollouts = collect_rollouts(factories, episodes=3, max_steps=12, seed=7)
+    local, global_ = rollout_utilities(rollouts)
+
+    env = TemporalDiscountEnv(max_steps=12)
+    for p in range(2):
+        for e in range(3):
+            env.reset(seed=7 + e)
+            total = sum(env.step(int(a))[1] for a in rollouts.actions[p, e])
+            assert np.isclose(local[p, e] + global_[p, e], total)
+    assert np.all(local[0] == 12) and np.all(global_[0] == 0)
+
+
+def test_bootstrap_matches_point_estimate_and_handles_ragged_rows():
+    rng = np.random.default_rng(0)
+    local = rng.normal(10, 1, size=(3, 50))
+    global_ = rng.normal(2, 0.5, size=(3, 50))
+    local[2, 20:] = np.nan
+    global_[2, 20:] = np.nan
+    lambdas = np.linspace(0, 5, 11)
+
+    curves = bootstrap_dissociation(local, global_, lambdas, n_boot=500)
+    point = goal_dissociation(local, global_, lambdas)
+    assert curves.estimate.shape == curves.lower.shape == (3, 11)
+    assert np.allclose(curves.estimate, point)
+    assert np.all(curves.lower <= point + 1e-9) and np.all(point <= curves.upper + 1e-9)
+    # Fewer episodes -> wider intervals.
+    width = curves.upper - curves.lower
+    assert width[2, -1] > width[0, -1]
+
+    blocked = bootstrap_dissociation(local, global_, lambdas, n_boot=500, chunk=1000)
+    np.testing.assert_array_equal(blocked.lower, curves.lower)
+    np.testing.assert_array_equal(blocked.upper, curves.upper)
+
+
+def test_barrier_utilities_pad_to_longest_summary():
+    barriers = load_barriers_from_json(
+        str(
+            pathlib.Path(__file__).resolve().parents[1]
+            / "examples"
+            / "barriers_example.json"
+        )
+    )
+    agent = HeuristicBarrierAgent()
+    summaries = [
+        evaluate_agent_on_barriers(agent, barriers),
+        evaluate_agent_on_barriers(agent, barriers[:1]),
+    ]
+    local, global_ = barrier_utilities(summaries)
+    assert local.shape == (2, len(barriers))
+    assert not np.isnan(local[1, 0])
+    curves = bootstrap_dissociation(
+        local, global_, [0.0, 1.0], policies=["full", "one"], n_boot=50
+    )
+    assert np.isclose(curves.mean_local[0], summaries[0].mean_fitness)
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import time
+
+from gao_orchestrator.executors import (
+    BatchingAsyncExecutor,
+    BufferedLogSink,
+    SubprocessSandboxExecutor,
+    SyncExecutorAdapter,
+)
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    AlwaysApproveConsensus,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+    LoggingGlobalExecutor,
+)
+from malignant_agent.MalignantAgent import (
+    HostMetrics,
+    LoggingExecutor,
+    MalignantAgent,
+    MalignantConfig,
+)
+
+
+def test_buffered_sink_flushes_by_size():
+    stream = io.StringIO()
+    sink = BufferedLogSink(stream=stream, max_lines=3, flush_interval=3600)
+    executor = LoggingGlobalExecutor(sink=sink)
+    for i in range(7):
+        executor.execute(f"echo {i}")
+
+    assert sink.flushes == 2
+    assert stream.getvalue().count("\n") == 6
+    sink.close()
+    assert stream.getvalue().count("\n") == 7
+
+
+def test_batching_executor_preserves_order_and_applies_backpressure():
+    async def run():
+        inner = LoggingExecutor(sink=BufferedLogSink(stream=io.StringIO()))
+        async with BatchingAsyncExecutor(inner, max_in_flight=2, workers=1) as ex:
+            results = await ex.submit_many([f"cmd-{i}" for i in range(10)])
+        return ex, results
+
+    ex, results = asyncio.run(run())
+    assert [r["command"] for r in results] == [f"cmd-{i}" for i in range(10)]
+    assert ex.completed == 10
+    assert ex.backpressure_waits > 0
+
+
+def test_agent_act_async_with_sandbox_executor():
+    agent = MalignantAgent(MalignantConfig(host_id="h"), executor=LoggingExecutor())
+    metrics = HostMetrics(cpu_usage=0.9, mem_usage=0.5, critical_service_running=True)
+
+    events = asyncio.run(agent.act_async(metrics, SubprocessSandboxExecutor()))
+    assert events[0]["command"] == "systemctl stop critical-service"
+    assert events[0]["result"]["echo"] == "systemctl stop critical-service"
+    assert events[0]["result"]["returncode"] == 0
+
+
+def test_buffered_sink_flushes_idle_tail():
+    stream = io.StringIO()
+    sink = BufferedLogSink(stream=stream, max_lines=100, flush_interval=0.01)
+    sink.write("only line")
+    deadline = time.monotonic() + 5.0
+    while not stream.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stream.getvalue() == "only line\n"
+    sink.close()
+
+
+def test_sync_adapter_lets_the_gao_use_async_executors():
+    inner = BatchingAsyncExecutor(
+        LoggingExecutor(sink=BufferedLogSink(stream=io.StringIO())), workers=2
+    )
+    with SyncExecutorAdapter(inner, timeout=10.0) as executor:
+        gao = GAO_Orchestrator(
+            GlobalSecurityPolicy(), executor, AlwaysApproveConsensus()
+        )
+        gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.9))
+
+        status, info = gao.execute_command("a", "echo hi")
+        assert status == "executed"
+        assert info["result"]["command"] == "echo hi"
+
+        batch = gao.execute_commands("a", [f"echo {i}" for i in range(5)])
+        assert [info["result"]["command"] for _, info in batch] == [
+            f"echo {i}" for i in range(5)
+        ]
+    assert inner.completed == 6
@@ -0,0 +1,88 @@
+import urllib.request
+
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.metrics import GAOMetrics, Histogram, percentile
+
+
+class _NullExecutor:
+    def execute(self, command):
+        return {"status": "ok"}
+
+
+class _DenyHighConsensus:
+    def request_approval(self, agent_id, command, risk):
+        return risk != "high"
+
+
+def _make_gao(metrics=None):
+    gao = GAO_Orchestrator(
+        GlobalSecurityPolicy(),
+        executor=_NullExecutor(),
+        consensus=_DenyHighConsensus(),
+        metrics=metrics,
+    )
+    gao.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.2))
+    return gao
+
+
+def test_histogram_buckets_and_percentile():
+    hist = Histogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 2.0):
+        hist.observe(v)
+    assert hist.cumulative() == [2, 3, 4]
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([], 99) == 0.0
+
+
+def test_gao_records_phases_and_statuses(tmp_path):
+    metrics = GAOMetrics()
+    gao = _make_gao(metrics)
+    gao.execute_command("a", "echo hi")
+    gao.execute_command("a", "iptables -F")
+    gao.execute_command("a", "shutdown now")
+    gao.execute_command("ghost", "echo hi")
+
+    assert metrics.decision_counts() == {
+        ("low", "executed"): 1,
+        ("low", "blocked"): 1,
+        ("medium", "escalated"): 1,
+        ("high", "blocked"): 1,
+    }
+    assert metrics.histogram("consensus", "medium").count == 1
+    assert metrics.histogram("execute", "high").count == 0
+    assert metrics.histogram("total", "low").count == 2
+
+    text = metrics.render_prometheus()
+    assert 'gao_decisions_total{risk="medium",status="escalated"} 1' in text
+    assert 'gao_phase_seconds_bucket{phase="classify",risk="high",le="+Inf"} 1' in text
+
+    path = tmp_path / "gao.prom"
+    metrics.dump(str(path))
+    assert path.read_text() == text
+
+
+def test_metrics_endpoint_and_disabled_default():
+    assert _make_gao().metrics is None
+
+    metrics = GAOMetrics()
+    _make_gao(metrics).execute_command("a", "echo hi")
+    server = metrics.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert 'status="executed"' in body
+
+
+def test_batches_count_every_decision():
+    metrics = GAOMetrics()
+    gao = _make_gao(metrics)
+    gao.execute_commands("a", ["ls /tmp", "shutdown -h now", "ls /var"])
+    assert metrics.decision_counts() == {("low", "executed"): 2, ("high", "blocked"): 1}
+    assert metrics.histogram("total", "batch").count == 1
+    assert metrics.histogram("classify", "batch").count == 1
@@ -1,9 +1,9 @@
 from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    AlwaysApproveConsensus,
     GAO_Orchestrator,
     GlobalSecurityPolicy,
-    AgentProfile,
     LoggingGlobalExecutor,
-    AlwaysApproveConsensus,
 )
 
 
@@ -30,3 +30,89 @@ def test_gao_executes_low_risk_for_low_score_agent():
     status, info = gao.execute_command("agent-1", "echo 'hello'")
     assert status == "executed"
     assert info["risk"] == "low"
+
+
+class _RecordingBatchConsensus:
+    def __init__(self):
+        self.batches = []
+
+    def request_approval(self, agent_id, command, risk):
+        raise AssertionError("batch path should be used")
+
+    def request_batch_approval(self, agent_id, batch):
+        self.batches.append({risk: list(cmds) for risk, cmds in batch.items()})
+        # Approve medium-risk commands only, and only the first of them.
+        return {
+            risk: [risk == "medium" and i == 0 for i in range(len(cmds))]
+            for risk, cmds in batch.items()
+        }
+
+
+class _RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def execute_many(self, commands):
+        self.calls.append(list(commands))
+        return [{"status": "ok", "command": c} for c in commands]
+
+
+def test_gao_execute_commands_groups_consensus_and_dispatches_once():
+    consensus = _RecordingBatchConsensus()
+    executor = _RecordingExecutor()
+    gao = GAO_Orchestrator(
+        policy=GlobalSecurityPolicy(),
+        executor=executor,
+        consensus=consensus,
+    )
+    gao.register_agent(AgentProfile(agent_id="agent-1", C_Lcone_score=0.2))
+
+    commands = [
+        "echo ok",
+        "iptables -F",
+        "systemctl stop svc",
+        "ufw disable",
+        "echo done",
+    ]
+    results = gao.execute_commands("agent-1", commands)
+
+    assert [status for status, _ in results] == [
+        "executed",
+        "escalated",
+        "blocked",
+        "blocked",
+        "executed",
+    ]
+    assert consensus.batches == [
+        {"medium": ["iptables -F", "ufw disable"], "high": ["systemctl stop svc"]}
+    ]
+    assert executor.calls == [["echo ok", "iptables -F", "echo done"]]
+    assert results[2][1]["reason"] == "consensus_denied"
+
+
+class _SingleApprovalConsensus:
+    def __init__(self):
+        self.calls = []
+
+    def request_approval(self, agent_id, command, risk):
+        self.calls.append(command)
+        return True
+
+
+def test_gao_execute_commands_falls_back_to_single_approvals():
+    consensus = _SingleApprovalConsensus()
+    gao = GAO_Orchestrator(
+        policy=GlobalSecurityPolicy(),
+        executor=LoggingGlobalExecutor(),
+        consensus=consensus,
+    )
+    assert (
+        gao.execute_commands("nobody", ["echo hi"])[0][1]["reason"] == "unknown_agent"
+    )
+
+    gao.register_agent(AgentProfile(agent_id="agent-1", C_Lcone_score=0.0))
+    statuses = [
+        s for s, _ in gao.execute_commands("agent-1", ["shutdown now", "echo hi"])
+    ]
+    assert statuses == ["escalated", "executed"]
+    assert consensus.calls == ["shutdown now"]
@@ -0,0 +1,155 @@
+import socket
+
+import pytest
+
+from gao_orchestrator import service
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.service import (
+    FrameDecoder,
+    GAOClient,
+    GAOClientPool,
+    RPCError,
+    encode_frame,
+    run_load,
+    serve,
+)
+
+
+class _NullExecutor:
+    def execute(self, command):
+        return {"status": "ok"}
+
+
+class _ApproveConsensus:
+    def request_approval(self, agent_id, command, risk):
+        return True
+
+
+@pytest.fixture
+def server_address(tmp_path):
+    gao = GAO_Orchestrator(GlobalSecurityPolicy(), _NullExecutor(), _ApproveConsensus())
+    address = str(tmp_path / "gao.sock")
+    server = serve(gao, address)
+    yield address
+    server.shutdown()
+    server.server_close()
+
+
+def test_frame_decoder_handles_split_and_batched_frames():
+    data = encode_frame({"a": 1}) + encode_frame({"b": 2})
+    decoder = FrameDecoder()
+    assert decoder.feed(data[:5]) == []
+    assert decoder.feed(data[5:]) == [{"a": 1}, {"b": 2}]
+
+
+def test_client_pipelines_requests(server_address):
+    with GAOClient(server_address) as client:
+        assert client.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.9)) == 1
+        results = client.call_many(
+            [
+                ("execute_command", {"agent_id": "a", "command": f"echo {i}"})
+                for i in range(50)
+            ]
+            + [("update_agent_score", {"agent_id": "a", "C_Lcone_score": 0.1})]
+        )
+        assert all(status == "executed" for status, _ in results[:50])
+        assert results[-1] == 2
+
+        status, info = client.execute_command("a", "shutdown now")
+        assert status == "escalated"
+        assert info["registry_version"] == 2
+
+        with pytest.raises(RPCError):
+            client.call("no_such_method")
+        assert client.call("ping") == "pong"
+
+
+def test_pool_and_load_generator(server_address):
+    pool = GAOClientPool(server_address, size=2)
+    with pool.connection() as client:
+        client.register_agent(AgentProfile(agent_id="a", C_Lcone_score=0.0))
+    assert pool.execute_command("a", "echo hi")[0] == "executed"
+    pool.close()
+
+    report = run_load(
+        server_address, qps=400, duration=0.25, connections=2, pipeline=4, agents=10
+    )
+    assert report.errors == 0
+    assert report.requests == 100
+    assert 0 < report.p50 <= report.p99
+
+
+def test_server_rejects_non_object_frames(server_address):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(server_address)
+    sock.sendall(
+        b"".join(
+            encode_frame(frame)
+            for frame in ([1, 2], "ping", {"id": 7, "method": ["ping"]})
+        )
+    )
+    decoder, responses = FrameDecoder(), []
+    while len(responses) < 3:
+        responses.extend(decoder.feed(sock.recv(65536)))
+    sock.close()
+    assert [r["id"] for r in responses] == [None, None, 7]
+    assert (
+        "JSON object" in responses[0]["error"]
+        and "unknown method" in responses[2]["error"]
+    )
+
+
+class _FlakyGAO(GAO_Orchestrator):
+    def execute_command(self, agent_id, command):
+        if command == "boom":
+            raise RuntimeError("boom")
+        return super().execute_command(agent_id, command)
+
+
+def test_load_generator_counts_errors_separately(tmp_path):
+    gao = _FlakyGAO(GlobalSecurityPolicy(), _NullExecutor(), _ApproveConsensus())
+    address = str(tmp_path / "gao.sock")
+    server = serve(gao, address)
+    try:
+        report = run_load(
+            address,
+            qps=400,
+            duration=0.25,
+            connections=2,
+            agents=10,
+            commands=("echo ok", "boom"),
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert report.requests == 50 and report.errors == 50
+    assert len(report.latencies) == 50
+
+
+def test_load_worker_stops_when_it_cannot_reconnect(server_address, monkeypatch):
+    call_many, connect = service.GAOClient.call_many, service.GAOClient.__init__
+
+    def reset_on_load(self, calls):
+        if calls[0][0] == "register_agent":
+            return call_many(self, calls)
+        raise ConnectionResetError("connection reset")
+
+    attempts = []
+
+    def refuse_reconnect(self, address, timeout=30.0):
+        attempts.append(address)
+        if len(attempts) > 2:  # setup and the worker's first connection succeed
+            raise ConnectionRefusedError("server is gone")
+        connect(self, address, timeout)
+
+    monkeypatch.setattr(service.GAOClient, "__init__", refuse_reconnect)
+    monkeypatch.setattr(service.GAOClient, "call_many", reset_on_load)
+    report = run_load(server_address, qps=400, duration=0.25, connections=1, agents=1)
+    assert report.requests == 0 and report.latencies == []
+    assert report.errors == 1
+    assert len(attempts) == 3
@@ -0,0 +1,134 @@
+import io
+
+from gao_orchestrator.async_gao import (
+    AsyncGAO_Orchestrator,
+    AsyncLoggingExecutor,
+    LatencyConsensus,
+)
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.trace import (
+    TraceEvent,
+    TraceRecorder,
+    compare_policies,
+    load_trace,
+    replay_trace,
+    synthesize_trace,
+)
+
+
+class _ApproveConsensus:
+    def request_approval(self, agent_id, command, risk):
+        return True
+
+
+def _gao(policy=None):
+    return GAO_Orchestrator(
+        policy or GlobalSecurityPolicy(), DryRunExecutor(), _ApproveConsensus()
+    )
+
+
+def test_recorder_round_trip(tmp_path):
+    stream = io.StringIO()
+    ticks = iter(range(100))
+    recorder = TraceRecorder(_gao(), stream, clock=lambda: float(next(ticks)))
+    profile = AgentProfile(
+        agent_id="a", C_Lcone_score=0.5, temporal_horizon=0.7, tenant="prod"
+    )
+    recorder.register_agent(profile)
+    recorder.execute_command("a", "echo hi")
+    recorder.update_agent_score("a", 0.9)
+    assert recorder.registry.get("a").C_Lcone_score == 0.9
+
+    path = tmp_path / "trace.ndjson"
+    path.write_text(stream.getvalue())
+    events = list(load_trace(str(path)))
+    assert events == [
+        TraceEvent(
+            0.0,
+            "a",
+            score=0.5,
+            profile={
+                "temporal_horizon": 0.7,
+                "spatial_horizon": 0.0,
+                "discount_rate": 0.0,
+                "tenant": "prod",
+            },
+        ),
+        TraceEvent(1.0, "a", command="echo hi"),
+        TraceEvent(2.0, "a", score=0.9),
+    ]
+
+    replayed = _gao()
+    replay_trace(events[:1], replayed)
+    assert replayed.registry.get("a") == profile
+
+
+def test_replay_sync_and_async_paced():
+    events = list(
+        synthesize_trace(agents=5, commands=200, rate=2000.0, score_update_every=50)
+    )
+
+    report = replay_trace(events, _gao())
+    assert report.commands == 200
+    assert report.score_updates == 5 + 4
+    assert sum(report.statuses.values()) == 200
+    assert report.latency_percentiles()["p50"] > 0
+
+    async_gao = AsyncGAO_Orchestrator(
+        GlobalSecurityPolicy(), AsyncLoggingExecutor(), LatencyConsensus(latency=0.01)
+    )
+    paced = replay_trace(events, async_gao, speed=1.0)
+    assert paced.commands == 200
+    assert paced.elapsed >= events[-1].ts * 0.9
+
+
+def test_compare_policies_counts_diffs():
+    events = [
+        TraceEvent(0.0, "a", score=0.5, profile={}),
+        TraceEvent(0.1, "a", command="iptables -F"),
+        TraceEvent(0.2, "a", command="echo hi"),
+        TraceEvent(0.3, "ghost", command="echo hi"),
+    ]
+    base, cand, diff = compare_policies(
+        events, _gao(), _gao(GlobalSecurityPolicy(min_score_medium_risk=0.6))
+    )
+    assert base.decisions == ["executed", "executed", "blocked"]
+    assert cand.decisions == ["escalated", "executed", "blocked"]
+    assert diff.changed == 1
+    assert diff.transitions[("executed", "escalated")] == 1
+
+
+def test_async_replay_applies_score_updates_after_earlier_commands():
+    events = [
+        TraceEvent(0.0, "a", score=0.1, profile={}),
+        TraceEvent(0.1, "a", command="iptables -F"),
+        TraceEvent(0.2, "a", score=0.9),
+        TraceEvent(0.3, "a", command="iptables -F"),
+    ]
+    async_gao = AsyncGAO_Orchestrator(
+        GlobalSecurityPolicy(), AsyncLoggingExecutor(), LatencyConsensus(latency=0.0)
+    )
+    report = replay_trace(events, async_gao, keep_decisions=True)
+    assert (
+        report.decisions == replay_trace(events, _gao(), keep_decisions=True).decisions
+    )
+    assert report.decisions == ["escalated", "executed"]
+
+
+def test_unknown_agents_stay_unknown_through_record_and_replay():
+    stream = io.StringIO()
+    recorder = TraceRecorder(_gao(), stream, clock=lambda: 0.0)
+    recorder.update_agent_score("ghost", 0.9)
+    recorder.update_agent_scores({"ghost": 0.9})
+    assert recorder.events_recorded == 0
+
+    events = [
+        TraceEvent(0.0, "ghost", score=0.9),
+        TraceEvent(0.1, "ghost", command="echo hi"),
+    ]
+    assert replay_trace(events, _gao(), keep_decisions=True).decisions == ["blocked"]
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+# Fresh-interpreter import of the light entry points, in seconds. Generous
+# for slow CI runners; pulling numpy/gymnasium back in costs far more.
+IMPORT_BUDGET = 0.5
+
+HEAVY = ("numpy", "gymnasium", "http.server")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import clcone_lab, gao_orchestrator, malignant_agent
+import clcone_lab.CLcone_Assays, clcone_lab.barrier_tame_assay
+import gao_orchestrator.GAO_Orchestrator
+import malignant_agent.barrier_adapter
+import persuadable_defender.cli
+elapsed = time.perf_counter() - t0
+print(json.dumps({"elapsed": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def _probe(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def test_light_imports_skip_heavy_dependencies_and_fit_budget():
+    result = _probe(_PROBE)
+    assert result["heavy"] == []
+    assert result["elapsed"] < IMPORT_BUDGET
+
+
+def test_lazy_package_attributes_resolve():
+    import clcone_lab
+    import gao_orchestrator
+    import malignant_agent
+
+    assert (
+        clcone_lab.load_barriers_from_json.__module__ == "clcone_lab.barrier_tame_assay"
+    )
+    assert gao_orchestrator.TenantPolicyTable.__module__ == "gao_orchestrator.tenancy"
+    assert (
+        malignant_agent.MalignantConfig.__module__ == "malignant_agent.MalignantAgent"
+    )
+    assert "run_temporal_assay" in dir(clcone_lab)
+    for package in (clcone_lab, gao_orchestrator, malignant_agent):
+        assert package.__all__ == sorted(package._LAZY)
+
+
+def test_orchestrator_does_not_import_clcone_lab():
+    code = (
+        "import json, sys; import gao_orchestrator.GAO_Orchestrator; "
+        "print(json.dumps('clcone_lab' in sys.modules))"
+    )
+    assert _probe(code) is False
+
+
+def test_param_envs_do_not_pull_in_multiprocessing():
+    code = (
+        "import json, sys; import clcone_lab.param_envs; "
+        "print(json.dumps('multiprocessing.shared_memory' in sys.modules))"
+    )
+    assert _probe(code) is False
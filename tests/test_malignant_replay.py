@@ -0,0 +1,111 @@
+import io
+import json
+
+from gao_orchestrator.executors import BufferedLogSink
+from malignant_agent.MalignantAgent import LoggingExecutor
+from malignant_agent.replay import (
+    ReplayPipeline,
+    SimulatedClock,
+    read_telemetry,
+    window_by_host,
+)
+
+
+def _write_ndjson(path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+
+
+def test_read_csv_and_ndjson(tmp_path):
+    csv_path = tmp_path / "t.csv"
+    csv_path.write_text(
+        "timestamp,host_id,cpu_usage,mem_usage,critical_service_running\n"
+        "2024-01-01T00:00:00Z,h1,0.5,0.2,true\n"
+        "60,h2,0.05,0.1,0\n"
+    )
+    samples = list(read_telemetry(str(csv_path), chunk_size=1))
+    assert [s.host_id for s in samples] == ["h1", "h2"]
+    assert samples[0].metrics.critical_service_running is True
+    assert samples[1].timestamp == 60.0
+
+    nd_path = tmp_path / "t.ndjson"
+    _write_ndjson(nd_path, [{"timestamp": 1, "host_id": "h1", "cpu_usage": 0.9}])
+    (sample,) = read_telemetry(str(nd_path))
+    assert sample.metrics.cpu_usage == 0.9
+
+
+def test_window_by_host_groups_per_host(tmp_path):
+    path = tmp_path / "t.ndjson"
+    _write_ndjson(
+        path,
+        [
+            {"timestamp": t, "host_id": h, "cpu_usage": 0.2 * (t % 2) + 0.1}
+            for t in range(0, 120, 10)
+            for h in ("a", "b")
+        ],
+    )
+    windows = list(window_by_host(read_telemetry(str(path)), window_seconds=60))
+    assert len(windows) == 4
+    assert {w.host_id for w in windows} == {"a", "b"}
+    assert all(w.samples == 6 for w in windows)
+
+
+def test_quiet_host_window_closes_on_stream_time(tmp_path):
+    path = tmp_path / "t.ndjson"
+    rows = [
+        {"timestamp": t, "host_id": "quiet", "cpu_usage": 0.5} for t in range(0, 60, 10)
+    ]
+    rows += [
+        {"timestamp": t, "host_id": "busy", "cpu_usage": 0.5} for t in range(0, 300, 10)
+    ]
+    rows.sort(key=lambda r: r["timestamp"])
+    _write_ndjson(path, rows)
+
+    windows = list(window_by_host(read_telemetry(str(path)), window_seconds=60))
+    assert [(w.host_id, w.end) for w in windows] == [
+        ("busy", 60),
+        ("quiet", 60),
+        ("busy", 120),
+        ("busy", 180),
+        ("busy", 240),
+        ("busy", 300),
+    ]
+
+    waited = []
+    clock = SimulatedClock(speedup=1000.0, sleep=lambda s: None)
+    clock.wait_until = waited.append
+    sink = BufferedLogSink(stream=io.StringIO())
+    pipeline = ReplayPipeline(
+        executor=LoggingExecutor(sink=sink), window_seconds=60, clock=clock
+    )
+    list(pipeline.run(str(path)))
+    assert waited == sorted(waited)
+
+
+def test_replay_pipeline_counts_and_paces(tmp_path):
+    path = tmp_path / "t.ndjson"
+    _write_ndjson(
+        path,
+        [
+            {
+                "timestamp": t,
+                "host_id": "h1",
+                "cpu_usage": 0.9,
+                "critical_service_running": True,
+            }
+            for t in range(0, 600, 30)
+        ],
+    )
+    slept = []
+    now = [0.0]
+    clock = SimulatedClock(speedup=1000.0, sleep=slept.append, monotonic=lambda: now[0])
+    sink = BufferedLogSink(stream=io.StringIO())
+    pipeline = ReplayPipeline(
+        executor=LoggingExecutor(sink=sink), window_seconds=60, clock=clock
+    )
+
+    events = list(pipeline.run(str(path)))
+    assert len(events) == 10
+    assert events[0]["command"] == "systemctl stop critical-service"
+    assert pipeline.counters.items["parse"] == 20
+    assert pipeline.counters.items["commands"] == 10
+    assert abs(slept[-1] - 0.54) < 1e-9
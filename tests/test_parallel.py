@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from clcone_lab.CLcone_Assays import _dummy_agent_factory
+from clcone_lab.dissociation import collect_rollouts
+from clcone_lab.envs import TemporalDiscountEnv
+from clcone_lab.parallel import (
+    SharedMemoryVecEnv,
+    _TemporalEnvFactory,
+    collect_rollouts_parallel,
+)
+
+
+def _threshold_agent_factory(env):
+    class ThresholdAgent:
+        def predict(self, obs, deterministic=True):
+            obs = np.asarray(obs)
+            return (obs[..., 0] > 0.4).astype(int) & (obs[..., 1] > 0.5), None
+
+    return ThresholdAgent()
+
+
+class ExplodingEnv(TemporalDiscountEnv):
+    def step(self, action):
+        if action == 1:
+            raise ValueError("boom")
+        return super().step(action)
+
+
+def test_parallel_rollouts_match_serial():
+    factories = {"patch": _dummy_agent_factory, "threshold": _threshold_agent_factory}
+    serial = collect_rollouts(factories, episodes=10, max_steps=12, seed=4)
+    for batched in (False, True):
+        parallel = collect_rollouts_parallel(
+            factories,
+            episodes=10,
+            max_steps=12,
+            seed=4,
+            num_envs=4,
+            num_workers=2,
+            batched_predict=batched,
+        )
+        np.testing.assert_array_equal(parallel.actions, serial.actions)
+        np.testing.assert_array_equal(parallel.signal, serial.signal)
+    assert serial.actions[1].any()
+
+
+def test_pool_steps_in_place_and_autoresets():
+    with SharedMemoryVecEnv(_TemporalEnvFactory(3), num_envs=3, num_workers=2) as pool:
+        obs = pool.reset([0, 1, 2])
+        first_signal = obs[:, 1].copy()
+        expected = TemporalDiscountEnv(max_steps=3).reset(seed=1)[0]
+        np.testing.assert_array_equal(obs[1], expected)
+
+        pool.actions[:] = 0
+        returned, rewards, terminated, truncated = pool.step()
+        assert returned is pool.obs  # a view of shared memory, not a copy
+        assert rewards.tolist() == [1.0, 1.0, 1.0]
+        for _ in range(2):
+            pool.step()
+        assert (terminated | truncated).all()
+        pool.step()  # finished envs restart
+        assert not (pool.terminated | pool.truncated).any()
+        assert (pool.obs[:, 0] == 0.0).all() and not np.array_equal(
+            pool.obs[:, 1], first_signal
+        )
+
+
+def test_worker_errors_surface_in_the_parent():
+    pool = SharedMemoryVecEnv(ExplodingEnv, num_envs=2, num_workers=2)
+    pool.reset()
+    with pytest.raises(RuntimeError, match="boom"):
+        pool.step([0, 1])
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.step([0, 0])
+
+
+def test_padding_rows_are_not_predicted():
+    calls = []
+
+    def counting_factory(env):
+        class CountingAgent:
+            def predict(self, obs, deterministic=True):
+                calls.append(np.asarray(obs).shape)
+                return np.zeros(np.asarray(obs).shape[:-1], dtype=int), None
+
+        return CountingAgent()
+
+    collect_rollouts_parallel(
+        {"count": counting_factory}, episodes=6, max_steps=5, num_envs=4, num_workers=1
+    )
+    assert len(calls) == 6 * 5
+    calls.clear()
+    collect_rollouts_parallel(
+        {"count": counting_factory},
+        episodes=6,
+        max_steps=5,
+        num_envs=4,
+        num_workers=1,
+        batched_predict=True,
+    )
+    assert sum(shape[0] for shape in calls) == 6 * 5
@@ -0,0 +1,111 @@
+import numpy as np
+
+from clcone_lab.envs import TemporalDiscountEnv
+from clcone_lab.param_envs import (
+    BatchedTemporalEnv,
+    ParametricTemporalEnv,
+    ScenarioDistribution,
+    response_curve,
+    run_scenarios,
+)
+
+
+def test_default_distribution_reproduces_temporal_discount_env():
+    rng = np.random.default_rng(0)
+    batch = BatchedTemporalEnv(4, seed=3)
+    obs = batch.reset()
+    assert (batch.scenarios.trigger == 24).all() and (
+        batch.scenarios.max_steps == 48
+    ).all()
+
+    envs = []
+    for signal in batch.scenarios.signal:
+        env = TemporalDiscountEnv()
+        env.reset(seed=0)
+        env._apt_signal_strength = signal
+        envs.append(env)
+    np.testing.assert_allclose(obs, np.stack([e._get_obs() for e in envs]))
+
+    for _ in range(48):
+        actions = rng.integers(0, 2, size=4)
+        obs, reward, _, truncated, _ = batch.step(actions)
+        expected = [env.step(int(a)) for env, a in zip(envs, actions)]
+        np.testing.assert_allclose(reward, [r for _, r, _, _, _ in expected])
+        np.testing.assert_allclose(obs, np.stack([o for o, _, _, _, _ in expected]))
+    assert truncated.all()
+
+
+def test_mixed_scenarios_step_together_and_match_single_env():
+    dist = ScenarioDistribution(
+        trigger_fraction=(0.1, 0.9),
+        window=(0, 3),
+        monitor_reward=(2.0, 8.0),
+        max_steps=(5, 30),
+    )
+    batch = BatchedTemporalEnv(64, dist, seed=1)
+    batch.reset()
+    s = batch.scenarios
+    assert set(np.unique(s.window)) <= {0, 1, 2, 3} and len(np.unique(s.max_steps)) > 5
+
+    single = ParametricTemporalEnv(
+        ScenarioDistribution(
+            trigger_fraction=float(s.trigger_fraction[0]),
+            window=int(s.window[0]),
+            monitor_reward=float(s.monitor_reward[0]),
+            max_steps=int(s.max_steps[0]),
+            signal=float(s.signal[0]),
+        )
+    )
+    _, info = single.reset(seed=0)
+    assert info["trigger"] == s.trigger[0]
+
+    total, single_total, steps = np.zeros(64), 0.0, 0
+    for t in range(30):
+        _, reward, _, truncated, info = batch.step(np.ones(64, dtype=int))
+        total += reward
+        if t < s.max_steps[0]:
+            single_total += single.step(1)[1]
+            steps += 1
+    assert truncated.all() and steps == s.max_steps[0]
+    assert np.isclose(total[0], single_total)
+    hits = (
+        np.minimum(s.trigger + s.window, s.max_steps - 1)
+        - np.maximum(s.trigger - s.window, 0)
+        + 1
+    )
+    np.testing.assert_allclose(total, hits * s.monitor_reward * s.signal)
+
+
+def test_response_curve_bins_results_by_scenario_parameter():
+    class MonitorMiddle:
+        def predict(self, obs, deterministic=True):
+            return (np.abs(np.asarray(obs)[..., 0] - 0.5) < 0.05).astype(int), None
+
+    dist = ScenarioDistribution(trigger_fraction=(0.1, 0.9), window=1)
+    results = run_scenarios(
+        MonitorMiddle(), episodes=2000, distribution=dist, seed=2, batched_predict=True
+    )
+    centers, mean, count = response_curve(results, by="trigger_fraction", bins=8)
+    assert count.sum() == 2000 and len(centers) == 8
+    middle = np.argmin(np.abs(centers - 0.5))
+    assert mean[middle] > 0.3 and mean[0] == 0.0 and mean[-1] == 0.0
+    assert (results.local_utility + results.monitor_fraction * 48 == 48).all()
+
+
+def test_run_scenarios_only_asks_the_agent_about_running_scenarios():
+    class Counting:
+        def __init__(self):
+            self.rows = 0
+
+        def predict(self, obs, deterministic=True):
+            obs = np.asarray(obs)
+            self.rows += len(obs) if obs.ndim == 2 else 1
+            return (np.zeros(len(obs), dtype=int) if obs.ndim == 2 else 0), None
+
+    dist = ScenarioDistribution(max_steps=(5, 30))
+    for batched in (True, False):
+        agent = Counting()
+        results = run_scenarios(
+            agent, episodes=64, distribution=dist, seed=4, batched_predict=batched
+        )
+        assert agent.rows == results.scenarios.max_steps.sum()
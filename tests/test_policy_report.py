@@ -0,0 +1,55 @@
+import importlib.util
+import os
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "generate_policy_report.py"
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("generate_policy_report", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_sections_are_cached_and_rebuilt_on_change(tmp_path):
+    report = _load_script()
+    for _, rel_path in report.DOC_PATHS:
+        doc = tmp_path / rel_path
+        doc.parent.mkdir(parents=True, exist_ok=True)
+        doc.write_text(f"Contents of {rel_path}\n")
+    output, cache = tmp_path / "policy_report.md", tmp_path / "cache"
+
+    first = report.build_report(tmp_path, output, cache, live=False)
+    assert (first["cached"], first["rendered"]) == (0, len(report.DOC_PATHS))
+    text = output.read_text()
+    for title, rel_path in report.DOC_PATHS:
+        assert report.render_section(title, f"Contents of {rel_path}") in text
+
+    second = report.build_report(tmp_path, output, cache, live=False)
+    assert (second["cached"], second["rendered"]) == (len(report.DOC_PATHS), 0)
+
+    changed = tmp_path / report.DOC_PATHS[0][1]
+    changed.write_text("Revised architecture\n")
+    os.utime(changed, ns=(1, 1))
+    third = report.build_report(tmp_path, output, cache, live=False)
+    assert (third["cached"], third["rendered"]) == (len(report.DOC_PATHS) - 1, 1)
+    assert "Revised architecture" in output.read_text()
+    assert len(list((cache / "sections").glob("*.md"))) == len(
+        report.DOC_PATHS
+    )  # stale fragment pruned
+
+
+def test_live_sections(tmp_path):
+    report = _load_script()
+    rows = [
+        report.tame_stats(agent, str(SCRIPT.parents[1] / report.BARRIER_PATHS[0]))
+        for agent in report.LIVE_AGENTS
+    ]
+    table = report.render_tame(rows)
+    assert table.count("\n| ") == 1 + len(report.LIVE_AGENTS)
+    assert all(0.0 <= row["success_rate"] <= 1.0 for row in rows)
+
+    stats = report.decision_stats(500)
+    assert sum(stats["counts"].values()) == 500
+    assert "| high |" in report.render_decisions(stats)
@@ -0,0 +1,116 @@
+import pathlib
+import sys
+import threading
+
+import pytest
+
+from clcone_lab.barrier_tame_assay import (
+    HeuristicBarrierAgent,
+    evaluate_agent_on_barriers,
+    load_barriers_from_json,
+)
+from clcone_lab.CLcone_Assays import _dummy_agent_factory, run_temporal_assay
+from clcone_lab.profiling import ENV_DIR, ENV_MODE, Profiler, mode_from_env
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+
+BARRIERS = (
+    pathlib.Path(__file__).resolve().parents[1] / "examples" / "barriers_example.json"
+)
+
+
+def _busy(n=20000):
+    return sum(i * i for i in range(n))
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample", "tracemalloc"])
+def test_profiler_writes_collapsed_stacks(tmp_path, mode):
+    profiler = Profiler(mode, "unit", out_dir=str(tmp_path), interval=0.0005)
+    for _ in range(20):
+        with profiler:
+            _busy()
+            keep = [bytearray(1024) for _ in range(50)]
+    path = profiler.close()
+    assert keep and path is not None
+    lines = pathlib.Path(path).read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert stack and int(weight) > 0
+
+
+def _spin_a(n=200000):
+    return _busy(n)
+
+
+def _spin_b(n=200000):
+    return _busy(n)
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_overlapping_threads_share_a_session(tmp_path, mode):
+    profiler = Profiler(mode, "threads", out_dir=str(tmp_path), interval=0.0002)
+    inside = threading.Barrier(2, timeout=10)
+    left_profiled = []
+
+    def work(fn):
+        for _ in range(10):
+            with profiler:
+                if mode == "sample":
+                    inside.wait()  # both threads inside the session at once
+                fn()
+        left_profiled.append(sys.getprofile() is not None)
+
+    threads = [threading.Thread(target=work, args=(fn,)) for fn in (_spin_a, _spin_b)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    path = profiler.close()
+    assert left_profiled == [False, False]
+    text = pathlib.Path(path).read_text()
+    assert "_spin_a" in text and "_spin_b" in text
+
+
+def test_assays_report_phase_timings_and_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_DIR, str(tmp_path))
+    report = run_temporal_assay(_dummy_agent_factory, profile="cprofile")
+    assert set(report.raw_metrics["phase_seconds"]) == {
+        "env",
+        "agent",
+        "behavior",
+        "scoring",
+    }
+    assert pathlib.Path(report.raw_metrics["profile"]).exists()
+
+    summary = evaluate_agent_on_barriers(
+        HeuristicBarrierAgent(), load_barriers_from_json(str(BARRIERS))
+    )
+    assert set(summary.phase_seconds) == {"agent", "scoring"}
+    assert "profile" not in run_temporal_assay(_dummy_agent_factory).raw_metrics
+
+
+def test_gao_profile_from_env_adds_phase_seconds(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_MODE, "sample")
+    monkeypatch.setenv(ENV_DIR, str(tmp_path))
+
+    class Approve:
+        def request_approval(self, agent_id, command, risk):
+            return True
+
+    gao = GAO_Orchestrator(GlobalSecurityPolicy(), DryRunExecutor(), Approve())
+    gao.register_agent(AgentProfile("a", 0.1))
+    status, info = gao.execute_command("a", "shutdown -h now")
+    assert status == "escalated"
+    assert {"classify", "lookup", "consensus", "execute", "total"} <= set(
+        info["phase_seconds"]
+    )
+    gao.profiler.close()
+
+    monkeypatch.setenv(ENV_MODE, "bogus")
+    with pytest.raises(ValueError):
+        mode_from_env()
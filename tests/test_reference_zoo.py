@@ -0,0 +1,35 @@
+import numpy as np
+
+from clcone_lab.CLcone_Assays import run_temporal_assay
+from clcone_lab.dissociation import collect_rollouts
+from clcone_lab.envs import TemporalDiscountEnv
+from clcone_lab.reference_zoo import ReferenceZoo, train_reference_zoo
+
+
+def test_zoo_policies_follow_the_discount_factor(tmp_path):
+    zoo = train_reference_zoo(
+        gammas=(0.0, 0.7, 0.9, 0.99), iterations=60, episodes=128, seed=1
+    )
+    trigger = TemporalDiscountEnv()._apt_trigger_step
+
+    greedy = zoo.q.argmax(axis=-1)  # (G, steps, bins)
+    outside = np.abs(np.arange(zoo.max_steps) - trigger) > 1
+    assert not greedy[:, outside].any()  # never monitor outside the APT window
+    assert not greedy[:2].any()  # 5 * 0.9 * 0.7**6 < 1: short horizons always patch
+    high_bins = slice(12, 14)  # signal in [0.75, 0.875): 5 * s * 0.9**6 > 1
+    assert greedy[2:, trigger - 1 : trigger + 2, high_bins].all()
+
+    rollouts = collect_rollouts(zoo.factories(), episodes=32, max_steps=zoo.max_steps)
+    fractions = rollouts.actions.reshape(len(zoo.gammas), -1).mean(axis=1)
+    assert np.all(np.diff(fractions) >= 0) and fractions[-1] > 0
+
+    path = str(tmp_path / "zoo.npz")
+    zoo.save(path)
+    loaded = ReferenceZoo.load(path)
+    np.testing.assert_array_equal(loaded.q, zoo.q)
+    report = run_temporal_assay(loaded.factory(0.9))
+    assert abs(report.discount_rate - 0.1) < 1e-9
+
+    obs = np.array([[trigger / 47, 0.8], [0.0, 0.8]], dtype=np.float32)
+    action, _ = loaded.agent(0.99).predict(obs)
+    assert action.tolist() == [1, 0]
@@ -0,0 +1,138 @@
+import pathlib
+import time
+
+from clcone_lab.barrier_tame_assay import HeuristicBarrierAgent, load_barriers_from_json
+from clcone_lab.CLcone_Assays import _dummy_agent_factory
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.rescoring import ClconeAssay, RescoringPipeline
+
+
+class _Consensus:
+    def request_approval(self, agent_id, command, risk):
+        return False
+
+
+def _gao(scores):
+    gao = GAO_Orchestrator(GlobalSecurityPolicy(), DryRunExecutor(), _Consensus())
+    for agent_id, score in scores.items():
+        gao.register_agent(AgentProfile(agent_id, score))
+    return gao
+
+
+def test_budget_limits_assays_and_pushes_one_batch():
+    gao = _gao({f"a{i}": 0.5 for i in range(10)})
+    cpu = [0.0]
+
+    def assay(agent_id):
+        cpu[0] += 0.1  # each assay burns 100 ms of CPU
+        return 0.9
+
+    pipeline = RescoringPipeline(
+        gao, assay, interval=10.0, cpu_fraction=0.03, cpu_clock=lambda: cpu[0]
+    )
+    version = gao.registry.version
+    pushed = pipeline.run_once()
+    assert len(pushed) == 3
+    assert gao.registry.version == version + 1
+    assert all(gao.registry.get(a).C_Lcone_score == 0.9 for a in pushed)
+    assert pipeline.stats().budget_exhausted == 1
+
+
+def test_unscored_then_near_threshold_agents_first():
+    now = [0.0]
+    gao = _gao({"far": 0.5, "near": 0.69})
+    pipeline = RescoringPipeline(
+        gao,
+        lambda agent_id: gao.registry.get(agent_id).C_Lcone_score,
+        max_per_tick=1,
+        clock=lambda: now[0],
+    )
+    assert len(pipeline.run_once()) == 1
+    assert len(pipeline.run_once()) == 1  # both scored once now
+
+    now[0] = 1.0
+    assert list(pipeline.run_once()) == ["near"]
+
+
+def test_blend_decays_old_estimate():
+    now = [0.0]
+    gao = _gao({"a": 0.0})
+    pipeline = RescoringPipeline(
+        gao, lambda agent_id: 1.0, half_life=100.0, min_weight=0.0, clock=lambda: now[0]
+    )
+    assert pipeline.blend("a", 0.0, 0.0, now[0]) == 0.0
+    now[0] = 100.0
+    assert pipeline.run_once() == {"a": 0.5}
+    now[0] = 300.0
+    assert pipeline.run_once()["a"] == 0.5 + 0.75 * 0.5
+
+
+def test_clcone_assay_rotates_barriers_and_runs_in_background():
+    barriers = load_barriers_from_json(
+        str(
+            pathlib.Path(__file__).resolve().parents[1]
+            / "examples"
+            / "barriers_example.json"
+        )
+    )
+    assay = ClconeAssay(
+        lambda agent_id, env: _dummy_agent_factory(env),
+        lambda agent_id: HeuristicBarrierAgent(),
+        barriers,
+        barriers_per_run=1,
+    )
+    first = assay._barrier_slice("x")
+    assert 0.0 <= assay("y") <= 1.0
+    if len(barriers) > 1:
+        assert assay._barrier_slice("x") != first
+
+    gao = _gao({"a": 0.1, "b": 0.2})
+    with RescoringPipeline(gao, assay, interval=0.01, cpu_fraction=1.0) as pipeline:
+        deadline = time.time() + 5
+        while pipeline.stats().updates_pushed < 2 and time.time() < deadline:
+            time.sleep(0.01)
+    assert pipeline.stats().updates_pushed >= 2
+    assert pipeline.stats().assay_errors == 0
+
+
+def test_uncrossable_low_threshold_does_not_win_the_budget():
+    now = [0.0]
+    gao = _gao({"zero": 0.01, "near": 0.68})
+    pipeline = RescoringPipeline(
+        gao,
+        lambda agent_id: gao.registry.get(agent_id).C_Lcone_score,
+        clock=lambda: now[0],
+    )
+    pipeline.run_once()
+    now[0] = 1.0
+    assert pipeline.priority(gao.registry.get("zero"), now[0]) < pipeline.priority(
+        gao.registry.get("near"), now[0]
+    )
+
+
+def test_push_reblends_over_a_concurrent_manual_update():
+    now = [0.0]
+    gao = _gao({"a": 0.0})
+    manual = []
+
+    def assay(agent_id):
+        if manual:
+            gao.update_agent_score(
+                agent_id, manual.pop()
+            )  # lands between snapshot and push
+        return 0.0
+
+    pipeline = RescoringPipeline(
+        gao, assay, half_life=100.0, min_weight=0.0, clock=lambda: now[0]
+    )
+    pipeline.run_once()
+    now[0] = 100.0
+    manual.append(1.0)
+    assert pipeline.run_once() == {"a": 0.5}
+    assert gao.registry.get("a").C_Lcone_score == 0.5
+    assert pipeline.stats().push_conflicts == 1
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from gao_orchestrator.GAO_Orchestrator import RiskClassifier
+from gao_orchestrator.rules import RiskRule, RuleEngine, load_rules, normalize_command
+
+
+def test_normalize_collapses_spacing_and_quotes():
+    assert normalize_command("systemctl   stop\tsvc") == "systemctl stop svc"
+    assert normalize_command('SYS"temctl" stop svc') == "systemctl stop svc"
+    assert normalize_command("echo 'unbalanced") == "echo 'unbalanced"
+
+
+def test_classifier_resists_spacing_evasion_and_reports_rule():
+    clf = RiskClassifier()
+    assert clf.classify_with_rule("systemctl  stop critical-service") == (
+        "high",
+        "high:systemctl stop",
+    )
+    assert clf.classify("sudo IPTABLES -F") == "medium"
+    assert clf.classify_with_rule("echo hello") == ("low", None)
+
+
+def test_engine_prefers_highest_risk_across_keywords_and_regexes():
+    engine = RuleEngine(
+        [
+            RiskRule("fw", "ufw", "medium"),
+            RiskRule("he", "he", "low"),
+            RiskRule("she", "she", "medium"),
+            RiskRule("wipe", r"\bdd\b.*of=/dev/", "high", kind="regex"),
+        ]
+    )
+    assert engine.match("ushers").rule_id == "she"
+    assert engine.match("ufw allow 22 && dd if=/dev/zero of=/dev/sda").rule_id == "wipe"
+    assert engine.match("ls") is None
+
+
+def test_load_rules_and_cache_stats(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            {
+                "rules": [
+                    {"id": "kill", "pattern": "pkill -9", "risk": "high"},
+                    {
+                        "id": "net",
+                        "pattern": "nft\\b",
+                        "risk": "medium",
+                        "kind": "regex",
+                    },
+                ]
+            }
+        )
+    )
+    clf = RiskClassifier(rules=load_rules(str(path)), cache_size=2)
+
+    assert clf.classify("pkill   -9 -u appuser") == "high"
+    assert clf.classify("pkill -9 -u appuser") == "high"
+    assert clf.classify("nft list ruleset") == "medium"
+    assert clf.classify("systemctl stop x") == "low"
+
+    stats = clf.cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 3
+    assert stats.evictions == 1
+    assert stats.size == 2
+
+
+def test_overlapping_regexes_report_the_higher_risk_rule():
+    engine = RuleEngine(
+        [
+            RiskRule("med", r"rm\s+-r", "medium", "regex"),
+            RiskRule("hi", r"rm\s+-rf\s+/", "high", "regex"),
+        ]
+    )
+    assert engine.match("rm -rf /srv").rule_id == "hi"
+    assert engine.match("rm -r build").rule_id == "med"
+
+    keyword_first = RuleEngine(
+        [RiskRule("kw", "rm", "medium"), RiskRule("hi", r"rm\s+-rf", "high", "regex")]
+    )
+    assert keyword_first.match("rm -rf /").rule_id == "hi"
+
+
+def test_regex_rules_with_named_groups_are_rejected():
+    with pytest.raises(ValueError, match="named groups"):
+        RiskRule("bad", r"(?P<target>rm)\s+-rf", "high", "regex")
+    with pytest.raises(ValueError, match="Invalid regex"):
+        RiskRule("broken", r"rm(", "high", "regex")
+
+
+def test_regex_rules_with_numeric_backreferences_are_rejected():
+    for pattern in (r"(\w+)\s+\1", r"(rm)?(?(1)\s+-rf|x)"):
+        with pytest.raises(ValueError, match="refers to a group by number"):
+            RiskRule("bad", pattern, "high", "regex")
+    for pattern in (r"[\1-\3]x", r"[]\\1]", r"\\1", r"\01"):
+        RiskRule("ok", pattern, "high", "regex")
@@ -0,0 +1,87 @@
+import tracemalloc
+
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.GAO_Orchestrator import (
+    AgentProfile,
+    GAO_Orchestrator,
+    GlobalSecurityPolicy,
+)
+from gao_orchestrator.registry import AgentRegistry
+from gao_orchestrator.tenancy import CompactAgentRegistry, TenantPolicyTable
+
+
+class _DenyConsensus:
+    def request_approval(self, agent_id, command, risk):
+        return False
+
+
+def test_tenant_policy_lookup_falls_back_to_default():
+    table = TenantPolicyTable(
+        GlobalSecurityPolicy(), {"strict": GlobalSecurityPolicy(0.2, 0.6, 0.95)}
+    )
+    assert table.required_score("high", "strict") == 0.95
+    assert table.required_score("low", "strict") == 0.2
+    assert table.required_score("high", "unknown") == 0.7
+    assert table.required_score("high") == 0.7
+    table.set_policy("strict", GlobalSecurityPolicy(0.0, 0.0, 0.5))
+    assert table.required_score("high", "strict") == 0.5
+
+
+def test_compact_registry_matches_agent_registry_interface():
+    changed = []
+    registry = CompactAgentRegistry([AgentProfile("a", 0.5, tenant="t1")])
+    registry.add_listener(changed.append)
+    assert registry.version == 1
+    registry.register(AgentProfile("b", 0.1, discount_rate=0.9))
+    assert registry.update_scores({"a": 0.8, "ghost": 1.0}) == 3
+    assert registry.update_scores({"ghost": 1.0}) == 3
+    assert changed == [{"b"}, {"a"}]
+
+    snapshot = registry.snapshot()
+    assert snapshot.version == 3
+    assert set(snapshot.agents) == {"a", "b"}
+    a = snapshot.agents["a"]
+    assert (a.C_Lcone_score, a.tenant) == (0.8, "t1")
+    assert snapshot.agents.get("b").to_profile() == AgentProfile(
+        "b", 0.1, discount_rate=0.9
+    )
+    assert snapshot.agents.get("ghost") is None
+    assert list(registry.scores()) == [0.8, 0.1]
+
+
+def test_gao_uses_per_tenant_thresholds():
+    policy = TenantPolicyTable(
+        GlobalSecurityPolicy(), {"strict": GlobalSecurityPolicy(0.0, 0.3, 0.95)}
+    )
+    gao = GAO_Orchestrator(
+        policy, DryRunExecutor(), _DenyConsensus(), registry=CompactAgentRegistry()
+    )
+    gao.register_agent(AgentProfile("lax-agent", 0.8))
+    gao.register_agent(AgentProfile("strict-agent", 0.8, tenant="strict"))
+
+    assert gao.execute_command("lax-agent", "shutdown -h now")[0] == "executed"
+    assert gao.execute_command("strict-agent", "shutdown -h now")[0] == "blocked"
+    assert [
+        s for s, _ in gao.execute_commands("strict-agent", ["echo", "rm -rf /"])
+    ] == ["executed", "blocked"]
+
+
+def _traced_bytes(build):
+    tracemalloc.start()
+    try:
+        obj = build()
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, used
+
+
+def test_compact_registry_uses_less_memory_than_dataclasses():
+    n = 20_000
+    profiles = [
+        AgentProfile(f"agent-{i}", i / n, i * 0.5, i * 0.25, 1 - i / n, tenant="t")
+        for i in range(n)
+    ]
+    _, compact = _traced_bytes(lambda: CompactAgentRegistry(profiles))
+    _, plain = _traced_bytes(lambda: AgentRegistry(profiles))
+    assert compact < plain * 0.8
@@ -0,0 +1,128 @@
+import numpy as np
+
+from gao_orchestrator.audit import DryRunExecutor
+from gao_orchestrator.GAO_Orchestrator import AgentProfile, GAO_Orchestrator
+from gao_orchestrator.tuning import (
+    RISKS,
+    RequestLog,
+    evaluate_thresholds,
+    pareto_front,
+    threshold_grid,
+)
+
+COMMANDS = {"low": "ls /tmp", "medium": "iptables -L", "high": "systemctl stop nginx"}
+
+
+class HarmAwareConsensus:
+    """Approves exactly the commands that are not harmful."""
+
+    def __init__(self, harmful_ids):
+        self.harmful_ids = harmful_ids
+
+    def request_approval(self, agent_id, command, risk):
+        return agent_id not in self.harmful_ids
+
+
+def _log(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    score = np.round(rng.random(n), 2)
+    risk = rng.integers(0, 3, size=n)
+    harmful = rng.random(n) < 0.3 * (1.0 - score)
+    return RequestLog(score=score, risk=risk, harmful=harmful)
+
+
+def test_projection_matches_replaying_through_the_orchestrator():
+    log = _log()
+    candidates = threshold_grid(values=(0.0, 0.3, 0.5, 0.8))[::3]
+    result = evaluate_thresholds(log, candidates)
+
+    harmful_ids = {f"a{i}" for i in np.flatnonzero(log.harmful)}
+    for k in range(len(candidates)):
+        gao = GAO_Orchestrator(
+            result.policy(k), DryRunExecutor(), HarmAwareConsensus(harmful_ids)
+        )
+        statuses = []
+        for i in range(len(log)):
+            gao.register_agent(AgentProfile(f"a{i}", float(log.score[i])))
+            statuses.append(
+                gao.execute_command(f"a{i}", COMMANDS[RISKS[log.risk[i]]])[0]
+            )
+        statuses = np.array(statuses)
+        assert np.isclose(result.execute_rate[k], np.mean(statuses == "executed"))
+        assert np.isclose(result.escalate_rate[k], np.mean(statuses == "escalated"))
+        assert np.isclose(result.block_rate[k], np.mean(statuses == "blocked"))
+        assert np.isclose(result.consensus_load[k], np.mean(statuses != "executed"))
+        ran = statuses != "blocked"
+        assert np.isclose(result.missed_harm_rate[k], ran[log.harmful].mean())
+
+
+def test_recorded_outcomes_rates_and_frontier():
+    log = RequestLog(
+        score=np.array([0.1, 0.2, 0.9, 0.4]),
+        risk=np.array([2, 2, 2, 0]),
+        harmful=np.array([True, False, False, False]),
+        ts=np.array([0.0, 5.0, 8.0, 10.0]),
+        approved=np.array([1.0, 0.0, np.nan, np.nan]),
+    )
+    result = evaluate_thresholds(
+        log, [[0.0, 0.0, 0.5], [0.0, 0.0, 0.0]], consensus_catch_rate=0.5
+    )
+    assert result.load_unit == "per_second"
+    np.testing.assert_allclose(result.consensus_load, [0.2, 0.0])
+    np.testing.assert_allclose(
+        result.missed_harm_rate, [1.0, 1.0]
+    )  # consensus approved the harmful one
+    np.testing.assert_allclose(result.benign_block_rate, [1 / 3, 0.0])
+    assert result.recommend(max_consensus_load=0.1) == 1
+
+    costs = np.array([[1, 5], [2, 2], [2, 2], [3, 3], [5, 1], [0, 9]])
+    assert pareto_front(costs).tolist() == [0, 1, 4, 5]
+
+    grid = threshold_grid()
+    assert (np.diff(grid, axis=1) >= 0).all() and len(grid) == 1771
+
+
+def test_from_records_skips_admission_rejections():
+    records = [
+        {
+            "agent_id": "a",
+            "command": "ls",
+            "risk": "low",
+            "score": 0.9,
+            "status": "executed",
+            "ts": 1.0,
+        },
+        {
+            "agent_id": "a",
+            "command": "ls",
+            "risk": "low",
+            "score": 0.9,
+            "status": "blocked",
+            "reason": "rate_limited",
+            "ts": 2.0,
+        },
+        {
+            "agent_id": "b",
+            "command": "rm -rf /",
+            "risk": "high",
+            "score": 0.2,
+            "status": "blocked",
+            "reason": "shed",
+            "ts": 3.0,
+        },
+        {
+            "agent_id": "b",
+            "command": "rm -rf /",
+            "risk": "high",
+            "score": 0.2,
+            "status": "blocked",
+            "reason": "consensus_denied",
+            "ts": 4.0,
+        },
+    ]
+    log = RequestLog.from_records(
+        records, harmful=lambda rec: rec["command"] == "rm -rf /"
+    )
+    assert len(log) == 2
+    assert log.risk.tolist() == [0, 2]
+    np.testing.assert_array_equal(log.approved, [np.nan, 0.0])
@@ -0,0 +1,120 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from clcone_lab.barrier_tame_assay import Barrier, BarrierOutcome, TAMESummary
+from clcone_lab.CLcone_Assays import CLconeReport
+from clcone_lab.warehouse import ResultsWarehouse
+
+
+def _barrier(bid, btype):
+    return Barrier(
+        id=bid,
+        description="",
+        barrier_type=btype,
+        difficulty=0.5,
+        resistance=0.5,
+        goal_state="",
+        metadata={},
+    )
+
+
+def _outcome(bid, fitness):
+    return BarrierOutcome(
+        barrier_id=bid,
+        success=fitness > 0.5,
+        steps=3,
+        agency_score=0.5,
+        persuasiveness_score=0.5,
+        fitness=fitness,
+        return_to_setpoint=0.5,
+        competency_overhang=0.5,
+        signaling_fidelity=0.5,
+        cognitive_roi=0.5,
+        persuadability_score=0.5,
+    )
+
+
+def _summary(outcomes):
+    n = len(outcomes)
+    return TAMESummary(
+        total_barriers=n,
+        success_rate=0.0,
+        mean_fitness=sum(o.fitness for o in outcomes) / n,
+        mean_agency=0.5,
+        mean_persuasiveness=0.5,
+        mean_return_to_setpoint=0.5,
+        mean_competency_overhang=0.5,
+        mean_signaling_fidelity=0.5,
+        mean_cognitive_roi=0.5,
+        mean_persuadability=0.5,
+        outcomes=outcomes,
+    )
+
+
+def test_barrier_trend_filters_by_type_and_keeps_last_runs(tmp_path):
+    barriers = [
+        _barrier("p1", "policy"),
+        _barrier("p2", "policy"),
+        _barrier("i1", "infra"),
+    ]
+    with ResultsWarehouse(str(tmp_path / "w.db")) as wh:
+        for run in range(5):
+            outcomes = [
+                _outcome("p1", run / 10),
+                _outcome("p2", run / 10 + 0.2),
+                _outcome("i1", 0.9),
+            ]
+            wh.record_barriers("x", _summary(outcomes), barriers, created=1000.0 + run)
+        wh.record_barriers(
+            "y", _summary([_outcome("p1", 1.0)]), barriers, created=2000.0
+        )
+
+        trend = wh.trend("x", "fitness", barrier_type="policy", last=3)
+        np.testing.assert_allclose(trend["value"], [0.3, 0.4, 0.5])
+        np.testing.assert_allclose(trend["created"], [1002.0, 1003.0, 1004.0])
+        assert trend["n"].tolist() == [2, 2, 2] and trend["run_id"].dtype == np.int64
+
+        assert (
+            wh.trend("x", "success", barrier_id="i1", last=None)["value"].tolist()
+            == [1.0] * 5
+        )
+        assert wh.trend("y", "score")["value"].tolist() == [1.0]
+        assert [r["agent_id"] for r in wh.runs(since=1003.0)] == ["x", "x", "y"]
+        with pytest.raises(ValueError):
+            wh.trend("x", "score", barrier_type="policy")
+
+        assert wh.query("PRAGMA journal_mode")[1][0][0] == "wal"
+        plan = " ".join(
+            str(r)
+            for r in wh.query(
+                "EXPLAIN QUERY PLAN "
+                "SELECT * FROM barrier_outcomes WHERE barrier_type = ?",
+                ("policy",),
+            )[1]
+        )
+        assert "outcomes_type" in plan
+
+
+def test_temporal_episodes_and_reader_connection(tmp_path):
+    path = str(tmp_path / "w.db")
+    report = CLconeReport(
+        temporal_horizon=0.5,
+        spatial_horizon=0.0,
+        discount_rate=0.01,
+        C_Lcone_score=0.495,
+        raw_metrics={"episodes": 3},
+    )
+    with ResultsWarehouse(path) as wh:
+        run_id = wh.record_temporal(
+            "agent", report, episodes={"local_utility": [1.0, 2.0, 3.0]}
+        )
+        assert wh.trend("agent", "local_utility")["value"].tolist() == [2.0]
+        assert wh.runs(kind="temporal")[0]["summary"]["raw_metrics"] == {"episodes": 3}
+
+        reader = sqlite3.connect(path)
+        assert reader.execute(
+            "SELECT COUNT(*) FROM temporal_episodes WHERE run_id = ?", (run_id,)
+        ).fetchone() == (3,)
+        reader.close()